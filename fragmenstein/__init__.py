@@ -13,46 +13,89 @@ from .version import __version__
 
 ########################################################################################################################
 
+import importlib
+import sys
+from typing import Dict, Tuple
 from warnings import warn
 from . import legacy as _  # monkeypatches singledispatchmethod TypedDict Unpack on older Pythons
-
-try:
-    from .igor import Igor
-except ImportError as err:
-    warn(f'Igor (minimizer) unavailable —{err}.', category=ImportWarning)
-
-try:
-    from .victor import Victor
-except ImportError as err:
-    warn(f'Victor (pipeline) unavailable —{err}.', category=ImportWarning)
-
-try:
-    from .multivictor import MultiVictorPlacement
-except ImportError as err:
-    warn(f'Victor (pipeline) unavailable —{err}.', category=ImportWarning)
-
-try:
-    from .laboratory import Laboratory, binarize, unbinarize, place_input_validator
-except ImportError as err:
-    warn(f'Laboratory unavailable —{err}.', category=ImportWarning)
-
-try:
-    from .openmm import OpenVictor, Fritz
-except ImportError as err:
-    warn(f'OpenVictor / Fritz unavailable —{err}.', category=ImportWarning)
-
-from .monster import Monster, MinizationOutcome
-from .walton import Walton
-from molecular_rectifier import Rectifier
-from .m_rmsd import mRMSD
-from .mpro import MProVictor
-from .mpro import data as mpro_data
-from .branding import divergent_colors, feijoa
-from .display import display_mols, MolNGLWidget, patched_3Dmol_view, py3Dmol_monkey_patch, color_in, DISPLAYMODE
 from .error import FragmensteinError, DistanceError, ShoddyCodeError, PoisonError
-from .faux_victors import Wictor, Quicktor  # the rest are mostly experiments
 from .settings import default_settings, cli_default_settings
 
+# The rest of the namespace is imported on first access (module ``__getattr__``),
+# so that importing fragmenstein does not import PyRosetta, OpenMM, py3Dmol etc. unless they are used.
+# name -> (module, attribute)
+_lazy_imports: Dict[str, Tuple[str, str]] = {
+    'Igor': ('.igor', 'Igor'),
+    'Victor': ('.victor', 'Victor'),
+    'MultiVictorPlacement': ('.multivictor', 'MultiVictorPlacement'),
+    'Laboratory': ('.laboratory', 'Laboratory'),
+    'binarize': ('.laboratory', 'binarize'),
+    'unbinarize': ('.laboratory', 'unbinarize'),
+    'place_input_validator': ('.laboratory', 'place_input_validator'),
+    'OpenVictor': ('.openmm', 'OpenVictor'),
+    'Fritz': ('.openmm', 'Fritz'),
+    'Monster': ('.monster', 'Monster'),
+    'MinizationOutcome': ('.monster', 'MinizationOutcome'),
+    'Walton': ('.walton', 'Walton'),
+    'Rectifier': ('molecular_rectifier', 'Rectifier'),
+    'mRMSD': ('.m_rmsd', 'mRMSD'),
+    'MProVictor': ('.mpro', 'MProVictor'),
+    'mpro_data': ('.mpro', 'data'),
+    'divergent_colors': ('.branding', 'divergent_colors'),
+    'feijoa': ('.branding', 'feijoa'),
+    'display_mols': ('.display', 'display_mols'),
+    'MolNGLWidget': ('.display', 'MolNGLWidget'),
+    'patched_3Dmol_view': ('.display', 'patched_3Dmol_view'),
+    'py3Dmol_monkey_patch': ('.display', 'py3Dmol_monkey_patch'),
+    'color_in': ('.display', 'color_in'),
+    'DISPLAYMODE': ('.display', 'DISPLAYMODE'),
+    'Wictor': ('.faux_victors', 'Wictor'),  # the rest are mostly experiments
+    'Quicktor': ('.faux_victors', 'Quicktor'),
+}
+
+# names whose dependencies are optional (e.g. PyRosetta, OpenMM): if these fail to import,
+# they are warned about and are absent as in ``hasattr(fragmenstein, 'OpenVictor') == False``
+_optional_imports: Dict[str, str] = {
+    'Igor': 'Igor (minimizer)',
+    'Victor': 'Victor (pipeline)',
+    'MultiVictorPlacement': 'Victor (pipeline)',
+    'Laboratory': 'Laboratory',
+    'binarize': 'Laboratory',
+    'unbinarize': 'Laboratory',
+    'place_input_validator': 'Laboratory',
+    'OpenVictor': 'OpenVictor / Fritz',
+    'Fritz': 'OpenVictor / Fritz',
+}
+
+_eager_names = ['FragmensteinError', 'DistanceError', 'ShoddyCodeError', 'PoisonError',
+                'default_settings', 'cli_default_settings']
+
+
+def __getattr__(name: str):
+    if name == '__all__':
+        # for ``from fragmenstein import *``: the names that are available (this imports them all)
+        value = _eager_names + [lazy_name for lazy_name in _lazy_imports if hasattr(sys.modules[__name__], lazy_name)]
+        globals()[name] = value
+        return value
+    elif name not in _lazy_imports:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module_name, attribute = _lazy_imports[name]
+    try:
+        module = importlib.import_module(module_name, __name__)
+    except ImportError as err:
+        if name not in _optional_imports:
+            raise err
+        warn(f'{_optional_imports[name]} unavailable —{err}.', category=ImportWarning)
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r} ({err})') from err
+    value = getattr(module, attribute)
+    globals()[name] = value  # subsequent access does not call __getattr__
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_lazy_imports})
+
+
 if __name__ == '__main__':
     from .cli import main
     main()
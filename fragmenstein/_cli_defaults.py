@@ -8,11 +8,15 @@ cli_default_settings = dict(
     sw_dist=int(os.environ.get('FRAGMENSTEIN_SW_DIST', 25)),
     sw_length=int(os.environ.get('FRAGMENSTEIN_SW_LENGTH', 50)),
     sw_databases=list(os.environ.get('FRAGMENSTEIN_SW_DATABASES', 'REAL-Database-22Q1.smi.anon').split(',')),
+    sw_cache=os.environ.get('FRAGMENSTEIN_SW_CACHE', ''),  # folder, '' is no cache
+    sw_local=os.environ.get('FRAGMENSTEIN_SW_LOCAL', ''),  # offline .smi file or earlier results instead of SmallWorld
+    sw_workers=int(os.environ.get('FRAGMENSTEIN_SW_WORKERS', 4)),
     suffix=os.environ.get('FRAGMENSTEIN_SUFFIX', ''),
     n_cores=int(os.environ.get('FRAGMENSTEIN_N_CORES', 15)),
     combination_size=int(os.environ.get('FRAGMENSTEIN_COMBINATION_SIZE', 2)),
     top_mergers=os.environ.get('FRAGMENSTEIN_TOP_MERGERS', 500),
     max_tasks=int(os.environ.get('FRAGMENSTEIN_MAX_TASKS', 0)),
+    pipelined=bool(int(os.environ.get('FRAGMENSTEIN_PIPELINED', 0))),  # combine, search and place concurrently
     timeout=int(os.environ.get('FRAGMENSTEIN_TIMEOUT', 240)),
     blacklist=os.environ.get('FRAGMENSTEIN_BLACKLIST', '').split(),
     workfolder=os.environ.get('FRAGMENSTEIN_WORKFOLDER', 'output'),
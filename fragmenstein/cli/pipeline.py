@@ -64,6 +64,13 @@ class FragmensteinParserPipeline:
             parser.add_argument('-b', '--sw_databases', help='SmallWorld databases. Accepts multiple',
                                 nargs='+',
                                 default=cli_default_settings['sw_databases'])
+            parser.add_argument('--sw_cache', help='Folder to cache the SmallWorld replies in (default: no cache)',
+                                default=cli_default_settings['sw_cache'])
+            parser.add_argument('--sw_local', help='SMILES file (.smi) or earlier analogues table to search offline',
+                                default=cli_default_settings['sw_local'])
+            parser.add_argument('--sw_workers', help='Number of concurrent SmallWorld queries',
+                                default=cli_default_settings['sw_workers'],
+                                type=int)
             parser.add_argument('-s', '--suffix',
                                 help='Suffix for output files',
                                 default=cli_default_settings['suffix'])
@@ -88,6 +95,11 @@ class FragmensteinParserPipeline:
             parser.add_argument('-x', '--max_tasks', help='Max number of combinations to try in a batch',
                                 default=cli_default_settings['max_tasks'],
                                 type=int)
+            parser.add_argument('--pipelined', action='store_true',
+                                help='Search and place each merger as soon as it is made, ' +
+                                     'instead of combining all, then searching the top ranked, then placing all ' +
+                                     '(the mergers searched are the first acceptable ones, not the top ranked)',
+                                default=cli_default_settings['pipelined'])
             parser.add_argument('-z', '--blacklist', help='Blacklist file',
                                 default=cli_default_settings['blacklist'])
             parser.add_argument('-j', '--weights', help='JSON weights file', default=cli_default_settings['weights'])
@@ -100,6 +112,7 @@ class FragmensteinParserPipeline:
         Victor.work_path = output
         Victor.monster_throw_on_discard = True  # stop this merger if a fragment cannot be used.
         Victor.monster_joining_cutoff = cutoff  # Å
+        Laboratory.joining_cutoff = cutoff  # Å, also used to skip combinations of distant hits
         Victor.quick_reanimation = quick  # for the impatient
         Victor.error_to_catch = Exception  # stop the whole laboratory otherwise
 
@@ -158,7 +171,10 @@ class FragmensteinParserPipeline:
         hitnames = [h.GetProp('_Name') for h in hits]
         all_names = list(map('-'.join, itertools.permutations(hitnames, settings['combination_size'])))
         base_suffix = settings['suffix']
-        if max_tasks == 0 or max_tasks > len(all_names):
+        if settings['pipelined']:
+            # bounded queues: no need for batches
+            all_placements: pd.DataFrame = Laboratory.pipelined_ops(hit_replacements, **settings)
+        elif max_tasks == 0 or max_tasks > len(all_names):
             all_placements: pd.DataFrame = Laboratory.core_ops(hit_replacements, **settings)
         else:
             all_placements = pd.DataFrame()
@@ -1,8 +1,54 @@
+from collections import deque
 from rdkit import Chem
 from rdkit.Chem import BRICS, AllChem
-from typing import List, Tuple, Any, Dict
+from typing import List, Tuple, Any, Dict, Iterator, Set, Deque
 import numpy as np
 import pandas as pd
+import pebble
+
+_dummy = Chem.MolFromSmarts('[#0]')  # attachment point of an incomplete product
+
+
+def _build_shard(fragment_binaries: List[bytes],
+                 seed_binaries: List[bytes],
+                 cutoff: int,
+                 keep_incomplete: bool) -> Tuple[List[Tuple[str, bytes]], List[Tuple[str, bytes]], List[str]]:
+    """
+    A shard of ``AccountableBRICS.iter_builds``: one depth of ``BRICS.BRICSBuild``,
+    i.e. the products of the seeds ``seed_binaries`` with one fragment each,
+    with the fragments and seeds as binaries (isotope labels and properties)
+    so that this function can be sent to a subprocess.
+
+    :param keep_incomplete: return the products with attachment points too (the seeds of the next depth)
+    :return: the unique complete products as canonical SMILES (sans labels) and binary,
+             the unique incomplete ones likewise (if ``keep_incomplete``)
+             and the unique complete products smaller than ``cutoff`` as canonical SMILES
+             (counted by the caller, as other shards may build them too)
+    """
+    fragments: List[Chem.Mol] = [Chem.Mol(binary) for binary in fragment_binaries]
+    products: List[Tuple[str, bytes]] = []
+    incomplete: List[Tuple[str, bytes]] = []
+    seen: Set[str] = set()
+    too_small: List[str] = []
+    for built in BRICS.BRICSBuild(fragments,
+                                  seeds=[Chem.Mol(binary) for binary in seed_binaries],
+                                  onlyCompleteMols=False,
+                                  scrambleReagents=False,
+                                  maxDepth=0):
+        is_complete: bool = not built.HasSubstructMatch(_dummy)
+        if not is_complete and not keep_incomplete:
+            continue
+        smiles: str = AccountableBRICS.get_canonical_smiles(built)
+        if smiles in seen:
+            continue
+        seen.add(smiles)
+        if is_complete and built.GetNumHeavyAtoms() < cutoff:
+            too_small.append(smiles)
+            continue
+        (products if is_complete else incomplete).append((smiles,
+                                                          built.ToBinary(Chem.PropertyPickleOptions.AllProps)))
+    return products, incomplete, too_small
+
 
 class AccountableBRICS:
     """
@@ -17,7 +63,8 @@ class AccountableBRICS:
         decomposer = AccountableBRICS(hits)
         df: pd.DataFrame = decomposer(cutoff=decomposer.median, max_mergers=100)
         decomposer.info
-        # {'N_hits': 44, 'N_fragments': 157, 'too_small': 0, 'missing': [], 'max_reached': True, 'N_built': 100}
+        # {'N_hits': 44, 'N_fragments': 157, 'too_small': 0, 'duplicates': 0, 'seeds_dropped': 0,
+        #  'missing': [], 'max_reached': True, 'N_built': 100}
 
     The output of ``__call__`` is a pandas dataframe with the following columns:
 
@@ -33,7 +80,21 @@ class AccountableBRICS:
         lab = Laboratory(pdbblock=👾👾👾, covalent_resi=None)
         placements:pd.DataFrame = lab.place(df, expand_isomers=False, n_cores=12)
         display(placements)
+
+    Products with the same SMILES are built once.
+    The products are enumerated breadth first, i.e. all the products of two fragments before those of three,
+    so ``max_mergers`` keeps the smallest products, across all the fragments.
+    For many fragments, the enumeration can be sharded by depth and seed across ``n_cores`` subprocesses
+    and streamed into ``Laboratory.place`` with ``iter_builds``, which yields the rows as they are built
+    and is consumed as the placements finish (see ``LabBench.__call__``):
+
+    ... code-block:: python
+        placements:pd.DataFrame = lab.place(enumerate(decomposer.iter_builds(cutoff=decomposer.median, n_cores=12)),
+                                            n_cores=12)
     """
+    shards_per_core = 2  # shards in flight per subprocess in ``iter_builds``
+    seeds_per_shard = 4  # seeds (fragments or incomplete products) built upon per shard
+    max_seeds = 100_000  # incomplete products kept as seeds of the next depth, the rest are dropped
 
     def __init__(self, hits: List[Chem.Mol]):
         self.hits = {}
@@ -67,32 +128,124 @@ class AccountableBRICS:
                 pass
         return fragments
 
-    def __call__(self, cutoff: int = 0, max_mergers: int = 10_000, maxDepth: int = 4) -> pd.DataFrame:
+    def __call__(self, cutoff: int = 0, max_mergers: int = 10_000, maxDepth: int = 4, n_cores: int = 1) -> pd.DataFrame:
+        return pd.DataFrame(list(self.iter_builds(cutoff=cutoff,
+                                                  max_mergers=max_mergers,
+                                                  maxDepth=maxDepth,
+                                                  n_cores=n_cores)))
+
+    def iter_builds(self,
+                    cutoff: int = 0,
+                    max_mergers: int = 10_000,
+                    maxDepth: int = 4,
+                    n_cores: int = 1) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the rows of ``__call__`` as they are built.
+        Each depth of ``BRICS.BRICSBuild`` is built in turn, sharded by ``seeds_per_shard`` seeds,
+        which are built in subprocesses if ``n_cores`` > 1:
+        the shards are yielded in order and only ``shards_per_core`` × ``n_cores`` are in flight at once,
+        so the output does not depend on which subprocess finishes first.
+        Unlike ``BRICS.BRICSBuild``, which recurses seed by seed, a depth is finished before the next is started,
+        so ``max_mergers`` is filled breadth first across the fragments.
+        A product built by several shards is yielded once (``.info['duplicates']``), or counted once if too small,
+        and only ``max_seeds`` incomplete products are carried to the next depth (``.info['seeds_dropped']``),
+        so the memory is bounded.
+        The ``.info`` counts are updated as the rows are yielded.
+        """
         self.fragments = []
         for hit in self.hits.values():
             self.fragments.extend(self.decompose(hit))
-        self.info['N_fragments'] = len(self.fragments)
-        mergers: List[Chem.Mol] = []
-        accepted: int = 0
-        results: List[Dict[str, Any]] = []
-        for built in BRICS.BRICSBuild(self.fragments,
-                                      onlyCompleteMols=True,
-                                      maxDepth=maxDepth):
-            if built.GetNumHeavyAtoms() < cutoff:
-                self.info['too_small'] += 1
-                continue
-            accepted += 1
-            inspirations: List[Chem.Mol] = self.get_inspirations(built)
-            results.append({'name': f'build#{len(results)}',  # required by Laboratory
-                            'built_molecule': built,
-                            'smiles': Chem.MolToSmiles(built),  # required by Laboratory
-                            'hits': inspirations,
-                            })
-            if accepted >= max_mergers:
-                self.info['max_reached'] = True
-                break
-        self.info['N_built'] = len(results)
-        return pd.DataFrame(results)
+        self.info.update({'N_fragments': len(self.fragments),
+                          'too_small': 0,
+                          'duplicates': 0,
+                          'seeds_dropped': 0,
+                          'missing': [],
+                          'max_reached': False,
+                          'N_built': 0})
+        binaries: List[bytes] = [fragment.ToBinary(Chem.PropertyPickleOptions.AllProps) for fragment in self.fragments]
+        seeds: List[bytes] = binaries
+        seen: Set[str] = set()
+        for depth in range(maxDepth + 1):
+            next_seeds: List[bytes] = []
+            seen_seeds: Set[str] = set()
+            shards: Iterator[Tuple[List[Tuple[str, bytes]], List[Tuple[str, bytes]], List[str]]] = \
+                self._iter_shards(binaries, seeds, cutoff, depth < maxDepth, n_cores)
+            try:
+                for products, incomplete, too_small in shards:
+                    for smiles in too_small:
+                        if smiles not in seen:
+                            seen.add(smiles)
+                            self.info['too_small'] += 1
+                    for smiles, binary in incomplete:
+                        if smiles in seen_seeds:
+                            continue
+                        seen_seeds.add(smiles)
+                        if len(next_seeds) >= self.max_seeds:
+                            self.info['seeds_dropped'] += 1
+                            continue
+                        next_seeds.append(binary)
+                    for smiles, binary in products:
+                        if smiles in seen:
+                            self.info['duplicates'] += 1
+                            continue
+                        seen.add(smiles)
+                        built = Chem.Mol(binary)
+                        inspirations: List[Chem.Mol] = self.get_inspirations(built)
+                        self.info['N_built'] += 1
+                        yield {'name': f'build#{self.info["N_built"] - 1}',  # required by Laboratory
+                               'built_molecule': built,
+                               'smiles': smiles,  # required by Laboratory
+                               'hits': inspirations,
+                               }
+                        if self.info['N_built'] >= max_mergers:
+                            self.info['max_reached'] = True
+                            return
+            finally:
+                shards.close()
+            if not next_seeds:
+                return
+            seeds = next_seeds
+
+    def _iter_shards(self,
+                     binaries: List[bytes],
+                     seeds: List[bytes],
+                     cutoff: int,
+                     keep_incomplete: bool,
+                     n_cores: int) -> Iterator[Tuple[List[Tuple[str, bytes]], List[Tuple[str, bytes]], List[str]]]:
+        """
+        The results of ``_build_shard`` for one depth, in the order of the seeds
+        """
+        size: int = max(self.seeds_per_shard, 1)
+        chunks: Iterator[List[bytes]] = (seeds[i:i + size] for i in range(0, len(seeds), size))
+        if n_cores <= 1:
+            for chunk in chunks:
+                yield _build_shard(binaries, chunk, cutoff, keep_incomplete)
+            return
+        pending: Deque[pebble.ProcessFuture] = deque()
+        with pebble.ProcessPool(max_workers=n_cores) as pool:
+            try:
+                while True:
+                    for chunk in chunks:
+                        pending.append(pool.schedule(_build_shard, args=(binaries, chunk, cutoff, keep_incomplete)))
+                        if len(pending) >= self.shards_per_core * n_cores:
+                            break
+                    if not pending:
+                        break
+                    yield pending.popleft().result()
+            finally:
+                # if the caller stopped early, do not wait for the queued ones
+                for future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def get_canonical_smiles(built: Chem.Mol) -> str:
+        """
+        The SMILES of a product without the isotope labels of its inspirations
+        """
+        unlabelled = Chem.Mol(built)
+        for atom in unlabelled.GetAtoms():
+            atom.SetIsotope(0)
+        return Chem.MolToSmiles(unlabelled)
 
     @property
     def median(self):
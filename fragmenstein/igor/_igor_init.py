@@ -21,6 +21,9 @@ class _IgorInit(_IgorBase):
     angle_constraint = 10
     coordinate_constraint = 1
     fa_intra_rep = 0.005
+    # apo poses loaded by ``get_apo_pose``, per process (i.e. per worker)
+    _apo_poses: Dict[str, pyrosetta.Pose] = {}
+    apo_pose_cache_size = 4
 
     # ============= Init ===============================================================================================
 
@@ -62,6 +65,61 @@ class _IgorInit(_IgorBase):
         pyrosetta.rosetta.core.import_pose.pose_from_pdbstring(pose, pdbblock)
         return cls(pose, constraint_file, ligand_residue, key_residues)
 
+    @classmethod
+    def get_apo_pose(cls, apo_pdbblock: str) -> pyrosetta.Pose:
+        """
+        Returns the pose of the apo structure, which is loaded only once per worker.
+        Do not alter it, clone it (as ``from_apo_pose`` does).
+
+        :param apo_pdbblock: pdb block without the ligand
+        :return: apo pose
+        """
+        if apo_pdbblock not in cls._apo_poses:
+            while len(cls._apo_poses) >= max(cls.apo_pose_cache_size, 1):
+                del cls._apo_poses[next(iter(cls._apo_poses))]
+            pose = pyrosetta.Pose()
+            pyrosetta.rosetta.core.import_pose.pose_from_pdbstring(pose, apo_pdbblock)
+            cls._apo_poses[apo_pdbblock] = pose
+        return cls._apo_poses[apo_pdbblock]
+
+    @classmethod
+    def from_apo_pose(cls,
+                      apo_pose: pyrosetta.Pose,
+                      ligand_pdbblock: str,
+                      params_file: str,
+                      constraint_file: str,
+                      ligand_residue: Union[str, int, Tuple[int, str], pyrosetta.Vector1] = 'LIG',
+                      key_residues: Union[None, Sequence[Union[int, str, Tuple[int, str]]], pyrosetta.Vector1] = None):
+        """
+        Alternative to ``from_pdbblock``, where the protein is not parsed again,
+        but is a clone of the apo pose (see ``get_apo_pose``) to which the ligand residue is appended.
+        The ligand is not bonded to the protein, so this is for non-covalent ligands only.
+
+        :param apo_pose: pose of the protein, which is not altered
+        :param ligand_pdbblock: pdb block of the ligand only
+        :param params_file: params file
+        :param constraint_file: filename
+        :param ligand_residue: ligand -see class docstring
+        :param key_residues: multiple entries -see class docstring
+        :return:
+        """
+        ligand_pose = pyrosetta.Pose()
+        params_paths = pyrosetta.rosetta.utility.vector1_string()
+        params_paths.extend([params_file])
+        pyrosetta.generate_nonstandard_residue_set(ligand_pose, params_paths)
+        pyrosetta.rosetta.core.import_pose.pose_from_pdbstring(ligand_pose, ligand_pdbblock)
+        pose: pyrosetta.Pose = apo_pose.clone()
+        n_apo: int = pose.total_residue()
+        pyrosetta.rosetta.core.pose.append_pose_to_pose(pose, ligand_pose, True)
+        # copy over the PDB numbering of the ligand, which is used by ``_parse_residue``
+        pdb_info = pose.pdb_info()
+        ligand_info = ligand_pose.pdb_info()
+        for r in range(1, ligand_pose.total_residue() + 1):
+            pdb_info.set_resinfo(n_apo + r, ligand_info.chain(r), ligand_info.number(r), ligand_info.icode(r))
+        pdb_info.obsolete(False)
+        pdb_info.rebuild_pdb2pose()
+        return cls(pose, constraint_file, ligand_residue, key_residues)
+
     @classmethod
     def from_pdbfile(cls,
                      pdbfile: str,
@@ -15,12 +15,20 @@ from .pyrosetta_import import pyrosetta  # the real mcCoy or a mock.
 
 from rdkit import Chem
 from rdkit.Chem import AllChem
+from rdkit.Geometry import Point3D
 
 from ._igor_base import _IgorBase
 from ..extraction_funs import add_dummy_to_mol
 
 
 class _IgorMin(_IgorBase):
+    # score functions and movers are built once per worker and reused across calls (and Igor instances).
+    # Only the movemap and the score function (i.e. the constraint weights) of a cached mover are changed per call.
+    _scorefxns: Dict[tuple, pyrosetta.ScoreFunction] = {}
+    _relaxes: Dict[tuple, pyrosetta.rosetta.protocols.moves.Mover] = {}
+    # minimise a truncated pose of the residues within ``pocket_radius`` Å of the ligand (see ``minimize``)
+    pocket_only_minimization = False
+    pocket_radius = 12.
 
     def pose2str(self, pose: Optional[pyrosetta.Pose] = None) -> str:
         """
@@ -66,6 +74,50 @@ class _IgorMin(_IgorBase):
         # done. Bond order fixed later
         return ligand
 
+    def mol_from_pose_by_template(self,
+                                  template: Chem.Mol,
+                                  pose: Optional[pyrosetta.Pose] = None,
+                                  add_dummy: bool = True) -> Chem.Mol:
+        """
+        Returns a copy of ``template`` (a mol with the same topology and PDB atom names as the ligand residue,
+        e.g. ``victor.params.mol``) with the coordinates of the ligand residue of the pose.
+        Unlike ``mol_from_pose`` there is no PDB block round trip and the bond orders are those of the template.
+        A dummy atom gets the position of the protein atom bonded to the ligand.
+
+        :param template: mol with PDB atom names
+        :param pose: if no pose is provided self.pose is used.
+        :param add_dummy: keep the dummy atoms of the template
+        :return: ligand
+        :raises KeyError: if an atom name of the template is absent in the residue
+        """
+        if pose is None:
+            pose = self.pose
+        residue = pose.residue(self.ligand_residue[0])
+        name2index: Dict[str, int] = {residue.atom_name(a).strip(): a for a in range(1, residue.natoms() + 1)}
+        mol = Chem.RWMol(template)
+        conf: Chem.Conformer = mol.GetConformer()
+        dummies: List[int] = []
+        for atom in mol.GetAtoms():
+            name: str = atom.GetPDBResidueInfo().GetName()
+            if atom.GetAtomicNum() == 0:
+                dummies.append(atom.GetIdx())
+                if not add_dummy:
+                    continue
+                elif residue.n_current_residue_connections() == 0:
+                    raise KeyError(f'Dummy atom {name} but the ligand is not bonded')
+                connection = residue.connect_map(1)
+                partner = pose.residue(connection.resid())
+                xyz = partner.xyz(partner.residue_connect_atom_index(connection.connid()))
+            else:
+                xyz = residue.xyz(name2index[name.strip()])
+            conf.SetAtomPosition(atom.GetIdx(), Point3D(xyz.x, xyz.y, xyz.z))
+            # store PDB atom names as molFileAlias
+            atom.SetProp('molFileAlias', name)
+        if not add_dummy:
+            for idx in sorted(dummies, reverse=True):
+                mol.RemoveAtom(idx)
+        return mol.GetMol()
+
     def make_ligand_only_pose(self) -> pyrosetta.Pose:
         """
 
@@ -116,14 +168,27 @@ class _IgorMin(_IgorBase):
         """
         Sets constraint for ('atom_pair_constraint', "angle_constraint", "coordinate_constraint", "fa_intra_rep")
         to either the value passed or if not the attribute of self
+
+        The score function is cached by name and weights, so do not alter it.
         """
-        scorefxn = pyrosetta.create_score_function(name)
-        # ref2015_cart_cst.wts
-        stm = pyrosetta.rosetta.core.scoring.ScoreTypeManager()
-        for key in ('atom_pair_constraint', "angle_constraint", "coordinate_constraint", "fa_intra_rep"):
-            value = overrides[key] if key in overrides else getattr(self, key)
-            scorefxn.set_weight(stm.score_type_from_name(key), value)
-        return scorefxn
+        weights = tuple((key, float(overrides[key] if key in overrides else getattr(self, key)))
+                        for key in ('atom_pair_constraint', "angle_constraint", "coordinate_constraint", "fa_intra_rep"))
+        if (name, weights) not in self._scorefxns:
+            scorefxn = pyrosetta.create_score_function(name)
+            # ref2015_cart_cst.wts
+            stm = pyrosetta.rosetta.core.scoring.ScoreTypeManager()
+            for key, value in weights:
+                scorefxn.set_weight(stm.score_type_from_name(key), value)
+            self._scorefxns[(name, weights)] = scorefxn
+        return self._scorefxns[(name, weights)]
+
+    def _get_plain_scorefxn(self, name: str = "ref2015"):
+        """
+        The score function without any weight changes, cached by name, so do not alter it.
+        """
+        if (name, None) not in self._scorefxns:
+            self._scorefxns[(name, None)] = pyrosetta.rosetta.core.scoring.ScoreFunctionFactory.create_score_function(name)
+        return self._scorefxns[(name, None)]
 
     def _get_selector(self,
                       ligand_only: bool = False) -> pyrosetta.rosetta.core.select.residue_selector.ResidueSelector:
@@ -185,6 +250,8 @@ class _IgorMin(_IgorBase):
         Actually, epirically I cannot see a difference.
         No repacking.
 
+        The mover is cached per worker by its settings and gets only its score function and movemap reset.
+
         :param cycles: number of cycles
         :param weight: 10 is strict. 5 is decent. 1 is traditional.
         :param default_coord_constraint: whether to constrain to the start position
@@ -192,6 +259,12 @@ class _IgorMin(_IgorBase):
         """
         scorefxn = self._get_scorefxn("ref2015_cart") if cartesian else self._get_scorefxn("ref2015")
         movemap = self._get_movemap()
+        key = ('mod', cycles, weight, cartesian, use_mod_script)
+        if key in self._relaxes:
+            relax = self._relaxes[key]
+            relax.set_scorefxn(scorefxn)
+            relax.set_movemap(movemap)
+            return relax
         relax = pyrosetta.rosetta.protocols.relax.FastRelax(scorefxn, cycles)
         if use_mod_script:
             # this is insanely slow with cartesian settings.py on...
@@ -217,6 +290,7 @@ class _IgorMin(_IgorBase):
         # this appears to do nothing.
         if default_coord_constraint and False:
             relax.constrain_relax_to_start_coords(True)  # set native causes a segfault.
+        self._relaxes[key] = relax
         return relax
 
     def get_old_FastRelax(self, cycles=1) -> pyrosetta.rosetta.protocols.moves.Mover:
@@ -293,10 +367,7 @@ class _IgorMin(_IgorBase):
         Repacking is done by relax...
         :return:
         """
-        cc = self.coordinate_constraint
-        self.coordinate_constraint = 0
-        scorefxn = self._get_scorefxn("ref2015")
-        self.coordinate_constraint = cc
+        scorefxn = self._get_scorefxn("ref2015", coordinate_constraint=0)
         # the distance depends on the size of the ligand.
         vlig = self._get_selector(ligand_only=True).apply(self.pose)
         lig = self.pose.residues[pyrosetta.rosetta.core.select.residue_selector.ResidueVector(vlig).pop()]
@@ -310,18 +381,22 @@ class _IgorMin(_IgorBase):
         movemap.set_chi(False)
         movemap.set_chi(allow_chi=ns.apply(self.pose))
         #print(pyrosetta.rosetta.monster.select.residue_selector.ResidueVector(ns.apply(self.pose)))
-        relax = pyrosetta.rosetta.protocols.relax.FastRelax(scorefxn, 2)
+        if ('repack',) not in self._relaxes:
+            relax = pyrosetta.rosetta.protocols.relax.FastRelax(scorefxn, 2)
+            relax.set_movemap_disables_packing_of_fixed_chi_positions(True)
+            self._relaxes[('repack',)] = relax
+        relax = self._relaxes[('repack',)]
+        relax.set_scorefxn(scorefxn)
         relax.set_movemap(movemap)
-        relax.set_movemap_disables_packing_of_fixed_chi_positions(True)
         relax.apply(self.pose)
 
     def ligand_score(self):
         lig_pos = self.ligand_residue[0]
         # no constraints here
-        scorefxn = pyrosetta.rosetta.core.scoring.ScoreFunctionFactory.create_score_function("ref2015")
-        scorefxn(self.pose)
+        scorefxn = self._get_plain_scorefxn("ref2015")
+        holo = scorefxn(self.pose)
         sfxd = self.detailed_scores(self.pose, lig_pos)
-        return {'holo_ref2015': scorefxn(self.pose),
+        return {'holo_ref2015': holo,
                 'bound': sfxd,
                 **self.score_split()}
 
@@ -338,7 +413,20 @@ class _IgorMin(_IgorBase):
         i = lig_pos - 1  ##pose numbering is fortran style. while python is C++
         return {data.dtype.names[j]: data[i][j] for j in range(len(data.dtype))}
 
-    def minimize(self, cycles: int = 15, default_coord_constraint=True, weight: float = 1.0,):
+    def minimize(self, cycles: int = 15, default_coord_constraint=True, weight: float = 1.0,
+                 pocket_only: Optional[bool] = None):
+        """
+        Minimise the pose.
+
+        If ``pocket_only`` (default: class attribute ``pocket_only_minimization``) and the ligand is not bonded
+        to the protein, the minimisation is done on a pose truncated to the pocket (see ``make_pocket_pose``)
+        and the coordinates are copied back to ``self.pose``, so scores are still of the full pose.
+        """
+        if pocket_only is None:
+            pocket_only = self.pocket_only_minimization
+        if pocket_only and self.pose.residue(self.ligand_residue[0]).n_current_residue_connections() == 0:
+            return self._minimize_pocket(cycles=cycles, default_coord_constraint=default_coord_constraint,
+                                         weight=weight)
         self._add_constraints(add_pose_constraints=True)
         self.repack_neighbors()
         mover = self.get_mod_FastRelax(cycles,
@@ -353,7 +441,71 @@ class _IgorMin(_IgorBase):
         self.repack_neighbors()
         mover.apply(self.pose)
 
+    def get_pocket_residues(self, radius: Optional[float] = None) -> List[int]:
+        """
+        Pose indices of the ligand, the key residues and the residues within ``radius`` Å of the ligand.
+        Virtual residues are excluded.
+        """
+        if radius is None:
+            radius = self.pocket_radius
+        NeighborhoodResidueSelector = pyrosetta.rosetta.core.select.residue_selector.NeighborhoodResidueSelector
+        ns = NeighborhoodResidueSelector(self._get_selector(ligand_only=True), distance=radius,
+                                         include_focus_in_subset=True)
+        residues = set(self._vector2residues(ns.apply(self.pose)))
+        residues.update(self.ligand_residue)
+        residues.update(self.key_residues)
+        return sorted([r for r in residues if not self.pose.residue(r).is_virtual_residue()])
+
+    def make_pocket_pose(self, residues: Sequence[int]) -> pyrosetta.Pose:
+        """
+        A pose of only the given pose residues, in order.
+        Protein residues at the breaks are capped with acetyl and N-methylamide groups.
+        """
+        pocket = pyrosetta.Pose()
+        slice_res = pyrosetta.rosetta.utility.vector1_unsigned_long()
+        slice_res.extend(residues)
+        pyrosetta.rosetta.core.pose.pdbslice(pocket, self.pose, slice_res)
+        VariantType = pyrosetta.rosetta.core.chemical.VariantType
+        add_variant = pyrosetta.rosetta.core.pose.add_variant_type_to_pose_residue
+        members = set(residues)
+        for i, r in enumerate(residues, 1):
+            residue = pocket.residue(i)
+            if not residue.is_protein():
+                continue
+            if r - 1 not in members and not residue.is_lower_terminus():
+                add_variant(pocket, VariantType.N_ACETYLATION, i)
+            if r + 1 not in members and not residue.is_upper_terminus():
+                add_variant(pocket, VariantType.C_METHYLAMIDATION, i)
+        return pocket
+
+    def _minimize_pocket(self, cycles: int = 15, default_coord_constraint=True, weight: float = 1.0):
+        """
+        See ``minimize``. The constraint file needs to refer only to residues in the pocket.
+        """
+        residues = self.get_pocket_residues()
+        pocket = self.make_pocket_pose(residues)
+        pocket_igor = self.__class__(pocket,
+                                     constraint_file=self.constraint_file,
+                                     ligand_residue=[residues.index(r) + 1 for r in self.ligand_residue][0],
+                                     key_residues=[residues.index(r) + 1 for r in self.key_residues])
+        for key in ('atom_pair_constraint', "angle_constraint", "coordinate_constraint", "fa_intra_rep"):
+            setattr(pocket_igor, key, getattr(self, key))
+        pocket_igor.minimize(cycles=cycles, default_coord_constraint=default_coord_constraint, weight=weight,
+                             pocket_only=False)
+        # copy back the coordinates of the atoms shared (caps differ)
+        AtomID = pyrosetta.rosetta.core.id.AtomID
+        for i, r in enumerate(residues, 1):
+            minimized = pocket_igor.pose.residue(i)
+            original = self.pose.residue(r)
+            for a in range(1, minimized.natoms() + 1):
+                name = minimized.atom_name(a)
+                if original.has(name):
+                    self.pose.set_xyz(AtomID(original.atom_index(name), r), minimized.xyz(a))
+
     def score_split(self, repack=False, pose: Optional[pyrosetta.Pose]=None):
+        """
+        Interaction energy of the ligand: the score of the pose minus that of the pose with the ligand 500 Å away.
+        """
         if pose is None:
             pose = self.pose
         split_pose = pyrosetta.Pose()
@@ -372,7 +524,7 @@ class _IgorMin(_IgorBase):
         xyz.z = 0.0
         for a in range(1, split_pose.residue(lig_pos).natoms() + 1):
             split_pose.residue(lig_pos).set_xyz(a, split_pose.residue(lig_pos).xyz(a) + xyz)
-        scorefxn = pyrosetta.rosetta.core.scoring.ScoreFunctionFactory.create_score_function("ref2015")
+        scorefxn = self._get_plain_scorefxn("ref2015")
         if repack:
             # get neighbourhood
             self._get_selector(ligand_only=True)
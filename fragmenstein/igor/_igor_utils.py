@@ -8,7 +8,8 @@ These are extra functionality for Igor
 ########################################################################################################################
 
 import requests, shutil
-from typing import Optional, Dict, Union
+import numpy as np
+from typing import Optional, Dict, Union, List, Tuple
 from .pyrosetta_import import pyrosetta  # the real mcCoy or a mock.
 from ._igor_base import _IgorBase
 from rdkit import Chem
@@ -18,6 +19,7 @@ from enum import Enum
 
 
 class _IgorUtils(_IgorBase):
+    per_atom_cutoff = 6.  # Å, the etable (fa_atr, fa_rep, fa_sol, fa_elec) terms are zero beyond this.
 
     def dock(self) -> pyrosetta.Pose:
         """
@@ -53,6 +55,9 @@ class _IgorUtils(_IgorBase):
         * Solvatation (zero)
         * Electrostatic interactions
 
+        Only the atom pairs within ``per_atom_cutoff`` Å are evaluated,
+        as determined by a NumPy distance screen of the pose coordinates.
+
         :param pose:
         :param target_res:
         :param scorefxn:
@@ -71,22 +76,40 @@ class _IgorUtils(_IgorBase):
         score_types = ['lj_atr', 'lj_rep', 'fa_solv', 'fa_elec']
         residue = pose.residue(target_res)
         scores = {residue.atom_name(i): {st: 0 for st in score_types} for i in range(1, residue.natoms() + 1)}
-        # Iterate per target residue's atom per all other residues' atoms
-        for i in range(1, residue.natoms() + 1):
-            iname = residue.atom_name(i)
-            for r in range(1, pose.total_residue() + 1):
-                other = pose.residue(r)
-                for o in range(1, other.natoms() + 1):
-                    score = pyrosetta.toolbox.atom_pair_energy.etable_atom_pair_energies(residue,
-                                                                                         i,
-                                                                                         other,
-                                                                                         o,
-                                                                                         scorefxn)
-                    for st, s in zip(score_types, score):
-                        # technically only fa_intra_rep is 100 fold less than fa_rep
-                        scores[iname][st] += s if target_res != r else s/100
+        # neighbour list: pairs of target residue's atom and other atoms within the cutoff
+        target_xyz = self._get_residue_coordinates(residue)
+        atom_ids, pose_xyz = self._get_pose_coordinates(pose)
+        distances = np.linalg.norm(target_xyz[:, np.newaxis, :] - pose_xyz[np.newaxis, :, :], axis=-1)
+        for i, j in zip(*np.nonzero(distances < self.per_atom_cutoff)):
+            r, o = atom_ids[j]
+            score = pyrosetta.toolbox.atom_pair_energy.etable_atom_pair_energies(residue,
+                                                                                 int(i) + 1,
+                                                                                 pose.residue(r),
+                                                                                 o,
+                                                                                 scorefxn)
+            iname = residue.atom_name(int(i) + 1)
+            for st, s in zip(score_types, score):
+                # technically only fa_intra_rep is 100 fold less than fa_rep
+                scores[iname][st] += s if target_res != r else s/100
         return scores
 
+    @staticmethod
+    def _get_residue_coordinates(residue) -> np.ndarray:
+        return np.array([[xyz.x, xyz.y, xyz.z]
+                         for xyz in map(residue.xyz, range(1, residue.natoms() + 1))]).reshape(-1, 3)
+
+    def _get_pose_coordinates(self, pose: pyrosetta.Pose) -> Tuple[List[Tuple[int, int]], np.ndarray]:
+        """
+        The (residue index, atom index) of all the atoms of the pose and a N x 3 array of their coordinates.
+        """
+        atom_ids: List[Tuple[int, int]] = []
+        coordinates: List[np.ndarray] = []
+        for r in range(1, pose.total_residue() + 1):
+            other = pose.residue(r)
+            atom_ids.extend([(r, o) for o in range(1, other.natoms() + 1)])
+            coordinates.append(self._get_residue_coordinates(other))
+        return atom_ids, np.concatenate(coordinates) if coordinates else np.zeros((0, 3))
+
     def display_energy(self,
                        minimized_mol: Union[Chem.Mol, None],
                        term: Union[str, Enum]='all',
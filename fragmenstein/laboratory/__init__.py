@@ -3,7 +3,9 @@ from ._place import LabPlace
 from ._base import binarize, unbinarize
 from ._place import MolPlacementInput, BinPlacementInput
 from ._extras import LabExtras
+from ._smallworld import SmallWorldClient, LocalSmallWorld
 from ._score import LabScore
+from ._pipeline import LabPipeline
 try:
     from .validator import place_input_validator
 except Exception as error:
@@ -11,7 +13,7 @@ except Exception as error:
     warn(f'Supressed {error.__class__.__name__}: {error}')
     place_input_validator = None
 
-class Laboratory(LabCombine, LabPlace, LabExtras, LabScore):
+class Laboratory(LabCombine, LabPlace, LabExtras, LabScore, LabPipeline):
     """
     This class runs the combination or placement tasks of a list of molecules as subprocesses.
     The module used is ``pebble``, which is the same as ``multiprocessing`` but with a few more features.
@@ -1,8 +1,10 @@
+import itertools
 import logging
 import pebble
 import operator
 import os
-from typing import (Any, Callable, Union, Iterator, Sequence, List, Dict)
+from collections import deque
+from typing import (Any, Callable, Union, Iterator, Sequence, List, Dict, Deque)
 import pandas as pd
 from rdkit import Chem
 from rdkit.Chem import AllChem
@@ -55,8 +57,15 @@ def unbinarize(bin: bytes, ignore_errors:bool=True) -> Union[Chem.Mol, None]:
 class LabBench:
 
     # the ``outcome`` column in the pandas dataframe can have these values in order of niceness:
-    category_labels = ['crashed', 'too distant', 'timeout', 'unstable', 'equally sized', 'deviant', 'acceptable']
+    # 'skipped' are combinations not run as they were rejected by a prefilter (see ``LabCombine.combine``)
+    category_labels = ['crashed', 'skipped', 'too distant', 'timeout', 'unstable', 'equally sized', 'deviant',
+                       'acceptable']
     Victor = Victor  # So it can be swapped for a subclass w/o the need to subclass Laboratory
+    # intermediate molecules kept by Monster (full, final or off), cf. Monster.tracking
+    # Not needed in production and they cost memory, unless overridden by the settings passed.
+    monster_tracking = 'off'
+    # tasks scheduled at once per core by ``__call__`` (unless asynchronous), so an iterator is consumed lazily
+    tasks_per_core = 2
 
     def __init__(self, pdbblock: str,
                  covalent_resi: Union[int, str, None] = None,
@@ -71,7 +80,7 @@ class LabBench:
         self.ligand_resi = ligand_resi
         self.run_plip = run_plip
         self.blacklist = []  # list of names to skip
-        self.settings = settings
+        self.settings = {'monster_tracking': self.monster_tracking, **settings}
         if not len(Victor.journal.handlers):
             Victor.enable_stdout(logging.CRITICAL)
 
@@ -106,8 +115,15 @@ class LabBench:
             except Exception as error:
                 Victor.journal.error(f'{error.__class__.__name__}: {error}')
                 self.raw_results.append({'error': error.__class__.__name__, 'name': ''})
+        return self.results_to_df(self.raw_results)
+
+    def results_to_df(self, raw_results: List[dict]) -> pd.DataFrame:
+        """
+        Converts the results of the subprocesses (``combine_subprocess`` or ``place_subprocess``) to a dataframe.
+        Called by ``get_completed``.
+        """
         # list of dict to dataframe
-        df = pd.DataFrame(self.raw_results)
+        df = pd.DataFrame(raw_results)
         if not len(df) or '∆∆G' not in df.columns:
             Victor.journal.critical('No results were found. Returning an empty dataframe.')
             return df
@@ -220,7 +236,9 @@ class LabBench:
         on ``n_cores`` subprocesses.
         killing any that live longer than ``timeout`` seconds.
         The method returns an iterator of promises ``pebble.ProcessMapFuture`` if ``asynchronous`` is True,
-        or the results as a pandas DataFrame. To convert the promises to a dataframe use ``get_completed``."""
+        or the results as a pandas DataFrame. To convert the promises to a dataframe use ``get_completed``.
+        Unless asynchronous, only ``tasks_per_core`` × ``n_cores`` tasks are scheduled at once,
+        so a generator (e.g. ``AccountableBRICS.iter_builds``) is consumed as the tasks finish, not upfront."""
 
         def max_out(inner_iterator, maximum: int):
             for i, item in zip(range(maximum), inner_iterator):
@@ -232,12 +250,34 @@ class LabBench:
         if max_tasks > 0:
             iterator = max_out(iterator, max_tasks)
 
-        with pebble.ProcessPool(max_workers=n_cores, max_tasks=n_cores) as pool:
-            futures: pebble.ProcessMapFuture = pool.map(fun, iterator, timeout=timeout)
         if asynchronous:
+            with pebble.ProcessPool(max_workers=n_cores, max_tasks=n_cores) as pool:
+                futures: pebble.ProcessMapFuture = pool.map(fun, iterator, timeout=timeout)
             return futures
-        else:
-            return self.get_completed(futures)
+        iterator = iter(iterator)
+        pending: Deque[pebble.ProcessFuture] = deque()
+        self.raw_results = []
+        with pebble.ProcessPool(max_workers=n_cores, max_tasks=n_cores) as pool:
+            while True:
+                for item in itertools.islice(iterator, max(self.tasks_per_core * n_cores - len(pending), 0)):
+                    pending.append(pool.schedule(fun, args=(item,), timeout=timeout))
+                if not pending:
+                    break
+                try:
+                    self.raw_results.append(pending.popleft().result())
+                except TimeoutError as error:
+                    Victor.journal.error("Function took longer than %d seconds" % error.args[1])
+                    self.raw_results.append({'error': 'TimeoutError', 'name': ''})
+                except KeyboardInterrupt as error:
+                    print('Keyboard!')
+                    self.raw_results.append({'error': 'KeyboardInterrupt', 'name': ''})
+                    for future in pending:
+                        future.cancel()
+                    break
+                except Exception as error:
+                    Victor.journal.error(f'{error.__class__.__name__}: {error}')
+                    self.raw_results.append({'error': error.__class__.__name__, 'name': ''})
+        return self.results_to_df(self.raw_results)
 
     @staticmethod
     def fix_intxns(df):
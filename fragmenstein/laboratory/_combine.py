@@ -1,6 +1,7 @@
 import itertools
-from typing import Union, Sequence, List, Iterator
+from typing import Union, Sequence, List, Iterator, Tuple, Dict, Any
 
+import numpy as np
 import pandas as pd
 import pebble
 from rdkit import Chem, rdBase
@@ -10,6 +11,9 @@ from ..igor import pyrosetta  # this may be pyrosetta or a mock for Sphinx in RT
 
 
 class LabCombine(LabBench):
+    joining_cutoff = 5.  # Å, passed to ``Victor.combine`` and used by the prefilter, unless in ``.settings``
+    # the joining distance of a collapsed ring is reduced by 1.35 + 0.2 Å per ring core (cf. ``Monster._join_atoms``)
+    prefilter_margin = 2 * (1.35 + 0.2)
 
     def combine_subprocess(self, binary_hits: List[bytes]):
         """
@@ -36,7 +40,7 @@ class LabCombine(LabBench):
                                  )
             victor.monster_throw_on_discard = True
             victor.monster.throw_on_discard = True
-            victor.combine()
+            victor.combine(joining_cutoff=self.settings.get('joining_cutoff', self.joining_cutoff))
             result: dict = victor.summarize()
             result['unmin_binary'] = binarize(victor.monster.positioned_mol)
             result['min_binary'] = binarize(victor.minimized_mol)
@@ -56,19 +60,69 @@ class LabCombine(LabBench):
                 mols: Sequence[Chem.Mol],
                 permute: bool = True,
                 combination_size: int = 2,
+                prefilter: bool = False,
                 **kwargs) -> Union[pebble.ProcessMapFuture, pd.DataFrame]:
         """
         Combine all of ``mols`` with each other in combinations of ``combination_size``.
         Due to the way Monster works merging A with B may yield a different result to B with A.
         Hence the ``permute`` boolean argument.
+        For ``combination_size`` > 2, the pairwise merging of shared prefixes is memoised in each worker
+        (see ``Monster.merge_cache_size``), setting ``Monster.merge_cache_path`` to a folder shares these
+        across workers.
+
+        If ``prefilter`` is True (opt-in, as the CLI does), combinations whose hits cannot be linked
+        (see ``get_hopeless_combinations``) are not dispatched, but get the outcome 'skipped'.
         """  # extended at end of file.
         iterator: Iterator
-        if permute:
-            iterator = itertools.permutations(map(binarize, mols), combination_size)
+        skipped: List[Dict[str, Any]]
+        if prefilter:
+            # the max_tasks are applied beforehand as the CLI pipeline relies on it for its chunking
+            iterator, skipped = self.get_combination_indices(mols, permute, combination_size,
+                                                             prefilter=True, max_tasks=kwargs.pop('max_tasks', 0))
         else:
-            iterator = itertools.combinations(map(binarize, mols), combination_size)
+            iterator, skipped = self.get_combination_indices(mols, permute, combination_size, prefilter=False)
+        binaries: List[bytes] = list(map(binarize, mols))
+        iterator = ([binaries[i] for i in combination] for combination in iterator)
         df = self(iterator=iterator, fun=self.combine_subprocess, **kwargs)
-        df['outcome'] = df.apply(self.categorize, axis=1)
+        return self.finish_combinations(df, skipped)
+
+    def get_combination_indices(self,
+                                mols: Sequence[Chem.Mol],
+                                permute: bool = True,
+                                combination_size: int = 2,
+                                prefilter: bool = False,
+                                max_tasks: int = 0) -> Tuple[Iterator[Tuple[int, ...]], List[Dict[str, Any]]]:
+        """
+        The combinations of indices of ``mols`` to run and the results of those skipped by the prefilter
+        (see ``combine``). ``max_tasks`` is applied only with the prefilter.
+        """
+        iterator: Iterator
+        if permute:
+            iterator = itertools.permutations(range(len(mols)), combination_size)
+        else:
+            iterator = itertools.combinations(range(len(mols)), combination_size)
+        skipped: List[Dict[str, Any]] = []
+        if prefilter:
+            if max_tasks > 0:
+                iterator = itertools.islice(iterator, max_tasks)
+            indices: List[Tuple[int, ...]] = list(iterator)
+            hopeless: Dict[Tuple[int, ...], float] = self.get_hopeless_combinations(mols, indices)
+            iterator = iter([combination for combination in indices if combination not in hopeless])
+            skipped = [dict(name='-'.join([mols[i].GetProp('_Name') for i in combination]),
+                            error=f'DistanceError (skipped) hits cannot be linked: {distance:.1f} Å apart',
+                            outcome='skipped')
+                       for combination, distance in hopeless.items()]
+        return iterator, skipped
+
+    def finish_combinations(self, df: pd.DataFrame, skipped: Sequence[Dict[str, Any]] = ()) -> pd.DataFrame:
+        """
+        Adds the outcome and simple SMILES to the dataframe of combinations (from ``get_completed``),
+        plus the skipped ones.
+        """
+        if len(df):
+            df['outcome'] = df.apply(self.categorize, axis=1)
+        if skipped:
+            df = pd.concat([df, pd.DataFrame(skipped)], ignore_index=True)
         with rdBase.BlockLogs():
             if 'unmin_binary' in df.columns:
                 # doing at the binary level in case it failed
@@ -78,6 +132,53 @@ class LabCombine(LabBench):
         self.fix_intxns(df)
         return df
 
+    @staticmethod
+    def get_hit_distances(mols: Sequence[Chem.Mol]) -> np.ndarray:
+        """
+        The minimum heavy atom distance between each pair of hits (symmetric matrix in Å).
+        """
+        positions: List[np.ndarray] = [mol.GetConformer().GetPositions()[
+                                           [atom.GetIdx() for atom in mol.GetAtoms() if atom.GetAtomicNum() > 1]
+                                       ] for mol in mols]
+        distances = np.zeros((len(mols), len(mols)))
+        for i, j in itertools.combinations(range(len(mols)), 2):
+            if not len(positions[i]) or not len(positions[j]):
+                distances[i, j] = distances[j, i] = np.inf
+                continue
+            deltas = positions[i][:, np.newaxis, :] - positions[j][np.newaxis, :, :]
+            distances[i, j] = distances[j, i] = np.sqrt(np.min(np.sum(deltas ** 2, axis=-1)))
+        return distances
+
+    def get_hopeless_combinations(self,
+                                  mols: Sequence[Chem.Mol],
+                                  combinations: Sequence[Tuple[int, ...]]) -> Dict[Tuple[int, ...], float]:
+        """
+        A cheap geometric prefilter: the distances are calculated once for all hits.
+        A combination is hopeless if its hits cannot all be connected via pairs closer than
+        ``joining_cutoff`` + ``prefilter_margin`` (the latter as collapsed rings join from their centroid).
+        Overlapping hits (merges) are always connected.
+        The minimum distance alone decides: an overlap volume adds nothing to whether the hits can be linked,
+        as any overlap is a distance of zero, hence it is not calculated.
+
+        :param mols: hits
+        :param combinations: tuples of indices of ``mols``
+        :return: hopeless combinations to the largest gap (Å) needed to be linked
+        """
+        distances = self.get_hit_distances(mols)
+        threshold = self.settings.get('joining_cutoff', self.joining_cutoff) + self.prefilter_margin
+        hopeless = {}
+        for combination in combinations:
+            # grow the cluster from the first hit by the closest remaining hit (Prim's algorithm)
+            connected, remainder, gap = [combination[0]], list(combination[1:]), 0.
+            while remainder:
+                closest = min(remainder, key=lambda r: distances[connected, r].min())
+                gap = max(gap, distances[connected, closest].min())
+                connected.append(closest)
+                remainder.remove(closest)
+            if gap > threshold:
+                hopeless[tuple(combination)] = gap
+        return hopeless
+
     def twoway_combine(self,
                        primary_mols: Sequence[Chem.Mol],
                        secondary_mols: Sequence[Chem.Mol],
@@ -2,9 +2,16 @@ import pandas as pd
 from rdkit import Chem, rdBase, DataStructs
 from rdkit.Chem import PandasTools
 from .validator import place_input_validator
+from ._smallworld import SmallWorldClient, LocalSmallWorld
 from .._cli_defaults import cli_default_settings
+import os
+import queue
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from collections import deque
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional, Iterator, Set, Tuple, Deque, Union
+import pebble
 
 
 class LabExtras:
@@ -69,22 +76,108 @@ class LabExtras:
 
     # ---------- CLI --------------------------------------------
 
+    # chunks of analogues the search thread of ``core_ops`` may be ahead of the placements by
+    core_queued_chunks = 10
+
     @classmethod
     def core_ops(cls, hit_replacements, sw_databases, **settings):
+        """
+        Combine, search for analogues and place these.
+        The SmallWorld queries are searched on a background thread (see ``_search_to_queue``),
+        which hands over the analogues in chunks as they arrive (see ``iter_sw_search``)
+        to a single placement pool (see ``_place_from_queue``),
+        so the later queries are still being searched while the first analogues are placed.
+        """
         combinations: pd.DataFrame = cls._combine_ops(**settings)
         cls.correct_weaklings(hit_replacements, combinations)
-        uncat_analogs: List[pd.DataFrame] = []
-        for sw_db in sw_databases:
-            s = cls.sw_search(combinations, sw_db=sw_db, **settings)
-            s = s.loc[~s.hits.isna()]
-            if len(s):
-                uncat_analogs.append(s)
+        chunks: queue.Queue = queue.Queue(maxsize=cls.core_queued_chunks)
+        searcher = threading.Thread(target=cls._search_to_queue,
+                                    args=(chunks, combinations, sw_databases),
+                                    kwargs=settings,
+                                    daemon=True)
+        searcher.start()
+        uncat_analogs, placements = cls._place_from_queue(chunks, **settings)
+        searcher.join()
         assert uncat_analogs, 'No analogues were found!'
-        analogs: pd.DataFrame = pd.concat(uncat_analogs, ignore_index=True).drop_duplicates('smiles')
+        analogs: pd.DataFrame = pd.concat(uncat_analogs, ignore_index=True)
         analogs.to_pickle(f'fragmenstein_analogs{settings["suffix"]}.pkl.gz')
-        placements: pd.DataFrame = cls._place_ops(analogs=analogs, **settings)
+        placements.to_pickle(f'fragmenstein_placed{settings["suffix"]}.pkl.gz')
+        placements.to_csv(f'fragmenstein_placed{settings["suffix"]}.csv')
         return placements
 
+    @classmethod
+    def _search_to_queue(cls, chunks: queue.Queue, combinations: pd.DataFrame, sw_databases, **settings):
+        """
+        The search thread of ``core_ops``: puts the chunks of analogues of each database in ``chunks``,
+        followed by ``None`` when done or the exception raised.
+        """
+        try:
+            for sw_db in sw_databases:
+                for chunk in cls.iter_sw_search(combinations, sw_db=sw_db, **settings):
+                    chunks.put(chunk)
+        except Exception as error:
+            chunks.put(error)
+        else:
+            chunks.put(None)
+
+    @classmethod
+    def _place_from_queue(cls,
+                          chunks: queue.Queue,
+                          pdbblock: str,
+                          n_cores: int = cli_default_settings['n_cores'],
+                          timeout: int = cli_default_settings['timeout'],
+                          **settings) -> Tuple[List[pd.DataFrame], pd.DataFrame]:
+        """
+        The placement part of ``core_ops``: places the new analogues of the chunks from ``_search_to_queue``
+        on one process pool as they arrive, with up to two tasks per core in flight.
+        The chunks are taken only while fewer than ten analogues per core are waiting to be placed,
+        so the search thread is held up by the queue if it is too far ahead.
+
+        :return: the (new) analogues and the placements
+        """
+        if n_cores <= 0:
+            n_cores = os.cpu_count() - n_cores
+        placer = cls(pdbblock=pdbblock, covalent_resi=None, run_plip=True)  # noqa it's inherited later
+        max_tasks: int = 2 * n_cores
+        max_queued: int = 10 * n_cores
+        to_place: Deque[Dict[str, Any]] = deque()
+        tasks: Dict[Future, str] = {}  # future -> name
+        placement_results: List[dict] = []
+        uncat_analogs: List[pd.DataFrame] = []
+        dejavu: Set[str] = set()
+        searching = True
+        with pebble.ProcessPool(max_workers=n_cores, max_tasks=n_cores) as pool:
+            while searching or to_place or tasks:
+                # wait for analogues only if there is nothing else to do
+                while searching and len(to_place) < max_queued:
+                    try:
+                        chunk: Union[pd.DataFrame, Exception, None] = chunks.get(block=not tasks and not to_place)
+                    except queue.Empty:
+                        break
+                    if chunk is None:
+                        searching = False
+                        break
+                    elif isinstance(chunk, Exception):
+                        raise chunk
+                    chunk = chunk.loc[~chunk.hits.isna() & ~chunk.smiles.isin(dejavu)].drop_duplicates('smiles')
+                    if not len(chunk):
+                        continue
+                    dejavu.update(chunk.smiles)
+                    uncat_analogs.append(chunk)
+                    to_place.extend(placer.get_placement_input(row)
+                                    for _, row in place_input_validator(chunk).iterrows())
+                while to_place and len(tasks) < max_tasks:
+                    inputs = to_place.popleft()
+                    tasks[pool.schedule(placer.place_subprocess, args=(inputs,), timeout=timeout)] = inputs['name']
+                if not tasks:
+                    continue
+                # while searching, check for new analogues every second
+                done, _ = wait(tasks, timeout=1 if searching else None, return_when=FIRST_COMPLETED)
+                for future in done:
+                    placement_results.append(cls._get_pipelined_result(future, tasks.pop(future)))  # noqa inherited
+        placements: pd.DataFrame = placer.finish_placements(placer.results_to_df(placement_results))
+        return uncat_analogs, placements
+
     @classmethod
     def _combine_ops(cls,
                      hits,
@@ -107,12 +200,32 @@ class LabExtras:
                                                  n_cores=n_cores,
                                                  timeout=timeout,
                                                  combination_size=combination_size,
+                                                 prefilter=True,
                                                  max_tasks=max_tasks)
         combinations.to_pickle(f'fragmenstein_mergers{suffix}.pkl.gz')
         combinations.to_csv(f'fragmenstein_mergers{suffix}.csv')
         cls.Victor.journal.info(f'Combination {time.time() - tick} s')
         return combinations
 
+    @classmethod
+    def get_sw_client(cls,
+                      sw_cache: Optional[str] = cli_default_settings['sw_cache'],
+                      sw_local: Optional[str] = cli_default_settings['sw_local'],
+                      sw_workers: int = cli_default_settings['sw_workers'],
+                      **settings) -> SmallWorldClient:
+        """
+        The SmallWorld client used by ``sw_search`` if none is given.
+        If ``sw_local`` is a SMILES file (``.smi``) or a table of earlier results,
+        it is searched instead of SmallWorld (see ``LocalSmallWorld``).
+        """
+        if not sw_local:
+            backend = None
+        elif sw_local.endswith('.smi'):
+            backend = LocalSmallWorld(smi=sw_local)
+        else:
+            backend = LocalSmallWorld(fixture=sw_local)
+        return SmallWorldClient(backend, cache_folder=sw_cache or None, n_workers=sw_workers)
+
     @classmethod
     def sw_search(cls, combinations: pd.DataFrame, suffix: str,
                   sw_dist: int, sw_length: int,
@@ -123,11 +236,34 @@ class LabExtras:
                   **setting) -> pd.DataFrame:
         """
         One of the operations of ``core_ops``.
-        A thin wrapper around ``SmallWorld().search_many``.
+        A thin wrapper around ``SmallWorldClient.search_many`` (or ``SmallWorld().search_many`` if passed as ``sws``).
         It will search for analogues in SmallWorld.
         To not go overboard ``top_mergers`` should probably not be greater than 1000 as a 1,000 calls is abusing it.
         If ranking is None then it assumed sorted.
         """
+        chunks: List[pd.DataFrame] = list(cls.iter_sw_search(combinations, suffix=suffix,
+                                                             sw_dist=sw_dist, sw_length=sw_length, sw_db=sw_db,
+                                                             top_mergers=top_mergers,
+                                                             ranking=ranking, ranking_ascending=ranking_ascending,
+                                                             sws=sws, chunk_size=0, **setting))
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True)
+
+    @classmethod
+    def iter_sw_search(cls, combinations: pd.DataFrame, suffix: str,
+                       sw_dist: int, sw_length: int,
+                       sw_db: str,
+                       top_mergers: int=1_000,
+                       ranking: Optional[str] = None, ranking_ascending: Optional[bool] = None,
+                       sws: Optional = None,
+                       chunk_size: Optional[int] = None,
+                       **settings) -> Iterator[pd.DataFrame]:
+        """
+        As ``sw_search``, but the analogues are yielded in chunks of at least ``chunk_size`` analogues
+        as the replies arrive (default: ten per core, 0 is all at once).
+        A ``sws`` without ``iter_search_many`` (say ``smallworld_api.SmallWorld``) is searched all at once.
+        """
         if ranking is None:
             queries = combinations
         elif ranking_ascending is None:
@@ -146,37 +282,65 @@ class LabExtras:
                 .reset_index() \
                 .head(top_mergers)
         if sws is None:
-            from smallworld_api import SmallWorld, NoMatchError
-            sws = SmallWorld()
-        try:
-            analogs = sws.search_many(queries[smiles_col].to_list(),
-                                      dist=sw_dist,
-                                      length=sw_length,
-                                      db=sw_db,
-                                      tolerated_exceptions=Exception)
-            analogs.to_pickle(f'fragmenstein_analogues{suffix}.{sw_db}.pkl.gz')
-            invalid = analogs.qrySmiles.astype(str).isin(['None', 'nan', ''])
-            analogs = analogs.loc[~invalid]
-        except NoMatchError as error:
+            sws = cls.get_sw_client(**settings)
+        if chunk_size is None:
+            chunk_size = 10 * settings.get('n_cores', cli_default_settings['n_cores'])
+        # keyed by index label so that ``query_index`` maps back to ``queries``
+        query: Dict[Any, str] = queries[smiles_col].to_dict()
+        if hasattr(sws, 'iter_search_many'):
+            replies: Iterator[pd.DataFrame] = sws.iter_search_many(query, dist=sw_dist, length=sw_length, db=sw_db)
+        else:
+            try:
+                replies = iter([sws.search_many(query, dist=sw_dist, length=sw_length, db=sw_db,
+                                                tolerated_exceptions=Exception)])
+            except Exception as error:
+                if error.__class__.__name__ != 'NoMatchError':
+                    raise error
+                replies = iter([])
+        processed: List[pd.DataFrame] = []
+        pending: List[pd.DataFrame] = []
+        for reply in replies:
+            pending.append(reply)
+            if chunk_size and sum(map(len, pending)) >= chunk_size:
+                processed.append(cls._process_sw_analogs(pd.concat(pending, ignore_index=True), queries, sw_db))
+                pending = []
+                if len(processed[-1]):
+                    yield processed[-1]
+        if pending:
+            processed.append(cls._process_sw_analogs(pd.concat(pending, ignore_index=True), queries, sw_db))
+            if len(processed[-1]):
+                yield processed[-1]
+        if not any(map(len, processed)):
             print(f'Found no analogues. Consider changing `sw_dist` (distance by N of mismatches)')
-            return pd.DataFrame()
+            return
+        analogs: pd.DataFrame = pd.concat(processed, ignore_index=True)
         print(f'Found {len(analogs)} analogues')
+        analogs.to_pickle(f'fragmenstein_analogues{suffix}.{sw_db}.pkl.gz')
+
+    @classmethod
+    def _process_sw_analogs(cls, analogs: pd.DataFrame, queries: pd.DataFrame, sw_db: str) -> pd.DataFrame:
+        """
+        Adds the merger details to the SmallWorld replies (called by ``iter_sw_search``)
+        """
+        invalid = analogs.qrySmiles.astype(str).isin(['None', 'nan', ''])
+        analogs = analogs.loc[~invalid].copy()
         # query_index was added clientside to keep track!
         analogs['catalogue'] = sw_db
         analogs['query_name'] = analogs.query_index.map(queries.name.to_dict())
         analogs['hits'] = analogs.query_index.map(queries.hit_mols.to_dict())
         analogs = analogs.loc[~analogs.hits.isna()]  # not sure how this is possible, but can happen?
+        if not len(analogs):
+            return analogs
         analogs['hit_names'] = analogs.hits.apply(lambda m: [mm.GetProp('_Name') for mm in m])
         analogs['minimized_merger'] = analogs.query_index.map(queries.minimized_mol.to_dict())
         analogs['unminimized_merger'] = analogs.query_index.map(queries.unminimized_mol.to_dict())
         analogs['name'] = analogs['id'] + ':' + analogs['query_name']
         analogs['smiles'] = analogs.hitSmiles.str.split(expand=True)[0]
         analogs['custom_map'] = analogs.apply(cls.get_custom_map, axis=1)
-        analogs.to_pickle(f'fragmenstein_analogues{suffix}.{sw_db}.pkl.gz')
         return analogs
 
     @classmethod
-    def _place_ops(cls, analogs, pdbblock, n_cores, timeout, suffix, **settings) -> pd.DataFrame:
+    def _place_ops(cls, analogs, pdbblock, n_cores, timeout, suffix, save: bool = True, **settings) -> pd.DataFrame:
         """
         This is the classmethod called by ``core_ops``.
         The instance method ``place`` does the actual work, this is a thin wrapper.
@@ -185,8 +349,9 @@ class LabExtras:
         placements: pd.DataFrame = lab.place(place_input_validator(analogs),
                                              n_cores=n_cores,
                                              timeout=timeout)
-        placements.to_pickle(f'fragmenstein_placed{suffix}.pkl.gz')
-        placements.to_csv(f'fragmenstein_placed{suffix}.csv')
+        if save:
+            placements.to_pickle(f'fragmenstein_placed{suffix}.pkl.gz')
+            placements.to_csv(f'fragmenstein_placed{suffix}.csv')
         # print(placements.outcome.value_counts())
         return placements
 
@@ -0,0 +1,224 @@
+import heapq
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError, wait, FIRST_COMPLETED
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+import pebble
+from rdkit import Chem
+
+from ._base import binarize
+from ._place import BinPlacementInput
+from .validator import place_input_validator
+from .._cli_defaults import cli_default_settings
+
+
+class LabPipeline:
+    """
+    The pipelined alternative to ``LabExtras.core_ops`` (which combines, then searches, then places).
+    """
+    # tasks in flight on the process pool per core: a few more than one so that the pool never idles
+    pipeline_tasks_per_core = 2
+    # mergers waiting to be searched and analogues waiting to be placed per core before no new merger is started
+    pipeline_queue_per_core = 10
+
+    @classmethod
+    def pipelined_ops(cls,
+                      hit_replacements: pd.DataFrame,
+                      hits: Sequence[Chem.Mol],
+                      pdbblock: str,
+                      sw_databases: Sequence[str] = cli_default_settings['sw_databases'],
+                      sw_dist: int = cli_default_settings['sw_dist'],
+                      sw_length: int = cli_default_settings['sw_length'],
+                      suffix: str = cli_default_settings['suffix'],
+                      n_cores: int = cli_default_settings['n_cores'],
+                      combination_size: int = cli_default_settings['combination_size'],
+                      timeout: int = cli_default_settings['timeout'],
+                      max_tasks: int = cli_default_settings['max_tasks'],
+                      top_mergers: int = cli_default_settings['top_mergers'],
+                      ranking: str = cli_default_settings['ranking'],
+                      blacklist: List[str] = cli_default_settings['blacklist'],
+                      sws: Optional = None,
+                      **settings) -> pd.DataFrame:
+        """
+        Combine, search for analogues and place these as ``core_ops`` does, but as a pipeline:
+        each acceptable merger is searched in SmallWorld as soon as it is made (on the threads of the client),
+        and each analogue is placed as soon as it is found,
+        on the same process pool as the combinations, which is never idle while there is work.
+
+        The pending analogues are placed before new combinations are started
+        and no new combination is started, nor merger searched,
+        while ``pipeline_queue_per_core`` × ``n_cores`` mergers or analogues are waiting, so the memory is bounded.
+        As the mergers are not known all at once, they are ranked (by ``ranking``, as in ``sw_search``)
+        only against the others waiting to be searched, which are searched best first.
+        The selection differs from that of ``core_ops``:
+        the first ``top_mergers`` acceptable (and not weaker than their hits) mergers to be made are searched,
+        not the ``top_mergers`` best of all the mergers, hence why this is opt-in (``--pipelined``).
+        ``max_tasks`` caps the combinations as in ``combine``.
+
+        The same files as ``core_ops`` are written.
+        """
+        if n_cores <= 0:
+            n_cores = os.cpu_count() - n_cores
+        combiner = cls(pdbblock=pdbblock, covalent_resi=None)  # noqa it's inherited later
+        combiner.blacklist = blacklist
+        placer = cls(pdbblock=pdbblock, covalent_resi=None, run_plip=True)  # noqa it's inherited later
+        indices, skipped = combiner.get_combination_indices(hits, combination_size=combination_size,
+                                                            prefilter=True, max_tasks=max_tasks)
+        binaries: List[bytes] = list(map(binarize, hits))
+        names: List[str] = [hit.GetProp('_Name') for hit in hits]
+        if sws is None:
+            sws = cls.get_sw_client(**settings)  # noqa it's inherited later
+        search: Callable[..., pd.DataFrame] = getattr(sws, 'search', None) or sws.search_smiles
+        max_in_flight: int = cls.pipeline_tasks_per_core * n_cores
+        max_queued: int = cls.pipeline_queue_per_core * n_cores
+        max_searches: int = getattr(sws, 'batch_size', cli_default_settings['sw_workers'])
+        # ## state
+        tasks: Dict[Future, Tuple[str, str]] = {}  # future -> stage, name
+        searches: Dict[Future, Tuple[int, str]] = {}  # future -> merger index, database
+        to_search: List[Tuple[float, int, str]] = []  # heap of ranking score, merger index, database
+        to_place: Deque[BinPlacementInput] = deque()
+        mergers: Dict[int, pd.DataFrame] = {}  # one row each. Removed once all its databases are searched
+        n_searches_left: Dict[int, int] = {}
+        searched_smiles: Set[str] = set()
+        dejavu: Set[str] = set()
+        combination_results: List[dict] = []
+        placement_results: List[dict] = []
+        uncat_analogs: List[pd.DataFrame] = []
+        tick = time.time()
+        with pebble.ProcessPool(max_workers=n_cores, max_tasks=n_cores) as pool, \
+                ThreadPoolExecutor(max_workers=getattr(sws, 'n_workers', 1)) as executor:
+            while True:
+                # ## submit
+                while to_search and len(searches) < max_searches and len(to_place) < max_queued:
+                    _, merger_index, sw_db = heapq.heappop(to_search)
+                    query_smiles: str = mergers[merger_index].simple_smiles.iloc[0]
+                    future = executor.submit(search, smiles=query_smiles, db=sw_db, dist=sw_dist, length=sw_length)
+                    searches[future] = (merger_index, sw_db)
+                while len(tasks) < max_in_flight:
+                    if to_place:
+                        inputs: BinPlacementInput = to_place.popleft()
+                        future = pool.schedule(placer.place_subprocess, args=(inputs,), timeout=timeout)
+                        tasks[future] = ('place', inputs['name'])
+                    elif len(to_search) + len(mergers) < max_queued:
+                        combination: Optional[Tuple[int, ...]] = next(indices, None)
+                        if combination is None:
+                            break
+                        future = pool.schedule(combiner.combine_subprocess,
+                                               args=([binaries[i] for i in combination],),
+                                               timeout=timeout)
+                        tasks[future] = ('combine', '-'.join([names[i] for i in combination]))
+                    else:
+                        break
+                if not tasks and not searches:
+                    break
+                # ## collect
+                done, _ = wait([*tasks, *searches], return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in searches:
+                        merger_index, sw_db = searches.pop(future)
+                        analogs: pd.DataFrame = cls._get_pipelined_analogs(future, mergers[merger_index], sw_db)
+                        n_searches_left[merger_index] -= 1
+                        if not n_searches_left[merger_index]:
+                            del mergers[merger_index], n_searches_left[merger_index]
+                        analogs = analogs.loc[~analogs.smiles.isin(dejavu)].drop_duplicates('smiles') \
+                            if len(analogs) else analogs
+                        if not len(analogs):
+                            continue
+                        dejavu.update(analogs.smiles)
+                        uncat_analogs.append(analogs)
+                        for _, row in place_input_validator(analogs).iterrows():
+                            to_place.append(placer.get_placement_input(row))
+                        continue
+                    stage, name = tasks.pop(future)
+                    result: dict = cls._get_pipelined_result(future, name)
+                    if stage == 'place':
+                        placement_results.append(result)
+                        continue
+                    combination_results.append(result)
+                    # first come, first searched: not the best ``top_mergers`` overall (see docstring)
+                    if len(searched_smiles) >= int(top_mergers):
+                        continue
+                    merger: pd.DataFrame = combiner.finish_combinations(combiner.results_to_df([result]))
+                    if 'simple_smiles' not in merger.columns:
+                        continue
+                    cls.correct_weaklings(hit_replacements, merger)  # noqa it's inherited later
+                    smiles: str = merger.simple_smiles.iloc[0]
+                    if merger.outcome.iloc[0] != 'acceptable' or not smiles or smiles in searched_smiles:
+                        continue
+                    searched_smiles.add(smiles)
+                    merger.index = [len(searched_smiles)]
+                    mergers[merger.index[0]] = merger
+                    n_searches_left[merger.index[0]] = len(sw_databases)
+                    score: float = cls._get_pipelined_rank(merger, ranking)
+                    for sw_db in sw_databases:
+                        heapq.heappush(to_search, (score, merger.index[0], sw_db))
+        cls.Victor.journal.info(f'Pipelined combination, search and placement {time.time() - tick} s')  # noqa
+        # ## tabulate
+        combinations: pd.DataFrame = combiner.finish_combinations(combiner.results_to_df(combination_results),
+                                                                  skipped)
+        cls.correct_weaklings(hit_replacements, combinations)  # noqa it's inherited later
+        combinations.to_pickle(f'fragmenstein_mergers{suffix}.pkl.gz')
+        combinations.to_csv(f'fragmenstein_mergers{suffix}.csv')
+        assert uncat_analogs, 'No analogues were found!'
+        analogs: pd.DataFrame = pd.concat(uncat_analogs, ignore_index=True)
+        print(f'Found {len(analogs)} analogues')
+        analogs.to_pickle(f'fragmenstein_analogs{suffix}.pkl.gz')
+        placements: pd.DataFrame = placer.finish_placements(placer.results_to_df(placement_results))
+        placements.to_pickle(f'fragmenstein_placed{suffix}.pkl.gz')
+        placements.to_csv(f'fragmenstein_placed{suffix}.csv')
+        return placements
+
+    @classmethod
+    def _get_pipelined_result(cls, future: Future, name: str) -> dict:
+        """
+        The result of a ``combine_subprocess`` or ``place_subprocess`` future (cf. ``get_completed``)
+        """
+        try:
+            return future.result()
+        except TimeoutError:
+            cls.Victor.journal.error(f'{name} took longer than the timeout')  # noqa
+            return {'error': 'TimeoutError', 'name': name}
+        except Exception as error:
+            cls.Victor.journal.error(f'{error.__class__.__name__}: {error}')  # noqa
+            return {'error': error.__class__.__name__, 'name': name}
+
+    @classmethod
+    def _get_pipelined_rank(cls, merger: pd.DataFrame, ranking: str) -> float:
+        """
+        The score of a single merger for the heap of mergers to search, lowest first
+        (cf. the order of ``sw_search``, wherein LE and N_interactions are descending).
+        Mergers without the ranking column or with a NaN value go last.
+        """
+        if ranking not in merger.columns:
+            return math.inf
+        value = merger[ranking].iloc[0]
+        if value is None or pd.isna(value):
+            return math.inf
+        return -float(value) if ranking in ('LE', 'N_interactions') else float(value)
+
+    @classmethod
+    def _get_pipelined_analogs(cls, future: Future, merger: pd.DataFrame, sw_db: str) -> pd.DataFrame:
+        """
+        The analogues of a single merger (cf. ``iter_sw_search``)
+        """
+        smiles: str = merger.simple_smiles.iloc[0]
+        try:
+            reply: pd.DataFrame = future.result()
+        except Exception as error:
+            # smallworld_api is optional, hence by name
+            if error.__class__.__name__ != 'NoMatchError':
+                cls.Victor.journal.warning(f'{error.__class__.__name__}: {error} for {smiles}')  # noqa
+            return pd.DataFrame()
+        if reply is None or not len(reply):
+            return pd.DataFrame()
+        reply = reply.copy()
+        reply['query_index'] = merger.index[0]
+        reply['query_smiles'] = smiles
+        analogs: pd.DataFrame = cls._process_sw_analogs(reply, merger, sw_db)  # noqa it's inherited later
+        if not len(analogs):
+            return analogs
+        return analogs.loc[~analogs.hits.isna()]
@@ -95,11 +95,7 @@ class LabPlace(LabBench):
 
         def generator():
             for idx, data in pre_iterator:
-                inputs = {'smiles': data['smiles'],
-                       'name': data['name'],
-                       'binary_hits': [binarize(m) for m in data['hits']]}
-                if 'custom_map' in data:
-                    inputs['custom_map'] = data['custom_map']
+                inputs: BinPlacementInput = self.get_placement_input(data)
                 if expand_isomers:
                     assert 'custom_map' not in inputs, 'custom_map not supported with expand_isomers'
                     for i, sub_smiles in enumerate(self.Victor.get_isomers_smiles(data['smiles'])):
@@ -110,6 +106,23 @@ class LabPlace(LabBench):
                     yield inputs
 
         df = self(iterator=generator(), fun=self.place_subprocess, **kwargs)
+        return self.finish_placements(df)
+
+    @staticmethod
+    def get_placement_input(data: Union[MolPlacementInput, pd.Series]) -> BinPlacementInput:
+        inputs = {'smiles': data['smiles'],
+                  'name': data['name'],
+                  'binary_hits': [binarize(m) for m in data['hits']]}
+        if 'custom_map' in data:
+            inputs['custom_map'] = data['custom_map']
+        return inputs
+
+    def finish_placements(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Adds the outcome to the dataframe of placements (from ``get_completed``).
+        """
+        if not len(df):
+            return df
         df['outcome'] = df.apply(functools.partial(self.categorize, size_tolerance=+50), axis=1)
         if 'unminimized_mol' in df.columns:
             df['unminimized_mol'] = df.unminimized_mol.fillna(Chem.Mol()) # noqa
@@ -0,0 +1,282 @@
+import hashlib
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+from warnings import warn
+
+import pandas as pd
+from rdkit import Chem, DataStructs
+from rdkit.Chem import AllChem, rdFMCS
+
+
+class SmallWorldClient:
+    """
+    Searches many SMILES in SmallWorld (https://sw.docking.org) concurrently.
+
+    * Repeated SMILES are searched once.
+    * Up to ``batch_size`` queries are in flight at once, on ``n_workers`` threads,
+      with at least ``min_interval`` seconds between submissions so not to abuse the server.
+    * The replies are cached on disk in ``cache_folder`` keyed by query SMILES, database, distance and length,
+      so a rerun does not search again. ``None`` (default) is no cache.
+
+    The ``backend`` is either a class (or factory) of objects with the method
+    ``search_smiles(smiles, db, dist, length)`` -one is made per thread as ``smallworld_api.SmallWorld`` is stateful-
+    or an instance thereof, which is shared by the threads (e.g. ``LocalSmallWorld``).
+    The default is ``smallworld_api.SmallWorld``.
+
+    ``search_many`` has the same signature as that of ``smallworld_api.SmallWorld``,
+    so the client can be passed as ``sws`` to ``LabExtras.sw_search``,
+    while ``iter_search_many`` yields the results as they arrive.
+    """
+
+    def __init__(self,
+                 backend: Union[None, Callable[[], Any], Any] = None,
+                 cache_folder: Optional[str] = None,
+                 n_workers: int = 4,
+                 min_interval: float = 0.5,
+                 batch_size: int = 20):
+        if backend is None:
+            from smallworld_api import SmallWorld
+            backend = SmallWorld
+        if isinstance(backend, type) or not hasattr(backend, 'search_smiles'):
+            self.backend_factory: Callable[[], Any] = backend
+            self.shared_backend = None
+        else:
+            self.backend_factory = None
+            self.shared_backend = backend
+        self.cache_folder: Optional[Path] = Path(cache_folder) if cache_folder else None
+        if self.cache_folder:
+            self.cache_folder.mkdir(parents=True, exist_ok=True)
+        self.n_workers = max(n_workers, 1)
+        self.min_interval = min_interval
+        self.batch_size = max(batch_size, 1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_submission = 0.
+
+    def get_backend(self):
+        if self.shared_backend is not None:
+            return self.shared_backend
+        if not hasattr(self._local, 'backend'):
+            self._local.backend = self.backend_factory()
+        return self._local.backend
+
+    def get_cache_path(self, smiles: str, db: str, dist: int, length: int) -> Optional[Path]:
+        if self.cache_folder is None:
+            return None
+        key: str = hashlib.sha1(json.dumps([smiles, db, int(dist), int(length)]).encode()).hexdigest()
+        return self.cache_folder / f'{key}.pkl.gz'
+
+    def search(self, smiles: str, db: str, dist: int, length: int) -> pd.DataFrame:
+        """
+        Search a single SMILES, or retrieve the cached reply.
+        No match is an empty dataframe (and is cached), other errors are raised (and are not).
+        """
+        path: Optional[Path] = self.get_cache_path(smiles, db, dist, length)
+        if path is not None and path.exists():
+            return pd.read_pickle(path)
+        self._wait_turn()
+        try:
+            result: pd.DataFrame = self.get_backend().search_smiles(smiles=smiles, db=db, dist=dist, length=length)
+        except Exception as error:
+            # smallworld_api is optional, hence by name
+            if error.__class__.__name__ != 'NoMatchError':
+                raise error
+            result = pd.DataFrame()
+        if path is not None:
+            # written and renamed so that a killed run does not leave a truncated file behind
+            temp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            result.to_pickle(temp_path, compression='gzip')
+            os.replace(temp_path, path)
+        return result
+
+    def _wait_turn(self):
+        with self._lock:
+            delay: float = self._last_submission + self.min_interval - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            self._last_submission = time.time()
+
+    def iter_search_many(self,
+                         query: Union[Sequence[str], Mapping[Any, str], pd.Series],
+                         db: str,
+                         dist: int,
+                         length: int,
+                         **other_parameters) -> Iterator[pd.DataFrame]:
+        """
+        Yields the table of results of each query as soon as it is available (cached ones first),
+        with the columns ``query_index`` (index or key of the query) and ``query_smiles``,
+        as ``smallworld_api.SmallWorld.search_many`` does.
+        Queries without matches are not yielded, while failed ones are warned about.
+        """
+        if isinstance(query, pd.Series):
+            query = query.to_dict()
+        items = query.items() if isinstance(query, Mapping) else enumerate(query)
+        names: Dict[str, List[Any]] = {}
+        for name, smiles in items:
+            if not smiles or not isinstance(smiles, str):
+                warn(f'Falsy or non-string value {smiles} in the query ({name})')
+                continue
+            names.setdefault(smiles, []).append(name)
+        uncached: List[str] = []
+        for smiles in names:
+            path: Optional[Path] = self.get_cache_path(smiles, db, dist, length)
+            if path is not None and path.exists():
+                yield from self._label(pd.read_pickle(path), smiles, names[smiles])
+            else:
+                uncached.append(smiles)
+        if not uncached:
+            return
+        pending: Iterator[str] = iter(uncached)
+        futures: Dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=self.n_workers) as pool:
+            try:
+                while True:
+                    for smiles in itertools.islice(pending, self.batch_size - len(futures)):
+                        futures[pool.submit(self.search, smiles, db, dist, length)] = smiles
+                    if not futures:
+                        break
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        smiles = futures.pop(future)
+                        try:
+                            result: pd.DataFrame = future.result()
+                        except Exception as error:
+                            warn(f'{error.__class__.__name__}: {error} for {names[smiles]}')
+                            continue
+                        yield from self._label(result, smiles, names[smiles])
+            finally:
+                # if the caller stopped early, do not wait for the queued ones
+                for future in futures:
+                    future.cancel()
+
+    @staticmethod
+    def _label(result: pd.DataFrame, smiles: str, names: List[Any]) -> Iterator[pd.DataFrame]:
+        if result.empty:
+            return
+        for name in names:
+            labelled: pd.DataFrame = result.copy()
+            labelled['query_index'] = name
+            labelled['query_smiles'] = smiles
+            yield labelled
+
+    def search_many(self,
+                    query: Union[Sequence[str], Mapping[Any, str], pd.Series],
+                    db: str,
+                    dist: int,
+                    length: int,
+                    **other_parameters) -> pd.DataFrame:
+        """
+        As ``iter_search_many`` but all at once.
+        Unlike ``smallworld_api.SmallWorld.search_many`` no match is an empty dataframe, not a ``NoMatchError``.
+        """
+        results: List[pd.DataFrame] = list(self.iter_search_many(query, db=db, dist=dist, length=length))
+        if not results:
+            return pd.DataFrame()
+        return pd.concat(results, axis='index', ignore_index=True)
+
+
+class LocalSmallWorld:
+    """
+    Offline stand-in for ``smallworld_api.SmallWorld`` (only ``search_smiles``), say for tests.
+
+    * ``fixture``: the replies are served from a table of earlier results with a ``qrySmiles`` column,
+      such as a ``fragmenstein_analogues*.pkl.gz`` file (pickle or csv).
+    * ``smi``: a SMILES file (SMILES and id per line) that is searched by Morgan fingerprint (ECFP4) similarity.
+      The distance is the number of atoms of either molecule outside their maximum common substructure,
+      which is a crude take on the SmallWorld one (edits).
+
+    The columns are as with SmallWorld (``hitSmiles``, ``qrySmiles``, ``id``, ``atomMap``, ``dist``, ``ecfp4``
+    and the client side ``smiles`` and ``name``).
+    """
+
+    def __init__(self,
+                 fixture: Union[None, str, pd.DataFrame] = None,
+                 smi: Optional[str] = None,
+                 min_similarity: float = 0.3,
+                 mcs_timeout: int = 2):
+        assert (fixture is None) != (smi is None), 'Either a fixture or a SMILES file is required'
+        self.min_similarity = min_similarity
+        self.mcs_timeout = mcs_timeout
+        self.replies: Dict[str, pd.DataFrame] = {}
+        self.catalogue: List[Tuple[str, str, Chem.Mol]] = []
+        self.fingerprints = []
+        if fixture is not None:
+            if isinstance(fixture, str) and fixture.endswith('.csv'):
+                fixture = pd.read_csv(fixture)
+            elif isinstance(fixture, str):
+                fixture = pd.read_pickle(fixture)
+            fixture = fixture.drop(columns=['query_index', 'query_smiles'], errors='ignore')
+            for qry_smiles, reply in fixture.groupby('qrySmiles', sort=False):
+                self.replies[self._canonical(qry_smiles)] = reply.reset_index(drop=True)
+        else:
+            with open(smi) as fh:
+                for line in fh:
+                    parts: List[str] = line.split()
+                    if not parts:
+                        continue
+                    mol: Optional[Chem.Mol] = Chem.MolFromSmiles(parts[0])
+                    if mol is None:
+                        continue
+                    identifier: str = parts[1] if len(parts) > 1 else f'local{len(self.catalogue)}'
+                    self.catalogue.append((parts[0], identifier, mol))
+                    self.fingerprints.append(self._fingerprint(mol))
+
+    @staticmethod
+    def _canonical(smiles: str) -> str:
+        mol: Optional[Chem.Mol] = Chem.MolFromSmiles(smiles)
+        return Chem.MolToSmiles(mol) if mol is not None else smiles
+
+    @staticmethod
+    def _fingerprint(mol: Chem.Mol):
+        return AllChem.GetMorganFingerprintAsBitVect(mol, 2, nBits=2048)
+
+    def search_smiles(self, smiles: str, db: str = 'local', dist: int = 10, length: int = 10,
+                      **other_parameters) -> pd.DataFrame:
+        if self.replies or not self.catalogue:
+            return self.replies.get(self._canonical(smiles), pd.DataFrame()).head(int(length)).copy()
+        query: Optional[Chem.Mol] = Chem.MolFromSmiles(smiles)
+        if query is None:
+            raise ValueError(f'Invalid SMILES {smiles}')
+        similarities: List[float] = DataStructs.BulkTanimotoSimilarity(self._fingerprint(query), self.fingerprints)
+        ranked: List[int] = sorted(range(len(similarities)), key=lambda i: similarities[i], reverse=True)
+        rows: List[Dict[str, Any]] = []
+        for i in ranked:
+            if similarities[i] < self.min_similarity or len(rows) >= int(length):
+                break
+            hit_smiles, identifier, hit = self.catalogue[i]
+            atom_map, distance = self._map(query, hit)
+            if distance > int(dist):
+                continue
+            rows.append(dict(hitSmiles=f'{hit_smiles} {identifier}',
+                             qrySmiles=smiles,
+                             id=identifier,
+                             name=identifier,
+                             smiles=hit_smiles,
+                             dist=distance,
+                             ecfp4=similarities[i],
+                             atomMap=atom_map))
+        return pd.DataFrame(rows)
+
+    def _map(self, query: Chem.Mol, hit: Chem.Mol) -> Tuple[List[int], int]:
+        """
+        Returns the query atom index to hit atom index list (-1 is unmapped) and the distance
+        """
+        mcs = rdFMCS.FindMCS([query, hit],
+                             atomCompare=rdFMCS.AtomCompare.CompareElements,
+                             bondCompare=rdFMCS.BondCompare.CompareOrder,
+                             ringMatchesRingOnly=True,
+                             completeRingsOnly=True,
+                             timeout=self.mcs_timeout)
+        common: Optional[Chem.Mol] = Chem.MolFromSmarts(mcs.smartsString) if mcs.numAtoms else None
+        atom_map: List[int] = [-1] * query.GetNumAtoms()
+        if common is not None:
+            for q, h in zip(query.GetSubstructMatch(common), hit.GetSubstructMatch(common)):
+                atom_map[q] = h
+        distance: int = query.GetNumAtoms() + hit.GetNumAtoms() - 2 * mcs.numAtoms
+        return atom_map, distance
@@ -81,8 +81,9 @@ class mRMSD:
         mds = []
         self.rmsds = []
         tatoms = 0
+        followup_positions: np.ndarray = self._get_positions(self.followup)
         for hit, mapping in zip(hits, mappings):
-            md = self.calculate_msd(self.followup, hit, mapping)
+            md = self._calculate_msd(followup_positions, self._get_positions(hit), mapping)
             mds.append(md)
             tatoms += len(mapping)
             if len(mapping):
@@ -196,23 +197,35 @@ class mRMSD:
                                          annotated_followup: Chem.Mol,
                                          hits: Sequence[Chem.Mol]):
         assert cls.is_origin_annotated(annotated_followup), 'This molecules is not annotated.'
+        origin_indices: Dict[str, np.ndarray] = cls._parse_origins(annotated_followup)
         mappings = []
-        for h, hit in enumerate(hits):
+        for hit in hits:
             hname = hit.GetProp('_Name')
-            mapping = []
             if hname == '':
                 print(f'{hit} has no name!')
+                mappings.append([])
+            elif hname not in origin_indices:
+                mappings.append([])
             else:
-                for i in range(annotated_followup.GetNumAtoms()):
-                    atom = annotated_followup.GetAtomWithIdx(i)
-                    for oel in cls._get_origin(atom):
-                        rex = re.match(hname + '\.(\d+)', oel)
-                        if rex is not None:
-                            h = int(rex.group(1))
-                            mapping.append((i, h))
-            mappings.append(mapping)
+                mappings.append(list(map(tuple, origin_indices[hname].tolist())))
         return mappings
 
+    @classmethod
+    def _parse_origins(cls, mol: Chem.Mol) -> Dict[str, np.ndarray]:
+        """
+        Parses the atom ``_Origin`` annotations once.
+
+        :param mol: origin annotated molecule
+        :return: hit name -> int array of shape (n, 2) of followup atom idx and hit atom idx, in atom order
+        """
+        pairs: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for i, atom in enumerate(mol.GetAtoms()):
+            for origin in cls._get_origin(atom):
+                rex = re.match(r'(.*)\.(\d+)', origin)
+                if rex is not None:
+                    pairs[rex.group(1)].append((i, int(rex.group(2))))
+        return {name: np.array(mapping, dtype=int).reshape(-1, 2) for name, mapping in pairs.items()}
+
     @classmethod
     def from_other_annotated_mols(cls,
                             followup: Chem.Mol,
@@ -273,11 +286,34 @@ class mRMSD:
         :param mapping: lists of tuples of atom idx that go from molA to molB
         :return: nonroot rmsd
         """
-        confA = molA.GetConformer()
-        confB = molB.GetConformer()
-        return sum([(confA.GetAtomPosition(a).x - confB.GetAtomPosition(b).x) ** 2 +
-                    (confA.GetAtomPosition(a).y - confB.GetAtomPosition(b).y) ** 2 +
-                    (confA.GetAtomPosition(a).z - confB.GetAtomPosition(b).z) ** 2 for a, b in mapping])
+        return self._calculate_msd(self._get_positions(molA), self._get_positions(molB), mapping)
+
+    @classmethod
+    def _calculate_msd(cls, positionsA: np.ndarray, positionsB: np.ndarray, mapping) -> float:
+        """
+        ``calculate_msd`` but with the coordinates of the conformers already as arrays.
+
+        :param positionsA: shape (n_atoms_A, 3)
+        :param positionsB: shape (n_atoms_B, 3)
+        :param mapping: lists of tuples of atom idx that go from molA to molB (or an int array of shape (n, 2))
+        :return: nonroot rmsd
+        """
+        mapping = np.asarray(mapping, dtype=int).reshape(-1, 2)
+        squared: np.ndarray = cls._squared_deviations(positionsA[mapping[:, 0]], positionsB[mapping[:, 1]])
+        # the builtin sum adds in the same order as the per atom loop did, so the values are unchanged
+        return sum(squared.tolist())
+
+    @staticmethod
+    def _squared_deviations(coordinatesA: np.ndarray, coordinatesB: np.ndarray) -> np.ndarray:
+        """
+        Squared distance of each pair of rows, shape (n, 3) -> (n,)
+        """
+        squared = (coordinatesA - coordinatesB) ** 2
+        return squared[:, 0] + squared[:, 1] + squared[:, 2]
+
+    @staticmethod
+    def _get_positions(mol: Chem.Mol) -> np.ndarray:
+        return np.asarray(mol.GetConformer().GetPositions(), dtype=float).reshape(-1, 3)
 
     def calculate_rmsd(self, molA, molB, mapping) -> float:
         return (self.calculate_msd(molA, molB, mapping) / len(mapping)) ** 0.5
@@ -338,23 +374,21 @@ class mRMSD:
                              bondCompare=rdFMCS.BondCompare.CompareAny,
                              ringMatchesRingOnly=True)
         common = Chem.MolFromSmarts(mcs.smartsString)
+        # the annotations are read once, not for every combination of matches
+        anno_origins: List[str] = [json.dumps(cls._get_origin(atom)) for atom in annotated.GetAtoms()]
+        anno_xyzs: List[Tuple[float, float, float]] = [cls._get_xyz(atom) for atom in annotated.GetAtoms()]
         options = []
         originss = []
         # adding Unique=False will make benzene isomorphism not an issue, but the code will grind to a halt.
         for target_match in target.GetSubstructMatches(common):
             for anno_match in annotated.GetSubstructMatches(common):
-                dmapping = dict(zip(target_match, anno_match))
                 origins = []
                 option = Chem.Mol(target)
-                for i in range(option.GetNumAtoms()):
-                    if i in dmapping:
-                        atom = annotated.GetAtomWithIdx(dmapping[i])
-                        tatom = option.GetAtomWithIdx(i)
-                        o = cls._get_origin(atom)
-                        tatom.SetProp('_Origin', json.dumps(o))
-                        xyz = cls._get_xyz(atom)
-                        if xyz:
-                            cls._set_xyz(tatom, xyz)
+                for i, a in sorted(zip(target_match, anno_match)):
+                    tatom = option.GetAtomWithIdx(i)
+                    tatom.SetProp('_Origin', anno_origins[a])
+                    if anno_xyzs[a]:
+                        cls._set_xyz(tatom, anno_xyzs[a])
                 options.append(option)
                 originss.append(origins)
         return options, originss
@@ -485,19 +519,17 @@ class mRMSD:
         self.rmsds = []
         self.mrmsd = float('nan')
         self.mode = self.XYZ_BASED
-        conf = annotated_followup.GetConformer()
+        atoms: List[Chem.Atom] = [atom for atom in annotated_followup.GetAtoms() if atom.HasProp('_x')]
+        indices: List[int] = [atom.GetIdx() for atom in atoms]
+        xyzs = np.array([cls._get_xyz(atom) for atom in atoms], dtype=float).reshape(-1, 3)
+        squared: List[float] = cls._squared_deviations(cls._get_positions(annotated_followup)[indices],
+                                                       xyzs).tolist()
         n = 0
         tatoms = 0
         ns = defaultdict(int)
         ts = defaultdict(int)
-        for a, atom in enumerate(annotated_followup.GetAtoms()):
-            if not atom.HasProp('_x'):
-                continue
-            x, y, z = cls._get_xyz(atom)
+        for atom, d in zip(atoms, squared):
             tatoms += 1
-            d = sum([(conf.GetAtomPosition(a).x - x) ** 2 +
-                        (conf.GetAtomPosition(a).y - y) ** 2 +
-                        (conf.GetAtomPosition(a).z - z) ** 2])
             n += d
             if atom.HasProp('_Origin'):
                 origins = json.loads(atom.GetProp('_Origin'))
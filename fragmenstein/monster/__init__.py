@@ -156,5 +156,7 @@ class Monster(_MonsterFF, _MonsterPlace, _MonsterCombine):
     :vartype dummy_symbol: str
     :cvar matching_modes:
     :vartype matching_modes: list
+    :cvar collapsed_cache_size: max number of ring-collapsed hits cached per process across combinations (0 disables)
+    :vartype collapsed_cache_size: int
     """
     pass
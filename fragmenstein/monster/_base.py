@@ -99,6 +99,7 @@ class _MonsterBase:
         self.random_seed = random_seed
         self.mol_options = []  # equally valid alternatives to self.positioned_mol
         self._collapsed_ring_offset = 0  # variable to keep track of how much to offset in ring collapse.
+        self._ring_table: Dict[int, Dict] = {}  # ring collapse data keyed by the ring core atom prop ``_ring_key``
         # formerly:
         # self.scaffold = None  # template which may have wrong elements in place, or
         # self.chimera = None  # merger of hits but with atoms made to match the to-be-aligned mol
@@ -24,24 +24,82 @@ from rdkit.Geometry.rdGeometry import Point3D
 
 from ._join_neighboring import _MonsterJoinNeigh
 from .bond_provenance import BondProvenance
-from ..error import DistanceError, FragmensteinError
+from ..error import DistanceError, FragmensteinError, ShoddyCodeError
 
 
 ########################################################################################################################
 
 class _MonsterRing(_MonsterJoinNeigh):
+    # process-level cache of collapsed hits (prior to offsetting) and their ring data keyed by ``_get_collapse_key``.
+    # LabCombine makes many combinations of the same hits in the same worker, so each is collapsed only once.
+    _collapsed_cache: Dict[tuple, Tuple[Chem.Mol, Dict[int, Dict[str, Any]]]] = {}
+    collapsed_cache_size = 1_000  # maximum number of collapsed hits kept. 0 disables the cache
+    # keys of the ring data side-table (``self._ring_table``) are unique within the process,
+    # so cached ring data can be shared across instances.
+    _ring_keys = itertools.count(1)
+    # ring data fields that are serialised as JSON in atom props by ``ring_data_to_props``
+    _ring_fields = ('ori_is', 'neighbors', 'xs', 'ys', 'zs', 'elements', 'bonds')
 
     def collapse_mols(self, mols: List[Chem.Mol]):
-        mols = [self.collapse_ring(mol) for mol in mols]
+        mols = [self.get_collapsed(mol) for mol in mols]
         [self.offset(mol) for mol in mols]
         return mols
 
+    def get_collapsed(self, mol: Chem.Mol) -> Chem.Mol:
+        """
+        Cached ``collapse_ring``. A copy of the collapsed mol is returned as ``offset`` alters it in place.
+        The key is the name, the atoms, the bonds and the coordinates of the hit (see ``_get_collapse_key``).
+
+        :param mol:
+        :return:
+        """
+        if self.collapsed_cache_size <= 0:
+            return self.collapse_ring(mol)
+        key = self._get_collapse_key(mol)
+        cache = self._collapsed_cache
+        if key not in cache:
+            while len(cache) >= self.collapsed_cache_size:
+                del cache[next(iter(cache))]  # oldest first
+            collapsed = self.collapse_ring(mol)
+            rings = {atom.GetIntProp('_ring_key'): self._get_ring_data(atom)
+                     for atom in self._get_collapsed_atoms(collapsed)}
+            cache[key] = (collapsed, rings)
+        else:
+            self.journal.debug(f'Reusing collapsed hit {key[0]}')
+            collapsed, rings = cache[key]
+            # ring data is never altered in place (see ``_set_ring_data``) so sharing is safe
+            self._ring_table.update(rings)
+        return Chem.Mol(collapsed)
+
+    @classmethod
+    def clear_collapsed_cache(cls):
+        cls._collapsed_cache.clear()
+
+    def _get_collapse_key(self, mol: Chem.Mol) -> tuple:
+        """
+        The hashable key for ``_collapsed_cache``.
+        Warhead marking is included as ``harmonize_warheads`` adds it to the hits.
+
+        :param mol:
+        :return:
+        """
+        name = mol.GetProp('_Name') if mol.HasProp('_Name') else '???'
+        atoms = tuple((atom.GetAtomicNum(),
+                       atom.GetFormalCharge(),
+                       atom.HasProp('_Warhead') and atom.GetBoolProp('_Warhead'))
+                      for atom in mol.GetAtoms())
+        bonds = tuple((bond.GetBeginAtomIdx(), bond.GetEndAtomIdx(), bond.GetBondType().name)
+                      for bond in mol.GetBonds())
+        positions: bytes = np.round(mol.GetConformer().GetPositions(), 3).tobytes()
+        return name, atoms, bonds, positions
+
     # =========== Collapse & Expand ====================================================================================
 
     def collapse_ring(self, mol: Chem.Mol) -> Chem.Mol:
         """
         Collapses a ring(s) into a single dummy atom(s).
-        Stores data as JSON in the atom.
+        Stores the data in the ring data side-table (``self._ring_table``),
+        the dummy atom holds only its key as ``_ring_key`` (see ``_set_ring_data``).
 
         :param mol:
         :return:
@@ -52,6 +110,7 @@ class _MonsterRing(_MonsterJoinNeigh):
         center_idxs = []
         morituri = []
         old2center = defaultdict(list)
+        ring_datas = []
         # Store simple info
         for atomset in mol.GetRingInfo().AtomRings():
             morituri.extend(atomset)
@@ -83,23 +142,24 @@ class _MonsterRing(_MonsterJoinNeigh):
                 elements.append(atom.GetSymbol())
             # store data in elemental ring
             central.SetIntProp('_ori_i', -1)
-            central.SetProp('_ori_is', json.dumps(atomset))
-            central.SetProp('_neighbors', json.dumps(neighs))
-            central.SetProp('_xs', json.dumps(xs))
-            central.SetProp('_ys', json.dumps(ys))
-            central.SetProp('_zs', json.dumps(zs))
-            central.SetProp('_elements', json.dumps(elements))
-            central.SetProp('_bonds', json.dumps(bonds))
+            central.SetBoolProp('_ring_aromatic', any('AROMATIC' in bond for bond in bonds))
+            ring_data = dict(ori_name=name,
+                             ori_is=np.array(atomset, dtype=int),
+                             neighbors=[np.array(neigh_i, dtype=int) for neigh_i in neighs],
+                             xs=np.array(xs, dtype=float),
+                             ys=np.array(ys, dtype=float),
+                             zs=np.array(zs, dtype=float),
+                             elements=np.array(elements, dtype=str),
+                             bonds=[np.array(bond, dtype=str) for bond in bonds])
+            self._set_ring_data(central, ring_data)
+            ring_datas.append(ring_data)
             central.SetIsotope(len(atomset))
             conf.SetAtomPosition(c, Point3D(*[sum(axis) / len(axis) for axis in (xs, ys, zs)]))
         # Store complex info
-        for atomset, center_i in zip(mol.GetRingInfo().AtomRings(), center_idxs):
+        for atomset, center_i, ring_data in zip(mol.GetRingInfo().AtomRings(), center_idxs, ring_datas):
             # bond to elemental ring
-            central = mol.GetAtomWithIdx(center_i)
-            neighss = json.loads(central.GetProp('_neighbors'))
-            bondss = json.loads(central.GetProp('_bonds'))
-            for neighs, bonds in zip(neighss, bondss):
-                for neigh, bond in zip(neighs, bonds):
+            for neighs, bonds in zip(ring_data['neighbors'], ring_data['bonds']):
+                for neigh, bond in zip(neighs.tolist(), bonds):
                     if neigh not in atomset:
                         bt = getattr(Chem.BondType, bond)
                         if neigh not in morituri:
@@ -183,16 +243,20 @@ class _MonsterRing(_MonsterJoinNeigh):
             else:
                 pass  # ringcores have -1 ori_i
         # sort the ringcore
-        for atom in self._get_collapsed_atoms(mol):
-            old = json.loads(atom.GetProp('_ori_is'))
-            new = [i + self._collapsed_ring_offset for i in old]
-            atom.SetProp('_ori_is', json.dumps(new))
-            old2new = {**old2new, **dict(zip(old, new))}
+        # the ring data is not altered in place as other mols (e.g. the unfragmented hit) may share it.
+        collapsed = self._get_collapsed_atoms(mol)
+        new_datas = []
+        for atom in collapsed:
+            old_data = self._get_ring_data(atom)
+            old = old_data['ori_is']
+            new = old + self._collapsed_ring_offset
+            new_datas.append({**old_data, 'ori_is': new})
+            old2new = {**old2new, **dict(zip(old.tolist(), new.tolist()))}
         # this has to be done afterwards in case of a bonded mol
-        for atom in self._get_collapsed_atoms(mol):
-            old_neighss = json.loads(atom.GetProp('_neighbors'))  # if i in old2new else i
-            new_neighss = [[old2new[i] for i in old_neighs if i in old2new] for old_neighs in old_neighss]
-            atom.SetProp('_neighbors', json.dumps(new_neighss))
+        for atom, new_data in zip(collapsed, new_datas):
+            new_data['neighbors'] = [np.array([old2new[i] for i in old_neighs.tolist() if i in old2new], dtype=int)
+                                     for old_neighs in new_data['neighbors']]
+            self._set_ring_data(atom, new_data)
         # determine if the new atoms have close neighbours.
         pass
 
@@ -215,24 +279,116 @@ class _MonsterRing(_MonsterJoinNeigh):
                 continue
             i = atom.GetIntProp('_ori_i')
             if i == -1:
-                # original indices
-                ori = json.loads(atom.GetProp('_ori_is'))
-                alt = [dd if dd not in mapping else mapping[dd] for dd in ori]
-                atom.SetProp('_ori_is', json.dumps(alt))
-                # original neighbors
-                ori = json.loads(atom.GetProp('_neighbors'))
-                alt = [[dd if dd not in mapping else mapping[dd] for dd in inner] for inner in ori]
-                atom.SetProp('_neighbors', json.dumps(alt))
+                data = self._get_ring_data(atom)
+                remap = lambda indices: np.array([mapping.get(dd, dd) for dd in indices.tolist()], dtype=int)
+                self._set_ring_data(atom, {**data,
+                                           'ori_is': remap(data['ori_is']),  # original indices
+                                           'neighbors': [remap(inner) for inner in data['neighbors']]})
             elif i in mapping:
                 atom.SetIntProp('_ori_i', mapping[i])
             else:
                 pass
 
+    # =========== Ring data ============================================================================================
+
+    def _set_ring_data(self, atom: Chem.Atom, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Stores the ring data of a ring core atom in the side-table ``self._ring_table`` under a new key,
+        which is stored in the atom as the int prop ``_ring_key``.
+        A new key is always issued as the data may be shared by copies of the mol, hence no in place alterations.
+
+        :param atom: ring core atom
+        :param data: see ``_get_expansion_data`` for the fields (sans ``atom``)
+        :return: data
+        """
+        key = next(self._ring_keys)
+        self._ring_table[key] = data
+        atom.SetIntProp('_ring_key', key)
+        return data
+
+    def _get_ring_data(self, atom: Chem.Atom) -> Dict[str, Any]:
+        """
+        Gets the ring data of a ring core atom from the side-table.
+        If the atom was serialised via ``ring_data_to_props`` (e.g. from another process) it is read from the props.
+
+        :param atom: ring core atom
+        :return: dict of ``ori_name``, ``ori_is``, ``neighbors``, ``xs``, ``ys``, ``zs``, ``elements``, ``bonds``
+            and ``current_is`` if expanded.
+        """
+        if atom.HasProp('_ring_key') and atom.GetIntProp('_ring_key') in self._ring_table:
+            return self._ring_table[atom.GetIntProp('_ring_key')]
+        elif atom.HasProp('_ori_is'):
+            self.journal.debug(f'Reading ring data of atom {atom.GetIdx()} from props')
+            loaded = {field: json.loads(atom.GetProp(f'_{field}')) for field in self._ring_fields}
+            data = dict(ori_name=atom.GetProp('_ori_name') if atom.HasProp('_ori_name') else '???',
+                        ori_is=np.array(loaded['ori_is'], dtype=int),
+                        neighbors=[np.array(neighs, dtype=int) for neighs in loaded['neighbors']],
+                        xs=np.array(loaded['xs'], dtype=float),
+                        ys=np.array(loaded['ys'], dtype=float),
+                        zs=np.array(loaded['zs'], dtype=float),
+                        elements=np.array(loaded['elements'], dtype=str),
+                        bonds=[np.array(bonds, dtype=str) for bonds in loaded['bonds']])
+            if atom.HasProp('_current_is'):
+                data['current_is'] = json.loads(atom.GetProp('_current_is'))
+            return self._set_ring_data(atom, data)
+        else:
+            raise ValueError(f'Atom {atom.GetIdx()} has no ring data')
+
+    def ring_data_to_props(self, mol: Chem.Mol) -> Chem.Mol:
+        """
+        Serialises the ring data of the ring core atoms as JSON props (``_ori_is``, ``_xs`` etc.)
+        for pickling, passing to another Monster or debugging.
+        The ``_ring_key`` is removed as it is meaningless outside of this instance's side-table
+        (and could match an unrelated entry elsewhere): ``_get_ring_data`` reads the props back.
+        This is done to every mol that leaves the instance, such as the copies in ``.modifications``.
+
+        :param mol: altered in place
+        :return: mol
+        """
+        for atom in mol.GetAtoms():
+            if not atom.HasProp('_ring_key') or atom.GetIntProp('_ring_key') not in self._ring_table:
+                continue  # not a ring core or serialised already
+            data = self._get_ring_data(atom)
+            for field in self._ring_fields:
+                atom.SetProp(f'_{field}', json.dumps(self._to_builtin(data[field])))
+            if 'current_is' in data:
+                atom.SetProp('_current_is', json.dumps(self._to_builtin(data['current_is'])))
+            atom.ClearProp('_ring_key')
+        return mol
+
+    def keep_copy(self, mol: Chem.Mol, label=None):
+        """
+        As ``_MonsterTracker.keep_copy``, but with the ring data of the copy serialised (``ring_data_to_props``).
+        """
+        if self.tracking == 'off' and label not in self.required_modifications:
+            return
+        super().keep_copy(self.ring_data_to_props(Chem.Mol(mol)), label)
+
+    @staticmethod
+    def _to_builtin(value: Any) -> Any:
+        """
+        NumPy values to python builtins, as Boost (``SetIntProp`` etc.) and JSON do not like NumPy types.
+        """
+        if isinstance(value, (np.ndarray, np.generic)):
+            return value.tolist()
+        elif isinstance(value, list):
+            return [v.tolist() if isinstance(v, np.ndarray) else v for v in value]
+        else:
+            return value
+
+    def _is_expanded_ringcore(self, atom: Chem.Atom) -> bool:
+        """
+        Is the atom a ring core marker whose ring atoms have been placed (formerly ``HasProp('_current_is')``)?
+        """
+        return atom.HasProp('_ring_expanded')
+
     # =========== Expand data ==========================================================================================
 
     def _get_expansion_data(self, mol: Chem.Mol) -> List[Dict[str, List[Any]]]:
         """
         Returns a list for each collapsed ring marking atom each with a dictionary.
+        The data comes from the side-table (see ``_get_ring_data``) and are NumPy arrays, not lists.
+        The dictionary is new, so adding ``current_is`` does not alter the side-table.
         Example:
 
              {'atom': <rdkit.Chem.rdchem.Atom at 0x7f926fafb030>,
@@ -252,17 +408,8 @@ class _MonsterRing(_MonsterJoinNeigh):
         :param mol:
         :return:
         """
-        return [
-            dict(atom=atom,
-                 ori_name=atom.GetProp('_ori_name'),
-                 elements=json.loads(atom.GetProp('_elements')),
-                 neighbors=json.loads(atom.GetProp('_neighbors')),
-                 ori_is=json.loads(atom.GetProp('_ori_is')),
-                 xs=json.loads(atom.GetProp('_xs')),
-                 ys=json.loads(atom.GetProp('_ys')),
-                 zs=json.loads(atom.GetProp('_zs')),
-                 bonds=json.loads(atom.GetProp('_bonds')))
-            for atom in self._get_collapsed_atoms(mol)]
+        return [{**self._get_ring_data(atom), 'atom': atom, 'ori_name': atom.GetProp('_ori_name')}
+                for atom in self._get_collapsed_atoms(mol)]
 
     def _get_expansion_for_atom(self, ring: Dict[str, List[Any]], i: int) -> Dict[str, Any]:
         """
@@ -281,15 +428,18 @@ class _MonsterRing(_MonsterJoinNeigh):
         .. code-block:: python
             atom : Chem.Atom
             for atom in victor.monster.modifications['merged template'].GetAtoms():
-                print(atom.GetIdx(), atom.GetSymbol(), atom.GetAtomicNum(), atom.GetIsotope(), atom.GetPropsAsDict(), '\n')
+                ring_data = victor.monster._get_ring_data(atom) if atom.GetIntProp('_ori_i') == -1 else {}
+                print(atom.GetIdx(), atom.GetSymbol(), atom.GetAtomicNum(), atom.GetIsotope(), atom.GetPropsAsDict(),
+                      ring_data, '\n')
 
         """
         try:
             # ori_is and current_is
             # {'atom', 'ori_name', 'element', 'neighbor', 'ori_i', 'x', 'y', 'z', 'bond'
-            return {k.replace('s',''): ring[k][i] if isinstance(ring[k], list) else ring[k] for k in ring}
+            return {k.replace('s', ''): self._to_builtin(ring[k][i]) if isinstance(ring[k], (list, np.ndarray))
+                                        else ring[k] for k in ring}
         except IndexError as error:
-            troublesome = [k for k in ring if isinstance(ring[k], list) and len(ring[k]) <= i]
+            troublesome = [k for k in ring if isinstance(ring[k], (list, np.ndarray)) and len(ring[k]) <= i]
             if len(troublesome) == 0:
                 raise IndexError(f'(Ring expansion) There is a major issue with ring data for index {i} ({error}): {ring}')
             elif troublesome[0] == 'current_is':
@@ -297,7 +447,7 @@ class _MonsterRing(_MonsterJoinNeigh):
                                      f'This is a fallback that should not happen  ({error})')
                 mol:Chem.Mol = ring['atom'].GetOwningMol()  # noqa
                 ring['current_is'] = [self._get_new_index(mol, old_i, search_collapsed=False) for old_i in
-                                      ring['ori_is']]
+                                      ring['ori_is'].tolist()]
                 return self._get_expansion_for_atom(ring, i)
             else:
                 raise IndexError(f'The indices of the collapsed atom do not extend to {i} for {troublesome}')
@@ -337,8 +487,9 @@ class _MonsterRing(_MonsterJoinNeigh):
                     natom.SetIntProp('_ring_i', ringcore.GetIdx())
                     indices.append(n)
             ringcore.SetIntProp('_ring_i', ringcore.GetIdx())  # it really really should have not changed.
-            ringcore.SetProp('_current_is', json.dumps(indices))
+            ringcore.SetBoolProp('_ring_expanded', True)
             ring['current_is'] = indices
+            self._set_ring_data(ringcore, {k: v for k, v in ring.items() if k != 'atom'})
 
     def _restore_original_bonding(self, mol: Chem.RWMol, rings: List[Dict[str, List[Any]]]) -> None:
         """
@@ -451,7 +602,7 @@ class _MonsterRing(_MonsterJoinNeigh):
                        name_restriction: Optional[str] = None) -> int:
         """
         Given an old index check in ``_ori_i`` for what the current one is.
-        NB. ring placeholder will be -1 and these also have ``_ori_is``. a JSON of the ori_i they summarise.
+        NB. ring placeholder will be -1 and these also have ``ori_is`` in their ring data, the ori_i they summarise.
 
         :param mol:
         :param old: old index
@@ -465,8 +616,8 @@ class _MonsterRing(_MonsterJoinNeigh):
             elif atom.GetIntProp('_ori_i') == old:
                 return i
             elif search_collapsed and \
-                    atom.HasProp('_ori_is') and \
-                    old in json.loads(atom.GetProp('_ori_is')):
+                    (atom.HasProp('_ring_key') or atom.HasProp('_ori_is')) and \
+                    old in self._get_ring_data(atom)['ori_is']:
                 return i
             else:
                 pass
@@ -554,18 +705,20 @@ class _MonsterRing(_MonsterJoinNeigh):
             bi = atom_b.GetIdx()
             if ai == bi:
                 self.journal.debug(f'Merging: Bond to self incident with {ai} ' +
-                                   f'(ring? {atom_a.HasProp("_current_is") == 1})')
+                                   f'(ring? {self._is_expanded_ringcore(atom_a)})')
                 continue
-            if ringcore_first and atom_a.HasProp('_current_is') and not atom_b.HasProp('_current_is'):
+            is_ringcore_a = self._is_expanded_ringcore(atom_a)
+            is_ringcore_b = self._is_expanded_ringcore(atom_b)
+            if ringcore_first and is_ringcore_a and not is_ringcore_b:
                 ringcore = ai
                 other = bi
                 pairing = f'{ringcore}-{other}'
-            elif ringcore_first and atom_b.HasProp('_current_is') and not atom_a.HasProp('_current_is'):
+            elif ringcore_first and is_ringcore_b and not is_ringcore_a:
                 ringcore = bi
                 other = ai
                 pairing = f'{ringcore}-{other}'
                 atom_a, atom_b = atom_b, atom_a
-            elif atom_a.HasProp('_current_is') and atom_b.HasProp('_current_is'):
+            elif is_ringcore_a and is_ringcore_b:
                 low_i, high_i = sorted([ai, bi])
                 pairing = f'{low_i}-{high_i}'
             else:
@@ -584,7 +737,7 @@ class _MonsterRing(_MonsterJoinNeigh):
         atomdex = defaultdict(set)
         for ring in rings:
             origin_name = ring['ori_name']  # ring['ori_name'] is same as ringcore.GetProp('_ori_name')
-            atomdex[origin_name].update(ring['current_is'])  # ring['current_is'] = json ringcore.GetProp('_current_is')
+            atomdex[origin_name].update(ring['current_is'])  # ring['current_is'] is the ring data 'current_is' 
         return atomdex
 
     def _get_atom_indices_per_origin(self, mol: Chem.Mol) -> Dict[str, List[int]]:
@@ -685,8 +838,8 @@ class _MonsterRing(_MonsterJoinNeigh):
         absorption_distance = 1.  # Å
         # print('A', ringcore_A, ringcore_A.GetIdx(), ringcore_A.GetIntProp('_ori_i'))
         # print('B', ringcore_B, ringcore_B.GetIdx(), ringcore_B.GetIntProp('_ori_i'))
-        indices_A = json.loads(ringcore_A.GetProp('_current_is'))
-        indices_B = json.loads(ringcore_B.GetProp('_current_is'))
+        indices_A = list(self._get_ring_data(ringcore_A)['current_is'])
+        indices_B = list(self._get_ring_data(ringcore_B)['current_is'])
         distance_matrix = self._get_distance_matrix(mol, indices_A, indices_B)  # currently in `_join_neighboring`.
         # distance matrix is for the whole thing
         # TODO merge into _get_distance_matrix
@@ -854,7 +1007,7 @@ class _MonsterRing(_MonsterJoinNeigh):
         :return:
         """
         # ---- Prep data.
-        indices_ring = json.loads(ringcore.GetProp('_current_is'))
+        indices_ring = list(self._get_ring_data(ringcore)['current_is'])
         index_other = other.GetIdx()
         indices_other = [index_other]
         index_core = ringcore.GetIdx()
@@ -940,6 +1093,27 @@ class _MonsterRing(_MonsterJoinNeigh):
         self.journal.debug('`_emergency_joining` called')
         return self._join_internally(mol, severe=True)
 
+    def _get_fragment_closeness(self, mol: Chem.Mol) -> np.ndarray:
+        """
+        Upper triangle matrix of the distance between the closest (penalised) atoms of each pair of fragments,
+        as would be returned by ``_find_closest(frags[a], frags[b])[3]``.
+        The distance and penalty matrices are calculated once for the whole molecule
+        as opposed to once per pair of fragments.
+        """
+        frag_idxs: Tuple[Tuple[int, ...], ...] = Chem.GetMolFrags(mol, sanitizeFrags=False)
+        n = len(frag_idxs)
+        distance_matrix = self._get_coordinate_distance_matrix(mol)
+        pendist_matrix = self._get_joining_penalties(mol, distance_matrix.shape) + distance_matrix
+        closeness = np.ones([n, n])
+        closeness.fill(float('nan'))
+        for a, b in itertools.combinations(list(range(n)), 2):
+            block = pendist_matrix[np.ix_(frag_idxs[a], frag_idxs[b])]
+            if np.all(np.isnan(block)):
+                raise ShoddyCodeError('This is impossible. Previous is absent??')
+            anchor_A, anchor_B = np.unravel_index(np.nanargmin(block), block.shape)
+            closeness[a, b] = distance_matrix[frag_idxs[a][anchor_A], frag_idxs[b][anchor_B]]
+        return closeness
+
     def _join_internally(self, mol: Chem.Mol, severe: bool = False) -> Chem.Mol:
         """
         The last check to see if the mol is connected.
@@ -962,11 +1136,7 @@ class _MonsterRing(_MonsterJoinNeigh):
                 for i, frag in enumerate(frags):
                     frag.SetProp('_Name', f'name.{i}')
                 # find which fragments are closest ------------------------------
-                # TODO use the distance_matrix = self._get_distance_matrix(..) code
-                closeness = np.ones([n, n])
-                closeness.fill(float('nan'))
-                for a, b in itertools.combinations(list(range(n)), 2):
-                    closeness[a, b] = self._find_closest(frags[a], frags[b])[3]
+                closeness = self._get_fragment_closeness(mol)
                 p = np.where(closeness == np.nanmin(closeness))
                 frags = list(frags)
                 first = frags[p[0][0]]
@@ -37,7 +37,9 @@ class _MonsterCommunal(_MonsterTracker):
         if atom.GetIsAromatic():
             return True
         elif atom.HasProp('_ori_i') and atom.GetIntProp('_ori_i') == -1:
-            if atom.HasProp('_bonds') and 'AROMATIC' in atom.GetProp('_bonds'):
+            if atom.HasProp('_ring_aromatic'):
+                return atom.GetBoolProp('_ring_aromatic')  # technically it could be non-aromatic (ring fusion).
+            elif atom.HasProp('_bonds') and 'AROMATIC' in atom.GetProp('_bonds'):  # serialised ring data
                 return True  # technically it could be non-aromatic (ring fusion).
             else:
                 return False
@@ -84,34 +86,28 @@ class _MonsterCommunal(_MonsterTracker):
         penalties = self._get_joining_penalties(combo, distance_matrix.shape)
         # ========= get closest
         pendist_matrix = penalties + distance_matrix
-        pendistance = float(np.nanmin(pendist_matrix))
-        if np.isnan(pendistance):
+        # flat indices sorted by penalised distance (nan last). Stable so ties are in row-major order like np.where
+        order: np.ndarray = np.argsort(pendist_matrix, axis=None, kind='stable')
+        pendistances: np.ndarray = pendist_matrix.ravel()[order]
+        if np.isnan(pendistances[0]):
             raise ShoddyCodeError('This is impossible. Previous is absent??')
         candidates: List[Tuple[int, int, float]] = []
-
-        def get_closest(pendistance: float):
-            p = np.where(pendist_matrix == pendistance)
-            anchor_A = int(p[0][0])
-            anchor_B = int(p[1][0])
+        used = set()
+        # the closest pair and then any other pair of unused atoms with a penalised distance of 1 Å or less
+        for flat_i, pendistance in zip(order.tolist(), pendistances.tolist()):
+            if candidates and (pendistance > 1. or np.isnan(pendistance)):
+                break
+            anchor_A, anchor_B = divmod(flat_i, pendist_matrix.shape[1])
+            if anchor_A in used or anchor_B in used:
+                continue
             distance = distance_matrix[anchor_A, anchor_B]
             penalty = penalties[anchor_A, anchor_B]
             self.journal.debug(f'Connecting {anchor_A} with {anchor_B} would have a ' +
                                f'{penalty} penalised distance of {distance}')
-            return anchor_A, anchor_B, distance
-
-        anchor_A, anchor_B, distance = get_closest(pendistance)
-        candidates.append((int(anchor_A), int(anchor_B), distance))
-        with np.errstate(invalid='ignore'):
-            pendist_matrix[pendist_matrix > 1.] = np.nan
-        while pendistance < 1.:
-            pendist_matrix[[anchor_A, anchor_B], :] = np.nan
-            pendist_matrix[:, [anchor_A, anchor_B]] = np.nan
-            pendistance = np.nanmin(pendist_matrix)
-            if np.isnan(pendistance):
+            candidates.append((anchor_A, anchor_B, distance))
+            used.update((anchor_A, anchor_B))
+            if pendistance >= 1.:
                 break
-            else:
-                anchor_A, anchor_B, distance = get_closest(pendistance)
-                candidates.append((anchor_A, anchor_B, distance))
         return combo, candidates
 
     def _get_distance_matrix(self,
@@ -138,13 +134,22 @@ class _MonsterCommunal(_MonsterTracker):
             mol_B = None
             B_idxs = np.array(B)
         # make matrix
-        distance_matrix = Chem.Get3DDistanceMatrix(combo)
-        length = combo.GetNumAtoms()
+        distance_matrix = self._get_coordinate_distance_matrix(combo)
         # nan fill the self values
         self._nan_fill_submatrix(distance_matrix, list(A_idxs))
         self._nan_fill_submatrix(distance_matrix, list(B_idxs))
         return distance_matrix
 
+    @staticmethod
+    def _get_coordinate_distance_matrix(mol: Chem.Mol) -> np.ndarray:
+        """
+        Euclidean distance matrix of all atoms from the conformer coordinates via NumPy broadcasting.
+        Unlike ``Chem.Get3DDistanceMatrix`` it is not cached in the mol, so it is safe to alter.
+        """
+        positions: np.ndarray = mol.GetConformer().GetPositions()
+        deltas: np.ndarray = positions[:, np.newaxis, :] - positions[np.newaxis, :, :]
+        return np.sqrt(np.sum(deltas ** 2, axis=-1))
+
     def _nan_fill_others(self, mol: Chem.Mol, distance_matrix: np.array, good_indices: List[int]):
         """
         Nan fill the inidices that are not the good_indices.
@@ -167,18 +172,17 @@ class _MonsterCommunal(_MonsterTracker):
         :param shape:
         :return:
         """
-        # penalise
-        penalties = np.zeros(shape)
+        # penalise: the penalty of a pair is the sum of the penalties of each atom
+        atom_penalties = np.zeros(shape[0])
+        atoms = list(combo.GetAtoms())
         for fun, weight in self.closeness_weights:
-            weigh_bool = np.array([fun(atom) for atom in combo.GetAtoms()])
-            penalties[weigh_bool, :] += weight
-            penalties[:, weigh_bool] += weight
-        return penalties
+            weigh_bool = np.array([fun(atom) for atom in atoms], dtype=bool)
+            atom_penalties[weigh_bool] += weight  # nan weights (warhead) only apply to the marked atoms
+        return atom_penalties[:, np.newaxis] + atom_penalties[np.newaxis, :]
 
     def _nan_fill_submatrix(self, matrix: np.ndarray, indices: List[int]) -> None:
         """
         Given a square matrix, blank the self-submatrix of the group of indices
-        There is probably a better way to do this.
         changed from _nan_submatrix as to nan is not a verb.
 
         :param matrix:
@@ -186,12 +190,8 @@ class _MonsterCommunal(_MonsterTracker):
         :return:
         """
         dimension = matrix.shape[0]
-        bool_vector = np.zeros((dimension, 1)).astype(bool)
-        indices = [i for i in indices if isinstance(i, (int, np.int64)) and i < dimension]
-        bool_vector[indices] = True
-        bool_matrix = np.tile(bool_vector, (1, dimension))
-        logic = np.logical_and(bool_matrix, bool_matrix.transpose())
-        matrix[logic] = np.nan
+        indices = [i for i in indices if isinstance(i, (int, np.integer)) and i < dimension]
+        matrix[np.ix_(indices, indices)] = np.nan
 
     # ============= Deletion ===========================================================================================
 
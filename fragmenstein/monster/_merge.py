@@ -12,9 +12,13 @@ as opposed to absorption, which is what happens in the ring expansion.
 
 ########################################################################################################################
 
-from typing import Optional, Dict, List, Union
+import hashlib
+import os
+import pickle
+from typing import Optional, Dict, List, Union, Tuple, Any
 from warnings import warn
 
+import numpy as np
 from rdkit import Chem
 from rdkit.Chem import rdmolops
 from ._join_neighboring import _MonsterJoinNeigh
@@ -24,6 +28,13 @@ from ..error import DistanceError, FragmensteinError
 
 
 class _MonsterMerge(_MonsterJoinNeigh, GPM):
+    # process-level memo of the first pass of ``simply_merge_hits``,
+    # keyed by the settings that alter ``merge_pair`` (see ``_get_merge_settings``) and the ordered hits
+    # (see ``_get_merge_key``), so that differently configured Monsters in a worker do not share steps.
+    # In a combination of 3+ hits, say (A, B, C) and (A, B, D), the pair (A, B) is merged only once per worker.
+    _merge_cache: Dict[tuple, Dict[str, Any]] = {}
+    merge_cache_size = 1_000  # maximum number of merge steps kept. 0 disables the memo
+    merge_cache_path: Optional[str] = None  # folder to share the merge steps across workers (pickled files)
 
     def simply_merge_hits(self,
                           hits: Optional[List[Chem.Mol]] = None,
@@ -45,14 +56,8 @@ class _MonsterMerge(_MonsterJoinNeigh, GPM):
         for hit in hits:
             BondProvenance.set_all_bonds(hit, 'original')
         self.journal.debug(f"Merging: {[hit.GetProp('_Name') for hit in hits]}")
-        scaffold = Chem.Mol(hits[0])
         # first try
-        save_for_later = []
-        for fragmentanda in hits[1:]:
-            try:
-                scaffold = self.merge_pair(scaffold, fragmentanda)
-            except FragmensteinError:
-                save_for_later.append(fragmentanda)
+        scaffold, save_for_later = self._merge_first_pass(hits)
         # second try
         join_later = []
         for fragmentanda in save_for_later:
@@ -79,6 +84,123 @@ class _MonsterMerge(_MonsterJoinNeigh, GPM):
         return scaffold
 
 
+    def _merge_first_pass(self, hits: List[Chem.Mol]) -> Tuple[Chem.Mol, List[Chem.Mol]]:
+        """
+        The first pass of ``simply_merge_hits``: the hits are merged pairwise in order
+        and those that fail are returned for a second try.
+        The state after each step is memoised (see ``_merge_cache``), so the steps of a shared prefix are reused.
+
+        :param hits:
+        :return: scaffold and hits to retry
+        """
+        scaffold = Chem.Mol(hits[0])
+        save_for_later: List[int] = []  # indices of hits
+        key: tuple = (self._get_merge_settings(), self._get_merge_key(hits[0]))
+        for i, fragmentanda in enumerate(hits[1:], start=1):
+            key += (self._get_merge_key(fragmentanda),)
+            step: Union[Dict[str, Any], None] = self._get_merge_step(key)
+            if step is not None:
+                self.journal.debug(f'Reusing merge step of {fragmentanda.GetProp("_Name")}')
+                scaffold = Chem.Mol(step['scaffold'])
+                save_for_later = list(step['save_for_later'])
+                self._collapsed_ring_offset = step['offset']
+                self._ring_table.update(step['rings'])
+                if i not in save_for_later:
+                    self.keep_copy(scaffold, 'pair_merged')
+                continue
+            try:
+                scaffold = self.merge_pair(scaffold, fragmentanda)
+            except FragmensteinError:
+                save_for_later.append(i)
+            self._set_merge_step(key, scaffold, save_for_later)
+        return scaffold, [hits[i] for i in save_for_later]
+
+    def _get_merge_settings(self) -> tuple:
+        """
+        The part of the ``_merge_cache`` key for the settings that alter the result of ``merge_pair``.
+        The class is included as a subclass may override any step.
+        """
+        cls = type(self)
+        return (f'{cls.__module__}.{cls.__qualname__}',
+                self._collapsed_ring_offset,
+                self.cutoff,
+                self.joining_cutoff,
+                self.average_position,
+                self.dummy_symbol,
+                self.atoms_in_bridge_cutoff,
+                self.throw_on_discard)
+
+    def _get_merge_key(self, hit: Chem.Mol) -> tuple:
+        """
+        The hashable key of a hit for ``_merge_cache``.
+        The ``_ori_i`` are included as these change with the offsetting of collapsed hits.
+        """
+        name = hit.GetProp('_Name') if hit.HasProp('_Name') else ''
+        atoms = tuple((atom.GetAtomicNum(), atom.GetIntProp('_ori_i') if atom.HasProp('_ori_i') else None)
+                      for atom in hit.GetAtoms())
+        bonds = tuple((bond.GetBeginAtomIdx(), bond.GetEndAtomIdx(), bond.GetBondType().name)
+                      for bond in hit.GetBonds())
+        positions: bytes = np.round(hit.GetConformer().GetPositions(), 3).tobytes()
+        return name, atoms, bonds, positions
+
+    def _get_merge_step(self, key: tuple) -> Union[Dict[str, Any], None]:
+        if self.merge_cache_size <= 0:
+            return None
+        elif key in self._merge_cache:
+            return self._merge_cache[key]
+        elif self.merge_cache_path is None:
+            return None
+        path = self._get_merge_step_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as fh:
+                step = pickle.load(fh)
+        except (OSError, EOFError, pickle.UnpicklingError) as error:
+            self.journal.debug(f'Could not read merge step {path}: {error}')
+            return None
+        step['scaffold'] = Chem.Mol(step['scaffold'])  # binary
+        self._store_merge_step(key, step)
+        return step
+
+    def _set_merge_step(self, key: tuple, scaffold: Chem.Mol, save_for_later: List[int]):
+        if self.merge_cache_size <= 0:
+            return
+        rings = {atom.GetIntProp('_ring_key'): self._ring_table[atom.GetIntProp('_ring_key')]
+                 for atom in scaffold.GetAtoms()
+                 if atom.HasProp('_ring_key') and atom.GetIntProp('_ring_key') in self._ring_table}
+        step = dict(scaffold=Chem.Mol(scaffold),
+                    save_for_later=tuple(save_for_later),
+                    offset=self._collapsed_ring_offset,
+                    rings=rings)
+        self._store_merge_step(key, step)
+        if self.merge_cache_path is None:
+            return
+        # the ring data keys are unique only within a process, so the ring data is shared as serialised props.
+        shareable = Chem.Mol(scaffold)
+        self.ring_data_to_props(shareable)
+        for atom in shareable.GetAtoms():
+            atom.ClearProp('_ring_key')
+        path = self._get_merge_step_path(key)
+        os.makedirs(self.merge_cache_path, exist_ok=True)
+        with open(path + f'.{os.getpid()}', 'wb') as fh:
+            pickle.dump({**step,
+                         'scaffold': shareable.ToBinary(Chem.PropertyPickleOptions.AllProps),
+                         'rings': {}}, fh)
+        os.replace(path + f'.{os.getpid()}', path)  # atomic: other workers never read half a file
+
+    def _store_merge_step(self, key: tuple, step: Dict[str, Any]):
+        while len(self._merge_cache) >= self.merge_cache_size:
+            del self._merge_cache[next(iter(self._merge_cache))]  # oldest first
+        self._merge_cache[key] = step
+
+    def _get_merge_step_path(self, key: tuple) -> str:
+        return os.path.join(self.merge_cache_path, hashlib.sha1(pickle.dumps(key)).hexdigest() + '.pkl')
+
+    @classmethod
+    def clear_merge_cache(cls):
+        cls._merge_cache.clear()
+
     def merge_pair(self, scaffold: Chem.Mol, fragmentanda: Chem.Mol, mapping: Optional = None) -> Chem.Mol:
         """
         To specify attachments use ``.merge``.
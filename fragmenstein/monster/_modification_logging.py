@@ -15,23 +15,37 @@ from typing import List
 class _MonsterTracker(_MonsterBase):
     """
     _MonsterBase -> _MonsterTracker -> _MonsterCommunal
+
+    The copies in ``.modifications`` are controlled by ``tracking``:
+
+    * ``full``: all intermediate molecules are kept (default),
+    * ``final``: only the last one is kept,
+    * ``off``: none are kept.
+
+    The ones in ``required_modifications`` are always kept as they are used downstream.
     """
+    tracking = 'full'
+    required_modifications = ('scaffold', 'chimera', 'Rings expanded and original bonding restored')
 
     def keep_copy(self, mol: Chem.Mol, label=None):
+        if self.tracking != 'full' and label not in self.required_modifications:
+            if self.tracking == 'off':
+                return
+            # final: forget the previous intermediate
+            for other in [other for other in self.modifications if other not in self.required_modifications]:
+                del self.modifications[other]
         copy = Chem.Mol(mol)
         if label is None:
             label = f'Mol#{len(self.modifications)}'
-        copy.SetProp('_Name', label)
-        if label not in self.modifications:
-            self.modifications[label] = copy
-        else:
+        while label in self.modifications:
             label += '_'
-            self.keep_copy(mol, label)
-
+        copy.SetProp('_Name', label)
+        self.modifications[label] = copy
 
     def keep_copies(self, mols: List[Chem.Mol], label=None):
+        if self.tracking == 'off':
+            return
         for i, mol in enumerate(mols):
-            copy = Chem.Mol(mol)
             if label is None:
                 this_label = f'Mol#{len(self.modifications)}'
             else:
@@ -1,10 +1,69 @@
 import copy
+import itertools
 import random
-from typing import Optional, Dict, Union
+from collections import deque
+from typing import Optional, Dict, Union, List, Tuple, Any, Deque
 
+import numpy as np
+import pebble
 from rdkit import Chem
 
 from fragmenstein import Victor
+from fragmenstein.monster import Monster
+from fragmenstein.laboratory import binarize, unbinarize
+
+# the Victor attributes set by the thermodynamic part of a placement that are sent back from a subprocess
+# (see ``_place_conformation_remotely``), bar the mols, which are binarised
+remote_attributes = ('long_name', 'smiles', 'atomnames', 'merging_mode', 'is_covalent', 'error_msg',
+                     'ddG', 'energy_score', 'reanimation_rounds', 'unminimized_pdbblock', 'minimized_pdbblock',
+                     'tick', 'tock')
+remote_mol_attributes = ('mol', 'minimized_mol')
+
+
+def _place_conformation(victor_class: type,
+                        victor_init_args: Dict[str, Any],
+                        monster: Monster,
+                        seed: int,
+                        run_number: int,
+                        place_args: Dict[str, Any],
+                        ) -> Victor:
+    """
+    Minimises the conformation of ``monster.positioned_mol`` (cf. ``Monster.sample_new_conformation``).
+    """
+    victor = victor_class(monster_random_seed=seed, **victor_init_args)
+    victor._prepare_args_for_placement(**place_args)
+    victor.monster = monster
+    victor._calculate_placement_thermo()
+    victor.runNumber = run_number
+    return victor
+
+
+def _place_conformation_remotely(victor_class: type,
+                                 victor_init_args: Dict[str, Any],
+                                 hit_binaries: List[bytes],
+                                 monster_binaries: Dict[str, Any],
+                                 seed: int,
+                                 place_args: Dict[str, Any],
+                                 ) -> Dict[str, Any]:
+    """
+    ``_place_conformation`` in a subprocess.
+    The mols are sent binarised (so keep their properties) and so are those of the Monster
+    (``positioned_mol`` and ``mol_options``, see ``MultiVictorPlacement._binarize_monster``).
+    The Victor is not returned as its backend objects (Igor's poses, Fritz's simulations) cannot be pickled:
+    its attributes in ``remote_attributes`` and ``remote_mol_attributes`` (binarised) are,
+    see ``MultiVictorPlacement._restore_remote_placement``.
+    """
+    victor = victor_class(monster_random_seed=seed,
+                          hits=[unbinarize(hit) for hit in hit_binaries],
+                          **victor_init_args)
+    victor._prepare_args_for_placement(**place_args)
+    victor.monster.positioned_mol = unbinarize(monster_binaries['positioned_mol'])
+    victor.monster.mol_options = [unbinarize(option) for option in monster_binaries['mol_options']]
+    victor.monster.unmatched = monster_binaries['unmatched']
+    victor._calculate_placement_thermo()
+    return {**{name: getattr(victor, name) for name in remote_attributes if hasattr(victor, name)},
+            **{name: binarize(getattr(victor, name, None)) for name in remote_mol_attributes}}
+
 
 class MultiVictorPlacement():
     """
@@ -12,21 +71,40 @@ class MultiVictorPlacement():
     The idea is to be able to do something more like docking for those cases in which the inspirational hits do not
     explain an important part of the molecule
     """
+    Victor = Victor  # So it can be swapped for a subclass
 
     def __init__(self, random_seed=None, **victor_init_args):
         self.random_seed = random_seed
         self.victor_init_args = victor_init_args
 
         self.placed_victors = []
+        # run number -> run number of the conformation it duplicates (not minimised), cf. ``dedup_rmsd``
+        self.duplicated_runs: Dict[int, int] = {}
 
     def place(self,  smiles: str, number_runs: int= 10,
               long_name: str = 'ligand',
               merging_mode='expansion',
               atomnames: Optional[Dict[int, str]] = None,
               custom_map: Optional[Dict[str, Dict[int, int]]] = None,
-              extra_ligand_constraint: Union[str] = None):
+              extra_ligand_constraint: Union[str] = None,
+              n_cores: int = 1,
+              target_ddG: Optional[float] = None,
+              target_rmsd: Optional[float] = None,
+              dedup_rmsd: float = 0.5):
         """
         Places a followup (smiles) into the protein based upon the hits. Obtains number_runs solutions.
+        The first run is a regular placement, the others are new conformations of its Monster
+        (``sample_new_conformation``), which are minimised on ``n_cores`` subprocesses if more than one.
+        The Victors of runs in subprocesses are rebuilt from their results (see ``_restore_remote_placement``)
+        so lack the backend objects (e.g. ``.igor``, ``.unbound_pose`` or ``.fritz``).
+        At most ``2 * n_cores`` runs are scheduled at a time.
+
+        The runs are considered in order, so the outcome does not depend on which subprocess finishes first.
+        If ``target_ddG`` and/or ``target_rmsd`` are given, the runs after the first that reaches them are not kept
+        (or not run if still pending).
+        Conformations within ``dedup_rmsd`` Å heavy atom RMSD (not superposed) of an earlier one are not minimised,
+        so there are as many runs as distinct conformations (see ``.duplicated_runs``).
+
         :param smiles: smiles of followup, optionally covalent (_e.g._ ``*CC(=O)CCC``)
         :param number_runs: the number of Victor objects to create and place the smiles
         :param long_name: gets used for filenames so will get corrected
@@ -34,6 +112,10 @@ class MultiVictorPlacement():
         :param atomnames: an optional dictionary that gets used by ``Params.from_smiles``
         :param custom_map: see Monster.place
         :param extra_ligand_constraint:
+        :param n_cores: number of subprocesses for the runs after the first. 1 is no subprocesses
+        :param target_ddG: stop once a run has a ∆∆G (kcal/mol) this low or lower...
+        :param target_rmsd: ...and a combined RMSD (Å) this low or lower
+        :param dedup_rmsd: conformations closer than this are duplicates. 0 is no deduplication
         :return:
         """
         assert number_runs >= 1, "Error, at least one placement required"
@@ -46,25 +128,145 @@ class MultiVictorPlacement():
             random.setstate(current_randomState)
 
         i = 0
-        victor = Victor(monster_random_seed=rseeds[i], **self.victor_init_args)
+        victor = self.Victor(monster_random_seed=rseeds[i], **self.victor_init_args)
         victor.place(smiles, long_name=long_name+str(i), merging_mode= merging_mode,
                      custom_map=custom_map, atomnames=atomnames,
                      extra_ligand_constraint=extra_ligand_constraint)
         victor.runNumber = i
-        ddG = victor.ddG
-        monster = victor.monster
-        self.placed_victors = [(ddG, victor)]
-
+        self.placed_victors = [(victor.ddG, victor)]
+        self.duplicated_runs = {}
+        if self._has_reached_target(victor, target_ddG, target_rmsd) or number_runs == 1:
+            self._sort_placed()
+            return
+        # ## sample the conformations
+        # each run has its own copy of the Monster, so its positioned_mol is its own
+        monsters: List[Monster] = []
         for i in range(1, number_runs):
+            monster = copy.deepcopy(victor.monster)
             monster.sample_new_conformation(rseeds[i])
-            victor = Victor(monster_random_seed=rseeds[i], **self.victor_init_args)
-            victor._prepare_args_for_placement(smiles=smiles, long_name = long_name+str(i), merging_mode= merging_mode,
-                                               custom_map=custom_map,
-                                               atomnames=atomnames, extra_ligand_constraint=extra_ligand_constraint)
-            victor.monster = monster
-            victor._calculate_placement_thermo()
-            self.placed_victors += [(victor.ddG, victor)]
-        self.placed_victors = sorted(self.placed_victors)
+            monsters.append(monster)
+        # ## minimise them, bar the duplicates
+        representatives: List[int] = self._cluster_conformations([victor.monster.positioned_mol] +
+                                                                 [monster.positioned_mol for monster in monsters],
+                                                                 dedup_rmsd)
+        self.duplicated_runs = {i: r for i, r in enumerate(representatives) if i != r}
+        arguments: List[Tuple] = [(self.Victor, self.victor_init_args, monster, rseeds[i], i,
+                                   dict(smiles=smiles, long_name=long_name + str(i), merging_mode=merging_mode,
+                                        custom_map=custom_map, atomnames=atomnames,
+                                        extra_ligand_constraint=extra_ligand_constraint)
+                                   )
+                                  for i, monster in enumerate(monsters, start=1) if i not in self.duplicated_runs]
+        if n_cores <= 1:
+            for args in arguments:
+                victor = _place_conformation(*args)
+                self.placed_victors.append((victor.ddG, victor))
+                if self._has_reached_target(victor, target_ddG, target_rmsd):
+                    break
+        else:
+            remaining = iter(arguments)
+            pending: Deque[Tuple[Tuple, pebble.ProcessFuture]] = deque()
+            with pebble.ProcessPool(max_workers=n_cores) as pool:
+                while True:
+                    for args in itertools.islice(remaining, max(2 * n_cores - len(pending), 0)):
+                        pending.append((args, pool.schedule(_place_conformation_remotely,
+                                                            args=self._binarize_arguments(*args))))
+                    if not pending:
+                        break
+                    args, future = pending.popleft()
+                    victor = self._restore_remote_placement(future.result(), *args)
+                    self.placed_victors.append((victor.ddG, victor))
+                    if self._has_reached_target(victor, target_ddG, target_rmsd):
+                        for _, future in pending:
+                            future.cancel()
+                        break
+        self._sort_placed()
+
+    @staticmethod
+    def _binarize_monster(monster: Monster) -> Dict[str, Any]:
+        """
+        The parts of a Monster used by the thermodynamic part of a placement, with the mols binarised
+        """
+        return {'positioned_mol': binarize(monster.positioned_mol),
+                'mol_options': [binarize(option) for option in monster.mol_options],
+                'unmatched': list(monster.unmatched)}
+
+    @classmethod
+    def _binarize_arguments(cls,
+                            victor_class: type,
+                            victor_init_args: Dict[str, Any],
+                            monster: Monster,
+                            seed: int,
+                            run_number: int,
+                            place_args: Dict[str, Any]) -> Tuple:
+        """
+        The arguments of ``_place_conformation`` as those of ``_place_conformation_remotely``
+        """
+        init_args = {name: value for name, value in victor_init_args.items() if name != 'hits'}
+        hit_binaries = [binarize(hit) for hit in victor_init_args.get('hits', [])]
+        return victor_class, init_args, hit_binaries, cls._binarize_monster(monster), seed, place_args
+
+    @staticmethod
+    def _restore_remote_placement(result: Dict[str, Any],
+                                  victor_class: type,
+                                  victor_init_args: Dict[str, Any],
+                                  monster: Monster,
+                                  seed: int,
+                                  run_number: int,
+                                  place_args: Dict[str, Any]) -> Victor:
+        """
+        A Victor with the results of ``_place_conformation_remotely`` and the Monster of the run.
+        The mRMSD is calculated here as it holds mols.
+        """
+        victor = victor_class(monster_random_seed=seed, **victor_init_args)
+        victor.monster = monster
+        for name, value in result.items():
+            setattr(victor, name, unbinarize(value) if name in remote_mol_attributes else value)
+        victor.mrmsd = victor._calculate_rmsd()
+        victor.runNumber = run_number
+        return victor
+
+    @staticmethod
+    def _cluster_conformations(mols: List[Chem.Mol], threshold: float) -> List[int]:
+        """
+        Greedy clustering in order of conformations of the same molecule by heavy atom RMSD without superposition:
+        a conformation within ``threshold`` Å of an earlier representative belongs to it,
+        else it is a representative itself.
+
+        :param mols: conformations of the same molecule (same atom order)
+        :param threshold: RMSD cutoff in Å
+        :return: the index of the representative for each mol
+        """
+        if threshold <= 0:
+            return list(range(len(mols)))
+        heavy: List[int] = [atom.GetIdx() for atom in mols[0].GetAtoms() if atom.GetAtomicNum() > 1]
+        coordinates: np.ndarray = np.array([mol.GetConformer().GetPositions()[heavy] for mol in mols])
+        representatives: List[int] = []
+        assignments: List[int] = []
+        for i, xyz in enumerate(coordinates):
+            if representatives:
+                rmsds: np.ndarray = np.sqrt(((coordinates[representatives] - xyz) ** 2).sum(axis=-1).mean(axis=-1))
+                closest: int = int(np.argmin(rmsds))
+                if rmsds[closest] < threshold:
+                    assignments.append(representatives[closest])
+                    continue
+            representatives.append(i)
+            assignments.append(i)
+        return assignments
+
+    @staticmethod
+    def _has_reached_target(victor: Victor, target_ddG: Optional[float], target_rmsd: Optional[float]) -> bool:
+        if target_ddG is None and target_rmsd is None:
+            return False
+        elif target_ddG is not None and not victor.ddG <= target_ddG:
+            return False
+        elif target_rmsd is None:
+            return True
+        rmsd: Optional[float] = victor.mrmsd.mrmsd
+        return rmsd is not None and rmsd <= target_rmsd
+
+    def _sort_placed(self):
+        # the run number breaks ties
+        self.placed_victors = sorted(self.placed_victors, key=lambda pair: (pair[0], pair[1].runNumber))
 
     def retrieve_best_victor(self):
         return self.placed_victors[0][1]
@@ -10,11 +10,15 @@ __date__ = "2022 A.D."
 __license__ = "MIT"
 __citation__ = ""
 
+import copy
 import functools
+import hashlib
 import logging
+import re
+import xml.etree.ElementTree as ET
 from rdkit import Chem
 import numpy as np
-from typing import List, Union, Sequence, Tuple, Optional, Dict, Annotated
+from typing import List, Union, Sequence, Tuple, Optional, Dict, Set, Annotated
 from rdkit import Chem
 from rdkit.Chem import AllChem
 import io, time
@@ -41,6 +45,27 @@ class Fritz:
     forcefield_names = ('amber14-all.xml', 'implicit/gbn2.xml')
     molar_energy_unit = mmu.kilocalorie_per_mole
     integrator = mm.LangevinMiddleIntegrator(300 * mmu.kelvin, 1 / mmu.picosecond, 0.004 * mmu.picoseconds)
+    # atoms of the removed neighbouring residue that become the caps of a chain break in ``extract_pocket``
+    # (old name -> cap atom name) and the bonds within the cap
+    cap_atoms = {'ACE': {'C': 'C', 'O': 'O', 'CA': 'CH3'}, 'NME': {'N': 'N', 'CA': 'C'}}
+    cap_bonds = {'ACE': (('C', 'O'), ('C', 'CH3')), 'NME': (('N', 'C'),)}
+    # gaps of up to this many residues between pocket residues are kept instead of capped,
+    # as the NME and ACE caps on either side would be built from the same or bonded atoms and clash
+    pocket_gap = 2
+    # per process (i.e. per worker) caches:
+    # forcefield names -> forcefield, with the residue templates of the ligands added so far (see ``add_ligand_template``)
+    _forcefields: Dict[Tuple[str, ...], mma.ForceField] = {}
+    # (forcefield names, isomeric SMILES of the ligand) -> name of its residue template in the forcefield.
+    # Stereoisomers have the same graph, so match each other's templates: the template is always given by name.
+    _ligand_templates: Dict[Tuple[Tuple[str, ...], str], str] = {}
+    _smirnoff: Optional[SMIRNOFFTemplateGenerator] = None  # parameterises the ligands
+    # (apo pdb block, forcefield names) -> protonated apo, used if ``reuse_receptor``
+    _receptors: Dict[Tuple[str, Tuple[str, ...]], mma.Modeller] = {}
+    # (apo pdb block, forcefield names) -> residue index of each atom of the protonated apo, ditto (see ``freeze``)
+    _receptor_residues: Dict[Tuple[str, Tuple[str, ...]], np.ndarray] = {}
+    # (apo pdb block, forcefield names, nonbonded method, cutoff) -> apo system (unfrozen), ditto
+    _apo_systems: Dict[Tuple[str, Tuple[str, ...], str, float], mm.System] = {}
+    receptor_cache_size = 4
 
     def init_pyrosetta(self):
         """
@@ -57,8 +82,24 @@ class Fritz:
                  restraining_atom_indices: Sequence[int] = (),
                  restraint_k: float = 1000.0,
                  mobile_radius: float = 8.0,
+                 pocket_radius: float = 0.,
+                 nonbonded_method: str = 'NoCutoff',
+                 nonbonded_cutoff: float = 1.0,
+                 reuse_receptor: bool = False,
                  ):
+        """
+        :param pocket_radius: if non-zero, only the residues within this distance (Å) of the ligand are modelled
+                                (see ``extract_pocket``), for both the holo and apo systems
+        :param nonbonded_method: name of the ``openmm.app`` nonbonded method, e.g. NoCutoff or CutoffNonPeriodic
+        :param nonbonded_cutoff: cutoff in nm (ignored by NoCutoff)
+        :param reuse_receptor: protonate the apo structure once per worker (see ``get_receptor``)
+                                as opposed to protonating the holo structure each time
+        """
         tick: float = time.time()
+        self.pocket_radius: float = float(pocket_radius)
+        self.nonbonded_method: str = nonbonded_method
+        self.nonbonded_cutoff: float = float(nonbonded_cutoff)
+        self.reuse_receptor: bool = bool(reuse_receptor)
         self.resn: str = resn.strip()
         self.resi: int = int(resi)
         self.chain: str = chain
@@ -68,21 +109,23 @@ class Fritz:
         # so is technically not Victor.Monster.positioned_mol
         self.prepped_mol: Chem.Mol = AllChem.AddHs(prepped_mol, addCoords=True)
         self.correct_pdbinfo(mol=self.prepped_mol, resn=self.resn, resi=self.resi, chain=self.chain)
+        self.forcefield: mma.ForceField = self.create_forcefield()
         # this is apo
         self.pdb_block: str = pdb_block
-        self.holo: mma.Modeller = self.plonk(pdb_block,
+        self.apo: Union[mma.PDBFile, mma.Modeller] = self.get_apo()
+        # a reused receptor is protonated already, but the caps of a pocket are not
+        self.protonated: bool = self.reuse_receptor and not self.pocket_radius
+        self.holo: mma.Modeller = self.plonk(self.apo,
                                              self.prepped_mol)  # this is Fritz's plonk —Not Victor unlike Igor
         tock: float = time.time()
         self.journal.debug(f'Holo structure made {tock - tick}')
         self.neighboring_res_idxs: List[int] = []  # computed later
-        self.forcefield: mma.ForceField = self.create_forcefield()
         self.simulation = self.create_simulation(model=self.holo,
                                                  restraining_atom_indices=restraining_atom_indices,
                                                  restraint_k=restraint_k,
-                                                 mobile_radius=mobile_radius)
-        self.apo_simulation = self.create_simulation(model=self.pdbblock_to_PDB(self.pdb_block),
-                                                     restraining_atom_indices=[],
-                                                     restraint_k=0)
+                                                 mobile_radius=mobile_radius,
+                                                 add_hydrogens=not self.protonated)
+        self.apo_simulation = self.create_apo_simulation()
         self.ideal_ligand_simulation = self.create_simulation(model=self.rdkit_to_openMM(self.ideal_mol),
                                                               restraining_atom_indices=[],
                                                               restraint_k=0,
@@ -151,6 +194,136 @@ class Fritz:
         holo.add(lig.topology, lig.positions)  # noqa mmu.Quantity is okay
         return holo
 
+    def get_apo(self) -> Union[mma.PDBFile, mma.Modeller]:
+        """
+        The apo structure, which is the whole of ``self.pdb_block`` or only the pocket if ``self.pocket_radius``
+        """
+        if self.reuse_receptor:
+            apo: mma.Modeller = self.get_receptor(self.pdb_block, self.forcefield, self.forcefield_names)
+        else:
+            apo: mma.PDBFile = self.pdbblock_to_PDB(self.pdb_block)
+        if not self.pocket_radius:
+            return apo
+        return self.extract_pocket(apo, self.prepped_mol, self.pocket_radius)
+
+    def extract_pocket(self,
+                       apo: Union[mma.PDBFile, mma.Modeller],
+                       mol: Chem.Mol,
+                       radius: float) -> mma.Modeller:
+        """
+        Returns only the residues with an atom within ``radius`` Å of a heavy atom of ``mol``.
+        Residues bonded to these other than by a peptide bond (disulfides) are kept too,
+        as are gaps of up to ``pocket_gap`` residues between them
+        and removed residues lacking the backbone atoms for a cap.
+        The chain breaks are capped with ACE and NME residues, whose heavy atoms are those of the removed
+        neighbouring residue (C, O, CA and N, CA respectively), so no geometry is made up.
+        The hydrogens are added in ``create_simulation`` as always.
+        """
+        topology: mma.topology.Topology
+        positions: mmu.Quantity
+        topology, positions = self.get_topo_pos(apo)
+        xyz: np.ndarray = np.array(positions.value_in_unit(mmu.angstrom))
+        heavy: List[int] = [atom.GetIdx() for atom in mol.GetAtoms() if atom.GetAtomicNum() > 1]
+        ligand_xyz: np.ndarray = mol.GetConformer().GetPositions()[heavy]
+        distances: np.ndarray = np.linalg.norm(xyz[:, np.newaxis, :] - ligand_xyz[np.newaxis, :, :], axis=-1)
+        atoms: List[mma.topology.Atom] = list(topology.atoms())
+        kept: Set[int] = {atoms[i].residue.index for i in np.flatnonzero(distances.min(axis=1) <= radius)}
+        peptide_bonds: Set[Tuple[int, int]] = set()
+        for a, b in topology.bonds():
+            if a.residue.index == b.residue.index:
+                continue
+            elif {a.name, b.name} == {'C', 'N'}:
+                peptide_bonds.update({(a.residue.index, b.residue.index), (b.residue.index, a.residue.index)})
+            elif a.residue.index in kept or b.residue.index in kept:
+                kept.update({a.residue.index, b.residue.index})
+        self._fill_pocket(topology, kept, peptide_bonds)
+        # ## new topology
+        pocket = mma.Topology()
+        pocket_xyz: List[mm.Vec3] = []
+        new_atoms: Dict[int, mma.topology.Atom] = {}
+
+        def add_atom(atom: mma.topology.Atom, residue: mma.topology.Residue, name: str) -> mma.topology.Atom:
+            pocket_xyz.append(mm.Vec3(*map(float, xyz[atom.index])))
+            return pocket.addAtom(name, atom.element, residue)
+
+        def add_cap(name: str, template: mma.topology.Residue, chain: mma.topology.Chain) \
+                -> Dict[str, mma.topology.Atom]:
+            old: Dict[str, mma.topology.Atom] = {atom.name: atom for atom in template.atoms()}
+            if not self._can_cap(template, name):
+                # `_fill_pocket` keeps these residues
+                raise ValueError(f'Cannot cap with {name} as {template} is missing backbone atoms')
+            cap: mma.topology.Residue = pocket.addResidue(name, chain, template.id, template.insertionCode)
+            capped = {new_name: add_atom(old[old_name], cap, new_name)
+                      for old_name, new_name in self.cap_atoms[name].items()}
+            for first, second in self.cap_bonds[name]:
+                pocket.addBond(capped[first], capped[second])
+            return capped
+
+        n_caps = 0
+        for chain in topology.chains():
+            residues: List[mma.topology.Residue] = list(chain.residues())
+            new_chain: Optional[mma.topology.Chain] = None
+            for i, residue in enumerate(residues):
+                if residue.index not in kept:
+                    continue
+                if new_chain is None:
+                    new_chain = pocket.addChain(chain.id)
+                previous = residues[i - 1] if i > 0 else None
+                following = residues[i + 1] if i + 1 < len(residues) else None
+                ace: Dict[str, mma.topology.Atom] = {}
+                if previous is not None and previous.index not in kept \
+                        and (previous.index, residue.index) in peptide_bonds:
+                    ace = add_cap('ACE', previous, new_chain)
+                new_residue = pocket.addResidue(residue.name, new_chain, residue.id, residue.insertionCode)
+                for atom in residue.atoms():
+                    new_atoms[atom.index] = add_atom(atom, new_residue, atom.name)
+                backbone = {atom.name: new_atoms[atom.index] for atom in residue.atoms()}
+                if ace:
+                    pocket.addBond(ace['C'], backbone['N'])
+                    n_caps += 1
+                if following is not None and following.index not in kept \
+                        and (residue.index, following.index) in peptide_bonds:
+                    nme = add_cap('NME', following, new_chain)
+                    pocket.addBond(backbone['C'], nme['N'])
+                    n_caps += 1
+        for a, b in topology.bonds():
+            if a.index in new_atoms and b.index in new_atoms:
+                pocket.addBond(new_atoms[a.index], new_atoms[b.index])
+        self.journal.debug(f'Pocket of {len(kept)} residues of {topology.getNumResidues()} and {n_caps} caps')
+        return mma.Modeller(pocket, pocket_xyz * mmu.angstrom)
+
+    def _fill_pocket(self,
+                     topology: mma.topology.Topology,
+                     kept: Set[int],
+                     peptide_bonds: Set[Tuple[int, int]]) -> None:
+        """
+        Adds to the residue indices ``kept`` (in place) those in gaps of up to ``pocket_gap`` residues
+        and the removed neighbours that cannot be made into a cap, until there are none (see ``extract_pocket``).
+        """
+        changed = True
+        while changed:
+            changed = False
+            for chain in topology.chains():
+                residues: List[mma.topology.Residue] = list(chain.residues())
+                positions: List[int] = [i for i, residue in enumerate(residues) if residue.index in kept]
+                for i, j in zip(positions, positions[1:]):
+                    if 1 < j - i <= self.pocket_gap + 1:
+                        kept.update(residue.index for residue in residues[i + 1:j])
+                        changed = True
+                for i in positions:
+                    for n, cap_name in ((i - 1, 'ACE'), (i + 1, 'NME')):
+                        if not 0 <= n < len(residues) or residues[n].index in kept:
+                            continue
+                        bond = (residues[n].index, residues[i].index) if n < i else (residues[i].index,
+                                                                                      residues[n].index)
+                        if bond in peptide_bonds and not self._can_cap(residues[n], cap_name):
+                            kept.add(residues[n].index)
+                            changed = True
+
+    def _can_cap(self, template: mma.topology.Residue, name: str) -> bool:
+        names: Set[str] = {atom.name for atom in template.atoms()}
+        return all(old_name in names for old_name in self.cap_atoms[name])
+
     def rdkit_to_openMM(self, mol: Chem.Mol) -> mma.Modeller:
         # rdkit AssignStereochemistryFrom3D previously applied
         lig = OFFMolecule.from_rdkit(mol, allow_undefined_stereo=True)
@@ -179,15 +352,91 @@ class Fritz:
         return pdb
 
     def create_forcefield(self, forcefield_names: Optional[Sequence[str]] = None) -> mma.ForceField:
-        """set up forcefield"""
-        molecule = OFFMolecule.from_rdkit(self.ideal_mol, allow_undefined_stereo=True)
-        smirnoff = SMIRNOFFTemplateGenerator(molecules=molecule)
+        """
+        set up forcefield.
+        The forcefield is made once per worker for given forcefield names
+        and the residue template of each ligand is added to it once (see ``add_ligand_template``).
+        The names used are stored as ``self.forcefield_names``, which the receptor and apo system caches are keyed on.
+        """
         if forcefield_names is None:
             forcefield_names = self.forcefield_names
-        forcefield = mma.ForceField(*forcefield_names)
-        forcefield.registerTemplateGenerator(smirnoff.generator)
+        self.forcefield_names: Tuple[str, ...] = tuple(forcefield_names)
+        if self.forcefield_names not in self._forcefields:
+            self._forcefields[self.forcefield_names] = mma.ForceField(*self.forcefield_names)
+        forcefield: mma.ForceField = self._forcefields[self.forcefield_names]
+        self.ligand_template: str = self.add_ligand_template(forcefield)
         return forcefield
 
+    def add_ligand_template(self, forcefield: mma.ForceField) -> str:
+        """
+        Adds the SMIRNOFF residue template of the ligand (``self.ideal_mol``) to the forcefield,
+        unless the ligand (by isomeric SMILES) already was.
+        The template and its atom types are named uniquely (see ``rename_ffxml``).
+
+        :return: the name of the template, which is passed as ``residueTemplates`` (see ``get_residue_templates``)
+        """
+        smiles: str = Chem.MolToSmiles(self.ideal_mol, isomericSmiles=True)
+        key = (self.forcefield_names, smiles)
+        if key not in self._ligand_templates:
+            if self._smirnoff is None:
+                type(self)._smirnoff = SMIRNOFFTemplateGenerator()
+            molecule = OFFMolecule.from_rdkit(self.ideal_mol, allow_undefined_stereo=True)
+            name = f'{self.resn}-{hashlib.sha1(smiles.encode()).hexdigest()[:12]}'
+            ffxml: str = self._smirnoff.generate_residue_template(molecule)
+            forcefield.loadFile(io.StringIO(self.rename_ffxml(ffxml, name)))
+            self._ligand_templates[key] = name
+        return self._ligand_templates[key]
+
+    @staticmethod
+    def rename_ffxml(ffxml: str, name: str) -> str:
+        """
+        Names the residue template of a ffxml ``name`` and prefixes its atom types and classes with it,
+        so that the templates of several ligands (which may share atom type names) can be in one forcefield.
+        """
+        root = ET.fromstring(ffxml)
+        for element in root.iter():
+            for attribute, value in list(element.attrib.items()):
+                if value and re.fullmatch(r'(type|class)\d*', attribute):
+                    element.set(attribute, f'{name}-{value}')
+        for atom_type in root.iter('Type'):
+            atom_type.set('name', f'{name}-{atom_type.get("name")}')
+        for residue in root.iter('Residue'):
+            residue.set('name', name)
+        return ET.tostring(root, encoding='unicode')
+
+    def get_residue_templates(self, topology: mma.Topology) -> Dict[mma.topology.Residue, str]:
+        """
+        The ``residueTemplates`` argument of ``createSystem`` and ``addHydrogens``: the ligand residue to its template.
+        """
+        return {residue: self.ligand_template for residue in topology.residues() if residue.name == self.resn}
+
+    @classmethod
+    def get_receptor(cls, pdb_block: str, forcefield: mma.ForceField,
+                     forcefield_names: Optional[Sequence[str]] = None) -> mma.Modeller:
+        """
+        Returns the protonated apo structure, which is made once per worker,
+        along with the residue index of each of its atoms (``_receptor_residues``, see ``freeze``).
+        Do not alter it, copy it (``plonk`` does).
+
+        :param pdb_block: apo PDB block
+        :param forcefield: forcefield used to protonate (see ``create_forcefield``)
+        :param forcefield_names: the names ``forcefield`` was made from (default: ``cls.forcefield_names``)
+        """
+        if forcefield_names is None:
+            forcefield_names = cls.forcefield_names
+        key = (pdb_block, tuple(forcefield_names))
+        if key not in cls._receptors:
+            while len(cls._receptors) >= max(cls.receptor_cache_size, 1):
+                oldest = next(iter(cls._receptors))
+                del cls._receptors[oldest]
+                cls._receptor_residues.pop(oldest, None)
+            pdb: mma.PDBFile = cls.pdbblock_to_PDB(pdb_block)
+            receptor = mma.Modeller(pdb.topology, pdb.positions)
+            receptor.addHydrogens(forcefield, pH=7.0)
+            cls._receptors[key] = receptor
+            cls._receptor_residues[key] = np.array([atom.residue.index for atom in receptor.topology.atoms()])
+        return cls._receptors[key]
+
     @functools.cached_property
     def ideal_mol(self):
         ideal = AllChem.AddHs(self.prepped_mol, addCoords=True)
@@ -201,9 +450,14 @@ class Fritz:
                           restraining_atom_indices: Sequence[int] = (),
                           mobile_radius: float = 8.0,
                           frozen: bool = True,
+                          add_hydrogens: bool = True,
+                          system: Optional[mm.System] = None,
                           ) -> mma.Simulation:
         """
         Creates a simulation object with the ligand harmonically constrained and the distal parts of the protein frozen.
+
+        :param add_hydrogens: protonate the model (False if it is already)
+        :param system: a system to use instead of creating one from the model (see ``create_apo_simulation``)
         """
         # deal with model
         if isinstance(model, mma.Modeller):
@@ -215,12 +469,13 @@ class Fritz:
         else:
             model = self.holo
         # add Hydrogens
-        model.addHydrogens(self.forcefield, pH=7.0)
+        if add_hydrogens:
+            model.addHydrogens(self.forcefield, pH=7.0, residueTemplates=self.get_residue_templates(model.topology))
         # set up system
-        system: mm.System = self.forcefield.createSystem(model.topology,
-                                                         nonbondedMethod=mma.NoCutoff,
-                                                         nonbondedCutoff=1 * mmu.nanometer,
-                                                         constraints=mma.HBonds)
+        if system is None and self.protonated and model.topology.getNumAtoms() > self.get_apo_system().getNumParticles():
+            system: mm.System = self.create_holo_system(model)
+        elif system is None:
+            system: mm.System = self.create_system(model)
         # restrain (harmonic constrain) the ligand
         if restraint_k:
             self.restrain(system, model, k=restraint_k, atom_indices=restraining_atom_indices)
@@ -241,6 +496,127 @@ class Fritz:
             self.journal.debug('No freezing')
         return simulation
 
+    def create_system(self, model: Union[mma.PDBFile, mma.Modeller]) -> mm.System:
+        return self.forcefield.createSystem(model.topology,
+                                            nonbondedMethod=getattr(mma, self.nonbonded_method),
+                                            nonbondedCutoff=self.nonbonded_cutoff * mmu.nanometer,
+                                            constraints=mma.HBonds,
+                                            residueTemplates=self.get_residue_templates(model.topology))
+
+    def get_apo_system(self) -> mm.System:
+        """
+        The system of the reused receptor (unfrozen), which is made once per worker. Do not alter it, copy it.
+        """
+        key = (self.pdb_block, tuple(self.forcefield_names), self.nonbonded_method, self.nonbonded_cutoff)
+        if key not in self._apo_systems:
+            while len(self._apo_systems) >= max(self.receptor_cache_size, 1):
+                del self._apo_systems[next(iter(self._apo_systems))]
+            self._apo_systems[key] = self.create_system(self.apo)
+        return self._apo_systems[key]
+
+    def create_apo_simulation(self) -> mma.Simulation:
+        """
+        The simulation of the apo structure (``self.apo``) frozen as the holo one.
+        If the receptor is reused, so is its system, which is made once per worker and copied.
+        """
+        model = mma.Modeller(self.apo.topology, self.apo.positions)
+        if not self.protonated:
+            return self.create_simulation(model=model, restraining_atom_indices=[], restraint_k=0)
+        # the masses are altered by freezing, hence the copy
+        return self.create_simulation(model=model, restraining_atom_indices=[], restraint_k=0,
+                                      add_hydrogens=False, system=copy.deepcopy(self.get_apo_system()))
+
+    @functools.cached_property
+    def ligand_system(self) -> mm.System:
+        """
+        The system of the ligand alone. Do not alter it, copy it.
+        """
+        return self.create_system(self.rdkit_to_openMM(self.ideal_mol))
+
+    def create_holo_system(self, model: mma.Modeller) -> mm.System:
+        """
+        The system of a holo model of the reused receptor followed by the ligand (as ``plonk`` makes it):
+        a copy of the apo system (``get_apo_system``) with the particles, constraints and forces
+        of the ligand system (``ligand_system``) appended,
+        so only the ligand is parameterised as opposed to the whole holo model (``create_system``).
+        There are no bonded terms between the two and the nonbonded ones are per particle.
+        Falls back to ``create_system`` if a force cannot be appended.
+        """
+        system: mm.System = copy.deepcopy(self.get_apo_system())
+        ligand: mm.System = self.ligand_system
+        offset: int = system.getNumParticles()
+        if offset + ligand.getNumParticles() != model.topology.getNumAtoms():
+            self.journal.debug('The holo model is not the apo followed by the ligand, creating the holo system afresh')
+            return self.create_system(model)
+        forces: Dict[type, List[mm.Force]] = defaultdict(list)
+        for force in system.getForces():
+            forces[self._get_force_kind(force)].append(force)
+        pairs: List[Tuple[mm.Force, mm.Force]] = []
+        for extra in ligand.getForces():
+            kind = self._get_force_kind(extra)
+            if kind is mm.CMMotionRemover:
+                continue
+            elif kind not in self.appendable_forces or not forces[kind]:
+                self.journal.debug(f'Cannot append a {extra.__class__.__name__}, creating the holo system afresh')
+                return self.create_system(model)
+            pairs.append((forces[kind].pop(0), extra))
+        for i in range(ligand.getNumParticles()):
+            system.addParticle(ligand.getParticleMass(i))
+        for i in range(ligand.getNumConstraints()):
+            p1, p2, distance = ligand.getConstraintParameters(i)
+            system.addConstraint(p1 + offset, p2 + offset, distance)
+        for force, extra in pairs:
+            self.append_force(force, extra, offset)
+        return system
+
+    # the forces that ``append_force`` can append (``create_holo_system``)
+    appendable_forces = (mm.HarmonicBondForce, mm.HarmonicAngleForce, mm.PeriodicTorsionForce,
+                         mm.NonbondedForce, mm.CustomGBForce, mm.GBSAOBCForce)
+
+    def _get_force_kind(self, force: mm.Force) -> type:
+        """
+        The appendable force class of a force, as the generators may subclass them (e.g. ``GBSAGBn2Force``).
+        """
+        for kind in (*self.appendable_forces, mm.CMMotionRemover):
+            if isinstance(force, kind):
+                return kind
+        return type(force)
+
+    @staticmethod
+    def append_force(force: mm.Force, extra: mm.Force, offset: int):
+        """
+        Appends the terms of ``extra`` to ``force`` (of the same class), with its particle indices offset.
+        """
+        if isinstance(force, mm.HarmonicBondForce):
+            for i in range(extra.getNumBonds()):
+                p1, p2, length, k = extra.getBondParameters(i)
+                force.addBond(p1 + offset, p2 + offset, length, k)
+        elif isinstance(force, mm.HarmonicAngleForce):
+            for i in range(extra.getNumAngles()):
+                p1, p2, p3, angle, k = extra.getAngleParameters(i)
+                force.addAngle(p1 + offset, p2 + offset, p3 + offset, angle, k)
+        elif isinstance(force, mm.PeriodicTorsionForce):
+            for i in range(extra.getNumTorsions()):
+                p1, p2, p3, p4, periodicity, phase, k = extra.getTorsionParameters(i)
+                force.addTorsion(p1 + offset, p2 + offset, p3 + offset, p4 + offset, periodicity, phase, k)
+        elif isinstance(force, mm.NonbondedForce):
+            for i in range(extra.getNumParticles()):
+                force.addParticle(*extra.getParticleParameters(i))
+            for i in range(extra.getNumExceptions()):
+                p1, p2, charge_product, sigma, epsilon = extra.getExceptionParameters(i)
+                force.addException(p1 + offset, p2 + offset, charge_product, sigma, epsilon)
+        elif isinstance(force, mm.CustomGBForce):
+            for i in range(extra.getNumParticles()):
+                force.addParticle(extra.getParticleParameters(i))
+            for i in range(extra.getNumExclusions()):
+                p1, p2 = extra.getExclusionParticles(i)
+                force.addExclusion(p1 + offset, p2 + offset)
+        elif isinstance(force, mm.GBSAOBCForce):
+            for i in range(extra.getNumParticles()):
+                force.addParticle(*extra.getParticleParameters(i))
+        else:
+            raise TypeError(f'Cannot append a {force.__class__.__name__}')
+
     def restrain(self, system: mm.System, pdb: Union[mma.PDBFile, mma.Modeller],
                  k: float = 1_000.0,
                  atom_indices: Sequence[int] = (),
@@ -335,8 +711,10 @@ class Fritz:
         ligand_residue: mma.topology.Residue = ligand_residues[0]
         ligand_center: mmu.Quantity = self.get_centroid(ligand_residue, positions)
         # ## Find neighbours
-        neighbors: List[int] = list({atom.residue.index for atom in topology.atoms() if
-                                     self.distance(positions[atom.index], ligand_center, mmu.angstrom) <= radius})
+        xyz: np.ndarray = np.array(positions.value_in_unit(mmu.angstrom))
+        center: np.ndarray = np.array(ligand_center.value_in_unit(mmu.angstrom))
+        close: np.ndarray = np.linalg.norm(xyz - center, axis=1) <= radius
+        neighbors: List[int] = np.unique(self.get_residue_indices(topology)[close]).tolist()
         self.journal.info(f'unfrozen: {len(neighbors)} residues')
         ex_neighbors: List[int] = neighbors + [ligand_residue.index]
         self.freeze(simulation=simulation, unfrozen_resn_idxs=ex_neighbors)
@@ -348,19 +726,27 @@ class Fritz:
         ie. the residues that are not in `unfrozen_resn_idxs`
         This is called by `freeze_distal`.
         """
-        positions: mmu.Quantity
-        topology: mma.topology.Topology
-        topology, positions = self.get_topo_pos(simulation)
+        residues: np.ndarray = self.get_residue_indices(simulation.topology)
         # freezing by setting mass to zero
-        n = 0
-        for atom in topology.atoms():
-            if atom.residue.index not in unfrozen_resn_idxs:
-                simulation.system.setParticleMass(atom.index, 0. * mmu.amu)  # Dalton
-            else:
-                n += 1
-        self.journal.info(f'{n} atoms were not frozen')
+        frozen: np.ndarray = np.flatnonzero(~np.isin(residues, list(unfrozen_resn_idxs)))
+        for i in frozen.tolist():
+            simulation.system.setParticleMass(i, 0. * mmu.amu)  # Dalton
+        self.journal.info(f'{len(residues) - len(frozen)} atoms were not frozen')
         return unfrozen_resn_idxs
 
+    def get_residue_indices(self, topology: mma.topology.Topology) -> np.ndarray:
+        """
+        The residue index of each atom of the topology (see ``freeze``).
+        For the apo or holo model of a reused receptor the receptor's are cached (``_receptor_residues``)
+        and the atoms following it are the ligand's.
+        """
+        key = (self.pdb_block, tuple(self.forcefield_names))
+        receptor: Optional[np.ndarray] = self._receptor_residues.get(key) if self.protonated else None
+        if receptor is None or len(receptor) == 0 or topology.getNumAtoms() < len(receptor):
+            return np.array([atom.residue.index for atom in topology.atoms()], dtype=int)
+        ligand = np.full(topology.getNumAtoms() - len(receptor), receptor[-1] + 1, dtype=int)
+        return np.concatenate([receptor, ligand])
+
     @staticmethod
     def get_centroid(residue: mma.topology.Residue, positions: mmu.Quantity) -> mmu.Quantity:
         center: mmu.Quantity = mm.Vec3(0, 0, 0) * mmu.nanometer
@@ -29,6 +29,10 @@ class OpenVictor(Victor):
                            restraining_atom_indices=self._get_restraining_atom_indices(),
                            restraint_k=restraint_k,
                            mobile_radius=self.settings['mm_mobile_radius'],
+                           pocket_radius=self.settings['mm_pocket_radius'],
+                           nonbonded_method=self.settings['mm_nonbonded_method'],
+                           nonbonded_cutoff=self.settings['mm_nonbonded_cutoff'],
+                           reuse_receptor=self.settings['mm_reuse_receptor'],
                            )
         self.unminimized_pdbblock = self.fritz.to_pdbblock()
         self._data: Dict = self.fritz.reanimate(tolerance=tolerance, maxIterations=maxIterations)
@@ -43,6 +47,7 @@ class OpenVictor(Victor):
                                     if hasattr(v, 'value_in_unit') else v for k, v in self._data.items()
                                                                  if k not in ('minimized_pdb', 'origins')}
         self.energy_score['unit'] = str(self.fritz.molar_energy_unit)
+        self.ddG = self.energy_score.get('binding_dG', float('nan'))
         self.minimized_pdbblock = self.fritz.to_pdbblock()
         self.minimized_mol = self.fritz.to_mol()
         self.mrmsd = self._calculate_rmsd()
@@ -13,6 +13,10 @@ monster_average_position: False
 monster_throw_on_discard: False
 ff_minisation: True
 
+# Intermediate molecules kept by Monster in .modifications: full, final (only the last) or off.
+# Laboratory runs use Laboratory.monster_tracking instead.
+monster_tracking: full
+
 # During the RDKit minisation, how much lee-way to give an atom before it gets penalised.
 ff_max_displacement: 0.1
 
@@ -29,11 +33,32 @@ ff_neighborhood: 6.0
 # For Wictor, weird things happen if True
 ff_minimise_ideal: False
 
+# PyRosetta reanimation (Victor.reanimate): rounds of minimisation with a halving coordinate constraint
+# until ∆∆G is negative. This is bounded by a number of rounds and a wall-clock budget (seconds, 0 is no limit),
+# and stops early if ∆∆G improves by less than igor_min_improvement (kcal/mol) between rounds.
+igor_max_rounds: 10
+igor_timeout: 0.
+igor_min_improvement: 0.1
+
+# Add the per atom scores of the ligand (Igor.per_atom_scores) to Victor.summarize as 'per_atom_scores'
+# (a dictionary per atom name, False to keep the dataframes lean)
+summarize_per_atom_scores: True
+
 # OpenMM settings
 mm_restraint_k: 1000.0
 mm_tolerance: 10.0  # mmu.kilocalorie_per_mole / (mmu.nano * mmu.meter)
 mm_max_iterations: 0 # 0 is infinite
 mm_mobile_radius: 8.0  # mmu.angstrom
+# Residues within mm_pocket_radius (Å) of the ligand are kept, with ACE/NME capped chain breaks,
+# the rest of the protein is not in the system at all. 0 is the whole protein.
+mm_pocket_radius: 0.
+# NoCutoff or CutoffNonPeriodic (reaction field electrostatics) and its cutoff in nm
+mm_nonbonded_method: NoCutoff
+mm_nonbonded_cutoff: 1.0
+# Protonate the apo structure once per worker and reuse it (and its system) for every ligand,
+# so only the ligand is parameterised, as opposed to protonating each holo structure,
+# whose residue protonation states may then differ with the ligand. The ligand templates are always cached by SMILES.
+mm_reuse_receptor: True
 """
 
 import os, yaml
@@ -33,7 +33,7 @@ from ._victor_combine import _VictorCombine
 from ._victor_place import _VictorPlace
 
 
-from .minimalPDB import MinimalPDBParser
+from .minimalPDB import MinimalPDBParser, PDBTemplate
 
 
 class Victor(_VictorUtils, _VictorValidate, _VictorCombine, _VictorPlace):
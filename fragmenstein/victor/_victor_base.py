@@ -31,6 +31,7 @@ from ..settings import default_settings, default_settings_yaml
 class _VictorBase:
     uses_pyrosetta = True
     quick_reanimation = False  # thorugh reanimation?
+    reuse_apo_pose = False  # load the protein pose once per worker and append only the ligand (non-covalent only)
     # These will be depraecated
     monster_average_position = default_settings['monster_average_position']  # default False
     monster_throw_on_discard = default_settings['monster_throw_on_discard']  # default False
@@ -166,10 +167,12 @@ class _VictorBase:
         self.constraint = None
         self.modifications = {}
         self.unminimized_pdbblock = None
+        self.ligand_pdbblock = None  # the ligand part of the above
         self.monster = self.Monster(hits,
                                     average_position=self.monster_average_position,
                                     random_seed=self.random_seed)
         self.monster.throw_on_discard = self.monster_throw_on_discard
+        self.monster.tracking = self.settings.get('monster_tracking', self.monster.tracking)
         self.igor = None
         self.unbound_pose = None
         self.minimized_pdbblock = None
@@ -181,6 +184,7 @@ class _VictorBase:
                              'unbound': {'total_score': float('nan')}}
         self.mrmsd = mRMSD.mock()
         self.ddG = float('nan')
+        self.reanimation_rounds: List[Dict[str, float]] = []  # filled by reanimate
         # for debug purposes
         self.tick = time.time()
         self.tock = float('inf')
@@ -141,11 +141,7 @@ class _VictorCombine(_VictorCommon):
         self._checkpoint_alpha()
         self._checkpoint_bravo()
         self.pre_igor_step()  # empty overridable
-        self.igor = Igor.from_pdbblock(pdbblock=self.unminimized_pdbblock,
-                                       params_file=params_file,
-                                       constraint_file=constraint_file,
-                                       ligand_residue=self.ligand_resi,
-                                       key_residues=[self.covalent_resi])
+        self.igor = self._get_igor(params_file=params_file, constraint_file=constraint_file)
         # user custom code.
         if self.pose_fx is not None:
             self.journal.debug(f'{self.long_name} - running custom pose mod.')
@@ -2,11 +2,32 @@ from ._victor_store import _VictorStore
 from rdkit import Chem
 from rdkit.Chem import AllChem
 from ..m_rmsd import mRMSD
-from typing import Dict, Optional, Callable
+from typing import Dict, Optional, Callable, List
+import time
 from ..extraction_funs import combine_for_bondorder
+from ..igor import Igor
 
 class _VictorIgor(_VictorStore):
 
+    def _get_igor(self, params_file: str, constraint_file: str) -> Igor:
+        """
+        Loads the plonked structure into Igor.
+        If ``reuse_apo_pose`` is True and the ligand is not covalent, the protein pose is loaded once per worker
+        and only the ligand is appended to a copy of it, as opposed to parsing the whole holo structure.
+        """
+        if self.reuse_apo_pose and not self.is_covalent and self.ligand_pdbblock:
+            return Igor.from_apo_pose(apo_pose=self._get_apo_pose(),
+                                      ligand_pdbblock=self.ligand_pdbblock,
+                                      params_file=params_file,
+                                      constraint_file=constraint_file,
+                                      ligand_residue=self.ligand_resi,
+                                      key_residues=[self.covalent_resi])
+        return Igor.from_pdbblock(pdbblock=self.unminimized_pdbblock,
+                                  params_file=params_file,
+                                  constraint_file=constraint_file,
+                                  ligand_residue=self.ligand_resi,
+                                  key_residues=[self.covalent_resi])
+
     def _fix_minimized(self, ligand: Optional[Chem.Mol]=None, add_dummy:bool=True) -> Chem.Mol:
         """
         PDBs are terrible for bond order etc. and Rosetta addes these based on atom types
@@ -19,7 +40,11 @@ class _VictorIgor(_VictorStore):
             self.journal.debug(f'{self.long_name} - making ligand only')
         else:
             self.journal.debug(f'{self.long_name} - making ligand w/ dummy (if present)')
-        if ligand is None:  # normal route
+        if ligand is None:  # normal route: the coordinates of the pose are copied to the params mol
+            try:
+                return self.igor.mol_from_pose_by_template(self.params.mol, add_dummy=add_dummy)
+            except KeyError as error:
+                self.journal.debug(f'{self.long_name} - atom names differ ({error}), going via PDB block')
             ligand = self.igor.mol_from_pose(add_dummy=add_dummy)
         new_ligand: Chem.Mol = combine_for_bondorder(self.params.mol, ligand)
         # self.journal.warning(f'{self.long_name} - Rosetta ring closure failed: +infinity kcal/mol penalty')
@@ -34,12 +59,29 @@ class _VictorIgor(_VictorStore):
 
         :return:
         """
+        tick = time.time()
+        self.reanimation_rounds = []
         self.igor.coordinate_constraint = 10.
         self.igor.minimize(cycles=5, default_coord_constraint=False)
+        ddG = self._score_reanimation_round(tick)
+        return ddG
+
+    def _score_reanimation_round(self, tick: float) -> float:
+        """
+        Scores the current pose, stores the energies of the round in ``reanimation_rounds``.
+
+        :param tick: start time of the round
+        :return: ddG (kcal/mol)
+        """
         self.energy_score = self.calculate_score()
         dG_bound = self.energy_score['bound']['total_score']
         dG_unbound = self.energy_score['unbound']['total_score']
         ddG = dG_bound - dG_unbound
+        self.reanimation_rounds.append({'coordinate_constraint': self.igor.coordinate_constraint,
+                                        '∆G_bound': dG_bound,
+                                        '∆G_unbound': dG_unbound,
+                                        '∆∆G': ddG,
+                                        'elapsed': time.time() - tick})
         return ddG
 
     def reanimate(self) -> float:
@@ -47,8 +89,17 @@ class _VictorIgor(_VictorStore):
         Calls Igor recursively until the ddG is negative or zero.
         igor.minimize does a good job. this is just to get everything as a normal molecule
 
+        The loop is bounded by the settings ``igor_max_rounds`` and ``igor_timeout`` (seconds, 0 is no limit)
+        and stops if ddG improves by less than ``igor_min_improvement`` (kcal/mol) between rounds.
+        The energies of each round are stored in ``reanimation_rounds``.
+
         :return: ddG (kcal/mol)
         """
+        tick = time.time()
+        max_rounds = int(self.settings.get('igor_max_rounds', 10))
+        timeout = float(self.settings.get('igor_timeout', 0.))
+        min_improvement = float(self.settings.get('igor_min_improvement', 0.1))
+        self.reanimation_rounds = []
         ddG = 999
         self.igor.coordinate_constraint = 0.
         # self.igor.fa_intra_rep = 0.02 # 4x
@@ -59,15 +110,24 @@ class _VictorIgor(_VictorStore):
         self.igor.coordinate_constraint = 1
         while ddG > 0:
             self.journal.debug(f'{self.long_name} - Igor minimising')
+            previous_ddG = ddG
             self.igor.minimize(default_coord_constraint=False)
-            self.energy_score = self.calculate_score()
-            dG_bound = self.energy_score['bound']['total_score']
-            dG_unbound = self.energy_score['unbound']['total_score']
-            ddG = dG_bound - dG_unbound
-            if ddG > 0:
-                self.igor.coordinate_constraint /= 2
-                self.journal.debug(
-                    f'{self.long_name} - coord_constraint lowered: {self.igor.coordinate_constraint}:  {ddG} kcal/mol.')
+            ddG = self._score_reanimation_round(tick)
+            if ddG <= 0:
+                break
+            elif len(self.reanimation_rounds) >= max_rounds:
+                self.journal.warning(f'{self.long_name} - reanimation stopped after {max_rounds} rounds: ' +
+                                     f'{ddG} kcal/mol.')
+                break
+            elif timeout and time.time() - tick > timeout:
+                self.journal.warning(f'{self.long_name} - reanimation stopped after {timeout}s: {ddG} kcal/mol.')
+                break
+            elif len(self.reanimation_rounds) > 1 and previous_ddG - ddG < min_improvement:
+                self.journal.warning(f'{self.long_name} - reanimation stalled: {ddG} kcal/mol.')
+                break
+            self.igor.coordinate_constraint /= 2
+            self.journal.debug(
+                f'{self.long_name} - coord_constraint lowered: {self.igor.coordinate_constraint}:  {ddG} kcal/mol.')
             if self.igor.coordinate_constraint == 0.:
                 self.journal.warning(f'{self.long_name} - failed to minimise without constraints:  {ddG} kcal/mol.')
                 break
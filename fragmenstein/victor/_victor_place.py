@@ -153,11 +153,7 @@ class _VictorPlace(_VictorCommon):
         # ***** EGOR *******
         self.journal.debug(f'{self.long_name} - setting up Igor')
         self.pre_igor_step()  # empty overridable
-        self.igor = Igor.from_pdbblock(pdbblock=self.unminimized_pdbblock,
-                                       params_file=params_file,
-                                       constraint_file=constraint_file,
-                                       ligand_residue=self.ligand_resi,
-                                       key_residues=[self.covalent_resi])
+        self.igor = self._get_igor(params_file=params_file, constraint_file=constraint_file)
         # user custom code.
         if self.pose_fx is not None:
             self.journal.debug(f'{self.long_name} - running custom pose mod.')
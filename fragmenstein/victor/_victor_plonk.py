@@ -5,7 +5,8 @@ from rdkit import Chem
 from rdkit.Chem import AllChem
 from rdkit_to_params import Params, Constraints
 from ._victor_journal import _VictorJournal
-from .minimalPDB import MinimalPDBParser
+from .minimalPDB import PDBTemplate
+from ..igor import Igor
 from ..monster._ff import MinizationOutcome
 
 
@@ -103,50 +104,58 @@ class _VictorPlonk(_VictorJournal):
         """
         Plonks the molecule in the structure without using pymol.
         Uses a custom miniparser. see minimalPDB.MinimalPDBParser
+        The template is parsed once per worker (see minimalPDB.PDBTemplate),
+        so only the ligand records are formatted per call.
 
         :return:
         """
         # ----- load
         mol = self.preminimized_undummied_mol if prepped_mol is None else AllChem.DeleteSubstructs(prepped_mol, Chem.MolFromSmiles('*'))
-        pdbdata = MinimalPDBParser(self.apo_pdbblock, remove_other_hetatms=self.remove_other_hetatms,
-                                   ligname=self.ligand_resn)
-        moldata = MinimalPDBParser(Chem.MolToPDBBlock(mol))
+        template = PDBTemplate.from_block(self.apo_pdbblock, remove_other_hetatms=self.remove_other_hetatms,
+                                          ligname=self.ligand_resn)
         # ------- covalent fix
-        if self.is_covalent:
-            pdbdata.headers.append(self._get_LINK_record())
+        headers = [self._get_LINK_record()] if self.is_covalent else []
         # ------- assertions
         l_resi, l_chain = re.match('(\d+)(\D?)', str(self.ligand_resi)).groups()  # TODO improve ligand_resi
-        if pdbdata.has_residue_index(index=int(l_resi), chain=l_chain):
+        if template.has_residue_index(index=int(l_resi), chain=l_chain):
             raise ValueError(f'Residue {self.ligand_resi} already exists in structure')
-        elif pdbdata.has_residue_name(self.ligand_resn):
+        elif template.has_residue_name(self.ligand_resn):
             raise ValueError(f'Residue {self.ligand_resn} already exists in structure')
         # -------- append
-        pdbdata.append(moldata)  # fixes offsets in ATOM/HETATM and CONECT lines.
-        return str(pdbdata)
+        self.ligand_pdbblock = Chem.MolToPDBBlock(mol)
+        return template.plonk(self.ligand_pdbblock, headers=headers)  # fixes offsets in ATOM/HETATM and CONECT lines.
+
+    def _get_apo_pose(self):
+        """
+        The apo pose with the same atoms as the template in ``unminimized_pdbblock``,
+        loaded once per worker. See ``Igor.get_apo_pose``.
+        """
+        template = PDBTemplate.from_block(self.apo_pdbblock, remove_other_hetatms=self.remove_other_hetatms,
+                                          ligname=self.ligand_resn)
+        return Igor.get_apo_pose(str(template))
 
     def _correct_covalent_resi(self):
         """
         An unresolved issue is that covalent_resi acts both as a covalent residue and the reference residue.
         This corrects for the case there is no covalent_resi
         """
-        pdbdata = MinimalPDBParser(self.apo_pdbblock,
-                                   remove_other_hetatms=self.remove_other_hetatms,
-                                   ligname=self.ligand_resn)
-        entry = pdbdata.coordinates[0]
+        template = PDBTemplate.from_block(self.apo_pdbblock,
+                                          remove_other_hetatms=self.remove_other_hetatms,
+                                          ligname=self.ligand_resn)
+        first_resi = f'{template.residue_indices[0]}{template.chains[0]}'
         if self.covalent_resi is None:
-            self.covalent_resi = f'{pdbdata.get_residue_index(entry)}{pdbdata.get_chain(entry)}'
+            self.covalent_resi = first_resi
         else:
             p_resi, p_chain = re.match('(\d+)(\D?)', str(self.covalent_resi)).groups()
-            if not pdbdata.has_residue_index(int(p_resi), p_chain):
-                self.covalent_resi = f'{pdbdata.get_residue_index(entry)}{pdbdata.get_chain(entry)}'
+            if not template.has_residue_index(int(p_resi), p_chain):
+                self.covalent_resi = first_resi
 
     def _get_empty_resi(self) -> str:
         """
         return the first empty chain basically.
         """
-        pdbdata = MinimalPDBParser(self.apo_pdbblock,
-                                   remove_other_hetatms=False)
-        chains: Set[str] = {pdbdata.get_chain(entry) for entry in pdbdata.coordinates}
+        template = PDBTemplate.from_block(self.apo_pdbblock, remove_other_hetatms=False)
+        chains: Set[str] = set(template.chains.tolist())
         missing = sorted(set(string.ascii_uppercase).difference(chains))
         return f'1{missing[0]}'
 
@@ -22,8 +22,9 @@ import requests
 import sys, json
 import unicodedata
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from ..extraction_funs import add_dummy_to_mol
-from typing import List, Union, Optional, Dict, Tuple, TYPE_CHECKING
+from typing import List, Union, Optional, Dict, Tuple, Any, TYPE_CHECKING
 
 from rdkit import Chem
 from rdkit.Chem import rdFMCS, AllChem, EnumerateStereoisomers
@@ -85,21 +86,25 @@ class _VictorUtils(_VictorShow):  # _VictorCommon -> _VictorShow
                     'disregarded': self.monster.unmatched
                     }
         else:
-            return {'name': self.long_name,
-                    'smiles': self.smiles,
-                    'error': self.error_msg,
-                    'mode': self.merging_mode,
-                    '∆∆G': self.energy_score['bound']['total_score'] - \
-                           self.energy_score['unbound']['total_score'],
-                    '∆G_bound': self.energy_score['bound']['total_score'],
-                    '∆G_unbound': self.energy_score['unbound']['total_score'],
-                    'comRMSD': self.mrmsd.mrmsd,
-                    'N_constrained_atoms': self.constrained_atoms,
-                    'N_unconstrained_atoms': self.unconstrained_heavy_atoms,
-                    'runtime': self.tock - self.tick,
-                    'regarded': self.monster.matched,
-                    'disregarded': self.monster.unmatched
-                    }
+            summary = {'name': self.long_name,
+                       'smiles': self.smiles,
+                       'error': self.error_msg,
+                       'mode': self.merging_mode,
+                       '∆∆G': self.energy_score['bound']['total_score'] - \
+                              self.energy_score['unbound']['total_score'],
+                       '∆G_bound': self.energy_score['bound']['total_score'],
+                       '∆G_unbound': self.energy_score['unbound']['total_score'],
+                       'comRMSD': self.mrmsd.mrmsd,
+                       'N_constrained_atoms': self.constrained_atoms,
+                       'N_unconstrained_atoms': self.unconstrained_heavy_atoms,
+                       'runtime': self.tock - self.tick,
+                       'regarded': self.monster.matched,
+                       'disregarded': self.monster.unmatched,
+                       'reanimation_rounds': self.reanimation_rounds,
+                       }
+            if self.settings.get('summarize_per_atom_scores', True) and self.uses_pyrosetta and self.igor is not None:
+                summary['per_atom_scores'] = self.igor.per_atom_scores()
+            return summary
 
     # =================== Other ========================================================================================
 
@@ -252,7 +257,8 @@ class _VictorUtils(_VictorShow):  # _VictorCommon -> _VictorShow
                      ligand_resn: str = 'LIG',
                      regex_name: Optional[str]= None,
                      proximityBonding: bool = False,
-                     throw_on_error:bool=False) -> Dict[str, Chem.Mol]:
+                     throw_on_error:bool=False,
+                     n_workers: int = 1) -> Dict[str, Chem.Mol]:
         """
          A key requirement for Monster is a separate mol file for the inspiration hits.
         This is however often a pdb. This converts.
@@ -263,20 +269,20 @@ class _VictorUtils(_VictorShow):  # _VictorCommon -> _VictorShow
         See ``extract_mol`` for single.
 
         :param folder: folder with pdbs
+        :param n_workers: number of threads reading the pdbs
         :return:
         """
-        mols = {}
-        for file in os.listdir(folder):
-            if '.pdb' not in file:
-                continue
-            else:
-                fullfile = os.path.join(folder, file)
-                if regex_name is None:
-                    name = os.path.splitext(file)[0]
-                elif re.search(regex_name, file) is None:
+        tasks: List[Tuple[str, str, Optional[str]]] = []  # name, filepath, smiles
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if '.pdb' not in entry.name:
+                    continue
+                elif regex_name is None:
+                    name = os.path.splitext(entry.name)[0]
+                elif re.search(regex_name, entry.name) is None:
                     continue
                 else:
-                    name = re.search(regex_name, file).group(1)
+                    name = re.search(regex_name, entry.name).group(1)
                 if name in smilesdex:
                     smiles=smilesdex[name]
                 elif throw_on_error:
@@ -284,21 +290,27 @@ class _VictorUtils(_VictorShow):  # _VictorCommon -> _VictorShow
                 else:
                     cls.journal.warning(f'{name} could not be matched to a smiles.')
                     smiles = None
-                try:
-                    mol = cls.extract_mol(name=name,
-                                          filepath=fullfile,
-                                          smiles=smiles,
-                                          ligand_resn=ligand_resn,
-                                          proximityBonding=proximityBonding)
-                    if mol is not None:
-                        mols[name] = mol
-                except KeyboardInterrupt as err:
-                    raise err
-                except Exception as error:
-                    if throw_on_error:
-                        raise error
-                    cls.journal.error(f'{error.__class__.__name__} for {name} - {error}')
-        return mols
+                tasks.append((name, entry.path, smiles))
+
+        def extract(task: Tuple[str, str, Optional[str]]) -> Optional[Chem.Mol]:
+            name, filepath, smiles = task
+            try:
+                return cls.extract_mol(name=name,
+                                       filepath=filepath,
+                                       smiles=smiles,
+                                       ligand_resn=ligand_resn,
+                                       proximityBonding=proximityBonding)
+            except KeyboardInterrupt as err:
+                raise err
+            except Exception as error:
+                if throw_on_error:
+                    raise error
+                cls.journal.error(f'{error.__class__.__name__} for {name} - {error}')
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(n_workers, 1)) as pool:
+            # map keeps the order of the folder listing
+            return {task[0]: mol for task, mol in zip(tasks, pool.map(extract, tasks)) if mol is not None}
 
     @classmethod
     def extract_mol(cls,
@@ -474,6 +486,150 @@ class _VictorUtils(_VictorShow):  # _VictorCommon -> _VictorShow
             self.minimized_mol = None
         return self
 
+    # =================== Harvest ======================================================================================
+
+    # the columns of ``harvest``
+    harvest_columns = ['name', 'path', 'smiles', 'origins', 'unminimized_mol', 'minimized_mol',
+                       '∆∆G', '∆G_bound', '∆G_unbound', 'comRMSD', 'RMSDs',
+                       'N_constrained_atoms', 'N_unconstrained_atoms', 'mtime']
+
+    @classmethod
+    def harvest(cls,
+                work_path: Optional[str] = None,
+                previous: Optional[pd.DataFrame] = None,
+                n_workers: int = 8) -> pd.DataFrame:
+        """
+        Tabulates the results saved in the subfolders of ``work_path`` (default: ``.work_path``),
+        without making a Victor for each (cf. ``from_files``):
+        the positioned and minimised mols (``unminimized_mol`` and ``minimized_mol`` as in ``Laboratory``),
+        the SMILES and origins from the Monster json and the scores from the minimised json
+        (either Victor's or OpenVictor's).
+
+        ``work_path`` is listed once and the files of the subfolders are read on ``n_workers`` threads.
+        If an earlier harvest is passed as ``previous``, its rows are kept unless the subfolder or a file therein
+        was modified since (``mtime``, see ``_get_folder_mtime``),
+        in which case they are re-read and replace the stale ones, which with the new subfolders are appended.
+        So a row still running or without ∆∆G by design (Monster only) is re-read only if its files change.
+        The rows of a harvest without ``mtime`` are kept only if complete (a minimised mol and a ∆∆G).
+
+        The constrained atom counts are derived from the origins,
+        but the runtime and error message of ``Victor.summarize`` are not saved, so are not harvested.
+
+        .. code-block:: python
+            df = Victor.harvest()
+            ...  # more placements
+            df = Victor.harvest(previous=df)
+
+        :param work_path: folder with the Victor subfolders
+        :param previous: an earlier harvest of the same folder
+        :param n_workers: number of threads
+        :return: one row per subfolder with a positioned or minimised mol
+        """
+        import pandas as pd
+        if work_path is None:
+            work_path = cls.work_path
+        known: Dict[str, float] = {}  # name -> mtime of the rows of previous (NaN: complete but no mtime)
+        if previous is not None and len(previous):
+            mtimes = previous['mtime'] if 'mtime' in previous.columns else pd.Series(float('nan'), previous.index)
+            complete: pd.Series = previous['∆∆G'].notna() & previous['minimized_mol'].apply(
+                lambda mol: mol is not None and mol.GetNumAtoms() > 0)
+            kept: pd.Series = mtimes.notna() | complete
+            known = dict(zip(previous.loc[kept, 'name'], mtimes.loc[kept]))
+        folders: List[Tuple[str, str]] = []
+        with os.scandir(work_path) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                elif entry.name in known and pd.isna(known[entry.name]):
+                    continue
+                folders.append((entry.name, entry.path))
+        folders.sort()
+
+        def harvest_folder(folder: Tuple[str, str]) -> Tuple[str, bool, Optional[Dict[str, Any]]]:
+            # name, whether it changed, its row
+            name, path = folder
+            mtime: float = cls._get_folder_mtime(path)
+            if known.get(name) == mtime:
+                return name, False, None
+            return name, True, cls._harvest_folder(name, path, mtime)
+
+        with ThreadPoolExecutor(max_workers=max(n_workers, 1)) as pool:
+            results: List[Tuple[str, bool, Optional[Dict[str, Any]]]] = list(pool.map(harvest_folder, folders))
+        harvested = pd.DataFrame([row for _, _, row in results if row is not None], columns=cls.harvest_columns)
+        if previous is None:
+            return harvested
+        stale: pd.Series = previous['name'].isin([name for name, changed, _ in results if changed])
+        return pd.concat([previous.loc[~stale], harvested], ignore_index=True)
+
+    @staticmethod
+    def _get_folder_mtime(path: str) -> float:
+        """
+        The latest modification time of a subfolder and its files (for ``harvest``),
+        as a file rewritten in place does not change that of its folder.
+        """
+        mtime: float = os.stat(path).st_mtime
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    mtime = max(mtime, entry.stat().st_mtime)
+        return mtime
+
+    @classmethod
+    def _harvest_folder(cls, name: str, path: str, mtime: float = float('nan')) -> Optional[Dict[str, Any]]:
+        """
+        The row of ``harvest`` for a subfolder, None if it has no positioned or minimised mol.
+        Files are opened without checking they exist first as that is a second system call.
+        """
+        row: Dict[str, Any] = {'name': name, 'path': path, 'smiles': '', 'origins': None,
+                               'unminimized_mol': Chem.Mol(), 'minimized_mol': Chem.Mol(),
+                               '∆∆G': float('nan'), '∆G_bound': float('nan'), '∆G_unbound': float('nan'),
+                               'comRMSD': float('nan'), 'RMSDs': None,
+                               'N_constrained_atoms': float('nan'), 'N_unconstrained_atoms': float('nan'),
+                               'mtime': mtime}
+        found = False
+        for key, suffix in (('unminimized_mol', 'positioned.mol'), ('minimized_mol', 'minimised.mol')):
+            try:
+                mol = Chem.MolFromMolFile(os.path.join(path, f'{name}.{suffix}'), sanitize=False, removeHs=False)
+            except OSError:  # absent
+                continue
+            found = True
+            if mol is not None:
+                mol.SetProp('_Name', name)
+                row[key] = mol
+        if not found:
+            return None
+        monster_data = cls._read_json(os.path.join(path, f'{name}.monster.json'))
+        if monster_data:
+            row['smiles'] = monster_data.get('smiles', '')
+            row['origins'] = monster_data.get('origin')
+        score_data = cls._read_json(os.path.join(path, f'{name}.minimised.json'))
+        if score_data and 'Energy' in score_data:
+            # Victor (and Wictor): energy score, mRMSD and RMSDs
+            row['∆G_bound'] = score_data['Energy']['bound']['total_score']
+            row['∆G_unbound'] = score_data['Energy']['unbound']['total_score']
+            row['∆∆G'] = row['∆G_bound'] - row['∆G_unbound']
+            row['comRMSD'] = score_data.get('mRMSD', float('nan'))
+            row['RMSDs'] = score_data.get('RMSDs')
+        elif score_data:
+            # OpenVictor: energy score and origins
+            row['∆∆G'] = score_data.get('binding_dG', float('nan'))
+            row['origins'] = row['origins'] or score_data.get('origins')
+        if row['origins']:
+            # as ``constrained_atoms`` and ``unconstrained_heavy_atoms``, the origins include the hydrogens
+            row['N_constrained_atoms'] = sum([o != [] for o in row['origins']])
+            if row['unminimized_mol'].GetNumAtoms() == len(row['origins']):
+                row['N_unconstrained_atoms'] = sum([o == [] and atom.GetSymbol() != 'H' for o, atom in
+                                                    zip(row['origins'], row['unminimized_mol'].GetAtoms())])
+        return row
+
+    @staticmethod
+    def _read_json(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path) as fh:
+                return json.load(fh)
+        except (OSError, ValueError):  # absent or truncated
+            return None
+
     # =================== Guess ===================================================================================
 
     @classmethod
@@ -17,7 +17,10 @@ from __future__ import annotations
 # block = Chem.MolToPDBBlock(mol)
 
 from textwrap import wrap
+from typing import List, Set, Tuple, Sequence
+import functools
 import logging
+import numpy as np
 
 log = logging.getLogger(__name__)
 
@@ -27,6 +30,11 @@ class MinimalPDBParser:
     The reason is that writing a custom 50 line class is easier that
     having biopython or other non-builtin requirement as a requirement
     Importing the PDB into RDKit is inadvisable.
+
+    The serials of ``coordinates`` are stored in the parallel list ``serials``
+    and the residue index/chain and residue name lookups are precomputed as sets
+    so offsetting, appending and querying are linear or constant time.
+    If ``coordinates`` is altered directly, call ``reindex``.
     """
 
     def __init__(self, block: str, remove_water=False, remove_other_hetatms=False, ligname="LIG"):
@@ -44,6 +52,9 @@ class MinimalPDBParser:
         self.coordinates = []
         self.connections = []
         self.tails = []
+        self.serials: List[int] = []
+        self._residue_indices: Set[Tuple[int, str]] = set()
+        self._residue_names: Set[str] = set()
         self.parse(block)
 
     def parse(self, block:str) -> None:
@@ -65,6 +76,7 @@ class MinimalPDBParser:
                             continue
                 self.step = 1
                 self.coordinates.append(row)
+                self._index_entry(row)
             elif starts_with(row, 'CONECT'):
                 self.step = 2
                 self.connections.append(row)
@@ -81,6 +93,21 @@ class MinimalPDBParser:
             else:
                 raise SyntaxError('Impossible')
 
+    def _index_entry(self, entry: str) -> None:
+        self.serials.append(self.get_serial(entry))
+        self._residue_indices.add((self.get_residue_index(entry), self.get_chain(entry)))
+        self._residue_names.add(self.get_residue_name(entry))
+
+    def reindex(self) -> None:
+        """
+        Recompute the serials and residue lookups from ``coordinates``.
+        """
+        self.serials = []
+        self._residue_indices = set()
+        self._residue_names = set()
+        for entry in self.coordinates:
+            self._index_entry(entry)
+
     def __str__(self):
         return '\n'.join(self.headers + self.coordinates + self.connections + ['END'] + self.tails)
 
@@ -108,17 +135,26 @@ class MinimalPDBParser:
 
     def get_max_serial(self) -> int:
         # assuming ordered
-        return self.get_serial(self.coordinates[-1])
+        return self.serials[-1]
+
+    def _format_serial(self, entry: str, value: int) -> str:
+        return f'{entry[:6]}{value: >5}{entry[11:]}'
 
     def set_serial(self, entry: str, value: int) -> None:
-        new = f'{entry[:6]}{value: >5}{entry[11:]}'
-        i = self.coordinates.index(entry)
-        self.coordinates[i] = new
+        """
+        Change the serial of a given row. This is a linear search,
+        when the position is known, ``set_serial_at`` is constant time.
+        """
+        self.set_serial_at(self.coordinates.index(entry), value)
+
+    def set_serial_at(self, i: int, value: int) -> None:
+        self.coordinates[i] = self._format_serial(self.coordinates[i], value)
+        self.serials[i] = value
 
     def offset_serials(self, offset: int) -> None:
-        for entry in self.coordinates:
-            original_serial = self.get_serial(entry)
-            self.set_serial(entry, original_serial + offset)
+        self.serials = [serial + offset for serial in self.serials]
+        self.coordinates = [self._format_serial(entry, serial)
+                            for entry, serial in zip(self.coordinates, self.serials)]
 
     def offset_connections(self, offset:int) -> None:
         for i, entry in enumerate(self.connections):
@@ -133,22 +169,82 @@ class MinimalPDBParser:
         other.offset_connections(offset)
         self.coordinates += other.coordinates
         self.connections += other.connections
+        self.serials += other.serials
+        self._residue_indices |= other._residue_indices
+        self._residue_names |= other._residue_names
 
     def has_residue_index(self, index:int, chain: str):
-        for entry in self.coordinates:
-            if self.get_residue_index(entry) == index and self.get_chain(entry) == chain:
-                return True
-        else:
-            return False
+        return (index, chain) in self._residue_indices
 
     def has_residue_name(self, name: str):
         """
         residue name, resn 3-letters
         """
-        for entry in self.coordinates:
-            if self.get_residue_name(entry) == name:
-                return True
-        else:
-            return False
+        return name in self._residue_names
+
+
+
 
 
+class PDBTemplate:
+    """
+    An apo structure parsed once by ``MinimalPDBParser`` and frozen:
+    the atom records are kept as preformatted text (the skeleton, whose serials never change)
+    and the fields needed for queries as NumPy arrays.
+    Plonking a ligand only formats the ligand records, which are appended after the template ones.
+
+    Use ``PDBTemplate.from_block`` to get a cached instance per block and parsing options.
+    Do not alter the attributes, instances are shared.
+    """
+
+    def __init__(self, block: str, remove_water=False, remove_other_hetatms=False, ligname="LIG"):
+        parser = MinimalPDBParser(block,
+                                  remove_water=remove_water,
+                                  remove_other_hetatms=remove_other_hetatms,
+                                  ligname=ligname)
+        self.headers: Tuple[str, ...] = tuple(parser.headers)
+        self.coordinate_block: str = '\n'.join(parser.coordinates)
+        self.connection_block: str = '\n'.join(parser.connections)
+        self.tails: Tuple[str, ...] = tuple(parser.tails)
+        self.serials = np.array(parser.serials, dtype=int)
+        self.residue_indices = np.array([parser.get_residue_index(entry) for entry in parser.coordinates], dtype=int)
+        self.chains = np.array([parser.get_chain(entry) for entry in parser.coordinates], dtype='U1')
+        self.residue_names = np.array([parser.get_residue_name(entry) for entry in parser.coordinates], dtype='U4')
+        self.atom_names = np.array([parser.get_atomname(entry) for entry in parser.coordinates], dtype='U4')
+        # assuming ordered
+        self.max_serial: int = int(self.serials[-1]) if len(self.serials) else 0
+
+    @classmethod
+    @functools.lru_cache(maxsize=8)
+    def from_block(cls, block: str, remove_water=False, remove_other_hetatms=False, ligname="LIG") -> PDBTemplate:
+        return cls(block, remove_water=remove_water, remove_other_hetatms=remove_other_hetatms, ligname=ligname)
+
+    def __len__(self):
+        return len(self.serials)
+
+    def __str__(self):
+        # the apo block
+        return self.plonk('')
+
+    def has_residue_index(self, index: int, chain: str) -> bool:
+        return bool(np.any((self.residue_indices == index) & (self.chains == chain)))
+
+    def has_residue_name(self, name: str) -> bool:
+        return bool(np.any(self.residue_names == name))
+
+    def plonk(self, ligand_block: str, headers: Sequence[str] = ()) -> str:
+        """
+        Return the PDB block of the template with the atoms and connections of ``ligand_block`` appended.
+        Same as ``MinimalPDBParser.append`` followed by ``str``.
+
+        :param ligand_block: PDB block of the ligand, e.g. ``Chem.MolToPDBBlock(mol)``
+        :param headers: extra header rows, e.g. a LINK record
+        """
+        moldata = MinimalPDBParser(ligand_block)
+        moldata.offset_serials(self.max_serial)
+        moldata.offset_connections(self.max_serial)
+        parts = [*self.headers, *headers,
+                 self.coordinate_block, *moldata.coordinates,
+                 self.connection_block, *moldata.connections,
+                 'END', *self.tails]
+        return '\n'.join([part for part in parts if part != ''])
@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+import openmm as mm
+import openmm.unit as mmu
+from rdkit import Chem
+from rdkit.Geometry import Point3D
+
+# TESTS IS EXTERNAL TO FRAGMENSTEIN DO NOT CHANGE TO RELATIVE!
+from fragmenstein import Fritz
+from fragmenstein.demo import Mac1
+
+
+class FritzTests(unittest.TestCase):
+
+    def make_probe(self, points) -> Chem.Mol:
+        probe = Chem.RWMol()
+        conformer = Chem.Conformer(len(points))
+        for i, point in enumerate(points):
+            probe.AddAtom(Chem.Atom(6))
+            conformer.SetAtomPosition(i, Point3D(*map(float, point)))
+        probe.AddConformer(conformer)
+        return probe.GetMol()
+
+    def test_pocket_gap(self):
+        """
+        The residue between two pocket residues is kept, not capped on either side,
+        else the NME and ACE caps would be built from the same CA.
+        """
+        apo = Fritz.pdbblock_to_PDB(Mac1.get_template())
+        xyz = np.array(apo.positions.value_in_unit(mmu.angstrom))
+        residues = list(list(apo.topology.chains())[0].residues())
+        first, gap, last = residues[10:13]
+        ca_of = lambda residue: xyz[[atom.index for atom in residue.atoms() if atom.name == 'CA'][0]]
+        fritz = Fritz.__new__(Fritz)
+        # only the CAs are within 1 Å
+        pocket = fritz.extract_pocket(apo, self.make_probe([ca_of(first), ca_of(last)]), radius=1.)
+        names = [residue.name for residue in pocket.topology.residues()]
+        self.assertEqual(names, ['ACE', first.name, gap.name, last.name, 'NME'])
+        pocket_xyz = np.array(pocket.positions.value_in_unit(mmu.angstrom))
+        distances = np.linalg.norm(pocket_xyz[:, np.newaxis, :] - pocket_xyz[np.newaxis, :, :], axis=-1)
+        np.fill_diagonal(distances, np.inf)
+        self.assertGreater(distances.min(), 0.5)  # no overlapping atoms
+
+    def get_energy(self, system, positions) -> float:
+        context = mm.Context(system, mm.VerletIntegrator(0.002))
+        context.setPositions(positions)
+        return context.getState(getEnergy=True).getPotentialEnergy().value_in_unit(mmu.kilocalorie_per_mole)
+
+    def test_holo_system(self):
+        """
+        The holo system of a reused receptor (apo system with the ligand's appended) is that made afresh
+        and the ligand template is added once to the single forcefield.
+        """
+        mol = Chem.AddHs(Mac1.get_mol('diamond-x0104_A'), addCoords=True)
+        fritz = Fritz(prepped_mol=mol, pdb_block=Mac1.get_template(), reuse_receptor=True)
+        model = fritz.plonk(fritz.apo)
+        self.assertAlmostEqual(self.get_energy(fritz.create_holo_system(model), model.positions),
+                               self.get_energy(fritz.create_system(model), model.positions),
+                               places=1)
+        n_templates = len(Fritz._ligand_templates)
+        again = Fritz(prepped_mol=mol, pdb_block=Mac1.get_template(), reuse_receptor=True)
+        self.assertIs(again.forcefield, fritz.forcefield)
+        self.assertEqual(again.ligand_template, fritz.ligand_template)
+        self.assertEqual(len(Fritz._ligand_templates), n_templates)
+
+
+if __name__ == '__main__':
+    unittest.main()
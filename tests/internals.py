@@ -1,6 +1,7 @@
 import logging
 import tempfile
 import unittest, os
+from unittest import mock
 # ======================================================================================================================
 from multiprocessing import Process
 
@@ -153,6 +154,113 @@ class Internals(unittest.TestCase):
         vicky.apo_pdbblock = Mac1.get_template()
         print(vicky._get_empty_resi())
 
+    def test_minimal_pdb(self):
+        from fragmenstein.victor import MinimalPDBParser
+        pdbdata = MinimalPDBParser(Mac1.get_template())
+        n = len(pdbdata.coordinates)
+        entry = pdbdata.coordinates[0]
+        self.assertTrue(pdbdata.has_residue_index(pdbdata.get_residue_index(entry), pdbdata.get_chain(entry)))
+        self.assertFalse(pdbdata.has_residue_name('LIG'))
+        benzene = Chem.AddHs(Chem.MolFromSmiles('c1ccccc1'))
+        AllChem.EmbedMolecule(benzene)
+        moldata = MinimalPDBParser(Chem.MolToPDBBlock(benzene))
+        max_serial = pdbdata.get_max_serial()
+        pdbdata.append(moldata)
+        self.assertEqual(len(pdbdata.coordinates), n + 12)
+        self.assertEqual(pdbdata.serials, [pdbdata.get_serial(entry) for entry in pdbdata.coordinates])
+        self.assertEqual(pdbdata.get_max_serial(), max_serial + 12)
+        self.assertTrue(pdbdata.has_residue_name('UNL'))
+
+    def test_pdb_template(self):
+        from fragmenstein.victor import MinimalPDBParser, PDBTemplate
+        pdbblock = Mac1.get_template()
+        benzene = Chem.AddHs(Chem.MolFromSmiles('c1ccccc1'))
+        AllChem.EmbedMolecule(benzene)
+        template = PDBTemplate.from_block(pdbblock)
+        self.assertIs(template, PDBTemplate.from_block(pdbblock))
+        pdbdata = MinimalPDBParser(pdbblock)
+        pdbdata.append(MinimalPDBParser(Chem.MolToPDBBlock(benzene)))
+        self.assertEqual(template.plonk(Chem.MolToPDBBlock(benzene)), str(pdbdata))
+        entry = pdbdata.coordinates[0]
+        self.assertTrue(template.has_residue_index(pdbdata.get_residue_index(entry), pdbdata.get_chain(entry)))
+
+    def test_mrmsd(self):
+        from fragmenstein import mRMSD
+        hexane = Chem.MolFromSmiles('CCCCCC')
+        AllChem.EmbedMolecule(hexane, randomSeed=42)
+        propanes = []
+        for name, offset in (('left', 0), ('right', 3)):
+            propane = Chem.MolFromSmiles('CCC')
+            AllChem.EmbedMolecule(propane, randomSeed=42)
+            propane.SetProp('_Name', name)
+            propanes.append(propane)
+            for i in range(3):
+                hexane.GetAtomWithIdx(i + offset).SetProp('_Origin', json.dumps([f'{name}.{i}']))
+        mrmsd = mRMSD.from_annotated_mols(hexane, propanes)
+        self.assertEqual(mrmsd.mappings, [[(0, 0), (1, 1), (2, 2)], [(3, 0), (4, 1), (5, 2)]])
+        # per atom reference
+        conf = hexane.GetConformer()
+        expected = []
+        for propane, mapping in zip(propanes, mrmsd.mappings):
+            expected.append(sum([(conf.GetAtomPosition(a) - propane.GetConformer().GetAtomPosition(b)).LengthSq()
+                                 for a, b in mapping]))
+        self.assertAlmostEqual(mrmsd.mrmsd, (sum(expected) / 6) ** 0.5)
+        self.assertAlmostEqual(mrmsd.rmsds[1], (expected[1] / 3) ** 0.5)
+
+    def test_harvest(self):
+        benzene = Chem.MolFromSmiles('c1ccccc1')
+        AllChem.EmbedMolecule(benzene, randomSeed=42)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            def save(name: str, ddG: float):
+                os.makedirs(os.path.join(tmpdir, name))
+                Chem.MolToMolFile(benzene, os.path.join(tmpdir, name, f'{name}.minimised.mol'))
+                with open(os.path.join(tmpdir, name, f'{name}.minimised.json'), 'w') as fh:
+                    json.dump({'Energy': {'bound': {'total_score': ddG}, 'unbound': {'total_score': 0.}},
+                               'mRMSD': 0.5, 'RMSDs': [0.5]}, fh)
+
+            save('first', -1.)
+            os.makedirs(os.path.join(tmpdir, 'not_victor'))
+            harvested = Victor.harvest(tmpdir, n_workers=2)
+            self.assertEqual(harvested.name.to_list(), ['first'])
+            self.assertEqual(harvested['∆∆G'].to_list(), [-1.])
+            self.assertEqual(harvested.minimized_mol[0].GetNumAtoms(), 6)
+            save('second', -2.)
+            harvested = Victor.harvest(tmpdir, previous=harvested)
+            self.assertEqual(harvested.name.to_list(), ['first', 'second'])
+            self.assertEqual(harvested['∆∆G'].to_list(), [-1., -2.])
+            # an incomplete subfolder (positioned only) is re-read once minimised
+            os.makedirs(os.path.join(tmpdir, 'third'))
+            Chem.MolToMolFile(benzene, os.path.join(tmpdir, 'third', 'third.positioned.mol'))
+            with open(os.path.join(tmpdir, 'third', 'third.monster.json'), 'w') as fh:
+                json.dump({'smiles': 'c1ccccc1', 'origin': [['hit.0']] * 4 + [[]] * 2}, fh)
+            harvested = Victor.harvest(tmpdir, previous=harvested)
+            self.assertTrue(harvested.loc[harvested.name == 'third', '∆∆G'].isna().all())
+            self.assertEqual(harvested.loc[harvested.name == 'third', 'N_constrained_atoms'].to_list(), [4])
+            self.assertEqual(harvested.loc[harvested.name == 'third', 'N_unconstrained_atoms'].to_list(), [2])
+            Chem.MolToMolFile(benzene, os.path.join(tmpdir, 'third', 'third.minimised.mol'))
+            with open(os.path.join(tmpdir, 'third', 'third.minimised.json'), 'w') as fh:
+                json.dump({'Energy': {'bound': {'total_score': -3.}, 'unbound': {'total_score': 0.}}}, fh)
+            harvested = Victor.harvest(tmpdir, previous=harvested)
+            self.assertEqual(harvested.name.to_list(), ['first', 'second', 'third'])
+            self.assertEqual(harvested['∆∆G'].to_list(), [-1., -2., -3.])
+            # a file rewritten in place is re-read, even if the folder's mtime is unchanged
+            folder_stat = os.stat(os.path.join(tmpdir, 'first'))
+            json_path = os.path.join(tmpdir, 'first', 'first.minimised.json')
+            with open(json_path, 'w') as fh:
+                json.dump({'Energy': {'bound': {'total_score': -5.}, 'unbound': {'total_score': 0.}}}, fh)
+            os.utime(json_path, (folder_stat.st_atime + 10, folder_stat.st_mtime + 10))
+            os.utime(os.path.join(tmpdir, 'first'), (folder_stat.st_atime, folder_stat.st_mtime))
+            harvested = Victor.harvest(tmpdir, previous=harvested)
+            self.assertEqual(harvested.loc[harvested.name == 'first', '∆∆G'].to_list(), [-5.])
+            # a Monster only subfolder (no ∆∆G by design) is not re-read if unchanged
+            os.makedirs(os.path.join(tmpdir, 'fourth'))
+            Chem.MolToMolFile(benzene, os.path.join(tmpdir, 'fourth', 'fourth.positioned.mol'))
+            harvested = Victor.harvest(tmpdir, previous=harvested)
+            with mock.patch.object(Victor, '_harvest_folder', wraps=Victor._harvest_folder) as harvest_folder:
+                harvested = Victor.harvest(tmpdir, previous=harvested)
+                harvest_folder.assert_not_called()
+            self.assertEqual(len(harvested), 4)
+
 
 
     # def test_doubleconstraint(self):
@@ -18,3 +18,81 @@ class LabTests(unittest.TestCase):
 
 
 
+
+    def test_prefilter(self):
+        pdb_block = Mac1.get_template()
+        hits = [Mac1.get_mol(f'diamond-{name}') for name in ['x0282_A', 'x0104_A', 'x0722_A', 'x0591_A', 'x0091_B']]
+        lab = Laboratory(pdbblock=pdb_block, covalent_resi=None)
+        distances = lab.get_hit_distances(hits)
+        self.assertEqual(distances.shape, (len(hits), len(hits)))
+        far = distances > lab.joining_cutoff + lab.prefilter_margin
+        combinations = [(i, j) for i in range(len(hits)) for j in range(len(hits)) if i != j]
+        hopeless = lab.get_hopeless_combinations(hits, combinations)
+        self.assertEqual(set(hopeless), {(i, j) for i, j in combinations if far[i, j]})
+
+    def test_smallworld_client(self):
+        from fragmenstein.laboratory import SmallWorldClient, LocalSmallWorld
+        with tempfile.TemporaryDirectory() as tmpdir:
+            smi_path = os.path.join(tmpdir, 'catalogue.smi')
+            with open(smi_path, 'w') as fh:
+                fh.write('c1ccccc1O phenol\nc1ccccc1N aniline\nCCCCCCCC octane\n')
+            cache_path = os.path.join(tmpdir, 'cache')
+            client = SmallWorldClient(LocalSmallWorld(smi=smi_path, min_similarity=0.),
+                                      cache_folder=cache_path, n_workers=2, min_interval=0.)
+            query = {'toluene': 'Cc1ccccc1', 'chlorobenzene': 'Clc1ccccc1', 'again': 'Cc1ccccc1'}
+            analogs = client.search_many(query, db='local', dist=4, length=10)
+            self.assertEqual(set(analogs.query_index), set(query))
+            self.assertNotIn('octane', analogs.id.to_list())
+            self.assertEqual(len(os.listdir(cache_path)), 2)  # repeated SMILES are searched once
+            # served from the cache
+            cached = SmallWorldClient(LocalSmallWorld(smi=smi_path), cache_folder=cache_path)
+            self.assertEqual(len(cached.search_many(query, db='local', dist=4, length=10)), len(analogs))
+
+    def test_pipelined_ops(self):
+        from fragmenstein.laboratory import SmallWorldClient, LocalSmallWorld
+        from fragmenstein.faux_victors import Wictor
+        pdb_block = Mac1.get_template()
+        hits = [Mac1.get_mol(f'diamond-{name}') for name in ['x0282_A', 'x0104_A', 'x0722_A']]
+        hit_replacements = pd.DataFrame({'name': [hit.GetProp('_Name') for hit in hits], '∆∆G': 0.})
+        original_victor, original_folder = Laboratory.Victor, os.getcwd()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            try:
+                Laboratory.Victor = Wictor
+                os.chdir(tmpdir)
+                with open('catalogue.smi', 'w') as fh:
+                    fh.write('c1ccc2[nH]ccc2c1 indole\nO=C(O)c1ccc2[nH]ncc2c1 indazole\nCC(=O)Nc1ccccc1 anilide\n')
+                sws = SmallWorldClient(LocalSmallWorld(smi='catalogue.smi', min_similarity=0.),
+                                       cache_folder=None, min_interval=0.)
+                placements = Laboratory.pipelined_ops(hit_replacements, hits=hits, pdbblock=pdb_block,
+                                                      sw_databases=['local'], sw_dist=100, sw_length=3,
+                                                      n_cores=2, sws=sws)
+                self.assertTrue(os.path.exists('fragmenstein_mergers.pkl.gz'))
+                self.assertGreater(len(placements), 0)
+                self.assertEqual(len(placements), len(pd.read_pickle('fragmenstein_analogs.pkl.gz')))
+            finally:
+                os.chdir(original_folder)
+                Laboratory.Victor = original_victor
+
+    def test_brics_builds(self):
+        from fragmenstein.faux_victors import AccountableBRICS
+        hits = [Mac1.get_mol(f'diamond-{name}') for name in ['x0282_A', 'x0104_A', 'x0722_A']]
+        decomposer = AccountableBRICS(hits)
+        serial: pd.DataFrame = decomposer(max_mergers=50)
+        self.assertEqual(len(serial), decomposer.info['N_built'])
+        self.assertFalse(serial.smiles.duplicated().any())
+        self.assertTrue(all(len(inspirations) for inspirations in serial.hits))
+        # sharded across subprocesses, the same products in the same order
+        sharded: pd.DataFrame = decomposer(max_mergers=50, n_cores=2)
+        self.assertEqual(serial.smiles.to_list(), sharded.smiles.to_list())
+        # the cap keeps the first products, breadth first, whatever its value
+        capped: pd.DataFrame = decomposer(max_mergers=10, n_cores=2)
+        self.assertEqual(serial.smiles.to_list()[:10], capped.smiles.to_list())
+        # the products too small are counted once, however many shards build them
+        cutoff = int(decomposer.median)
+        decomposer.seeds_per_shard = 10_000
+        whole: pd.DataFrame = decomposer(cutoff=cutoff, max_mergers=50)
+        too_small: int = decomposer.info['too_small']
+        decomposer.seeds_per_shard = 1
+        split: pd.DataFrame = decomposer(cutoff=cutoff, max_mergers=50)
+        self.assertEqual(whole.smiles.to_list(), split.smiles.to_list())
+        self.assertEqual(decomposer.info['too_small'], too_small)
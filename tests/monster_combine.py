@@ -89,3 +89,58 @@ class MonsterCombineTests(unittest.TestCase):
         self.assertEqual('Nc1nc2c3c(c(O)cc(N)c3n1)C(O)=N2',
                          Chem.MolToSmiles(Chem.RemoveHs(monster.positioned_mol)),
                          )
+
+    def test_collapsed_cache(self):
+        toluene = TestSet.get_mol('toluene')
+        rototoluene = TestSet.get_mol('rototoluene')
+        Monster.clear_collapsed_cache()
+        first = Monster(hits=[toluene, rototoluene]).combine(keep_all=True).positioned_mol
+        self.assertEqual(len(Monster._collapsed_cache), 2)
+        second = Monster(hits=[toluene, rototoluene]).combine(keep_all=True).positioned_mol
+        self.assertEqual(len(Monster._collapsed_cache), 2, 'collapsed hits were not reused')
+        self.assertEqual(Chem.MolToSmiles(Chem.RemoveHs(first)), Chem.MolToSmiles(Chem.RemoveHs(second)))
+
+    def test_tracking(self):
+        toluene = TestSet.get_mol('toluene')
+        rototoluene = TestSet.get_mol('rototoluene')
+        full = Monster(hits=[toluene, rototoluene]).combine(keep_all=True)
+        self.assertGreater(len(full.modifications), 1)
+        monster = Monster(hits=[toluene, rototoluene])
+        monster.tracking = 'off'
+        monster.combine(keep_all=True)
+        self.assertTrue(set(monster.modifications).issubset(monster.required_modifications))
+        self.assertEqual(Chem.MolToSmiles(Chem.RemoveHs(full.positioned_mol)),
+                         Chem.MolToSmiles(Chem.RemoveHs(monster.positioned_mol)))
+
+    def test_ring_data_props(self):
+        toluene = TestSet.get_mol('toluene')
+        monster = Monster(hits=[toluene])
+        collapsed = monster.collapse_ring(toluene)
+        ringcore = monster._get_collapsed_atoms(collapsed)[0]
+        self.assertFalse(ringcore.HasProp('_ori_is'), 'ring data should be in the side-table only')
+        expected = monster._get_ring_data(ringcore)['ori_is'].tolist()
+        # serialised props are read by a different instance
+        monster.ring_data_to_props(collapsed)
+        other = Monster(hits=[toluene])
+        ringcore = other._get_collapsed_atoms(collapsed)[0]
+        self.assertEqual(other._get_ring_data(ringcore)['ori_is'].tolist(), expected)
+        # the copies in modifications leave the instance, so are serialised
+        monster.keep_copy(monster.collapse_ring(toluene), 'collapsed')
+        ringcore = monster._get_collapsed_atoms(monster.modifications['collapsed'])[0]
+        self.assertTrue(ringcore.HasProp('_ori_is'))
+        self.assertFalse(ringcore.HasProp('_ring_key'))
+
+    def test_merge_cache(self):
+        toluene = TestSet.get_mol('toluene')
+        rototoluene = TestSet.get_mol('rototoluene')
+        transtoluene = TestSet.get_mol('transtoluene')
+        Monster.clear_merge_cache()
+        first = Monster(hits=[toluene, rototoluene, transtoluene]).combine(keep_all=False).positioned_mol
+        n_steps = len(Monster._merge_cache)
+        self.assertEqual(n_steps, 2)
+        second = Monster(hits=[toluene, rototoluene, transtoluene]).combine(keep_all=False).positioned_mol
+        self.assertEqual(len(Monster._merge_cache), n_steps, 'merge steps were not reused')
+        self.assertEqual(Chem.MolToSmiles(Chem.RemoveHs(first)), Chem.MolToSmiles(Chem.RemoveHs(second)))
+        # differently configured, not shared
+        Monster(hits=[toluene, rototoluene, transtoluene]).combine(keep_all=False, joining_cutoff=10.)
+        self.assertEqual(len(Monster._merge_cache), 2 * n_steps, 'merge steps of other settings were reused')
@@ -4,6 +4,8 @@ import unittest
 
 # ======================================================================================================================
 from rdkit import Chem
+from rdkit.Chem import AllChem
+from rdkit.Geometry import Point3D
 
 from fragmenstein import Victor, Igor
 from fragmenstein.demo import TestSet
@@ -32,6 +34,58 @@ class MultivictorPlaceTests(unittest.TestCase):
             # print(mv.retrieve_scores())
             self.assertLess(mv.retrieve_scores()[0], -7)
 
+    def test_multivictor_parallel(self):
+        from fragmenstein import MultiVictorPlacement
+        to_place = TestSet.get_mol('placed_example1')
+        pdb_block = TestSet.get_text('apo_example1.pdb')
+        smiles = Chem.MolToSmiles(to_place)
+        hits = [TestSet.get_mol('x0032_0A')]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            Victor.work_path = os.path.join(tmpdir, "multivictor_out")
+            mv = MultiVictorPlacement(hits=hits, pdb_block=pdb_block, random_seed=42)
+            mv.place(smiles, number_runs=4, n_cores=2, dedup_rmsd=0)
+            self.assertEqual(len(mv.retrieve_scores()), 4)
+            self.assertEqual(sorted(mv.retrieve_scores()), list(mv.retrieve_scores()))
+            # early stop: the first run reaches any target
+            mv.place(smiles, number_runs=4, n_cores=2, target_ddG=float('inf'))
+            self.assertEqual(len(mv.retrieve_scores()), 1)
+
+    def test_multivictor_parallel_openmm(self):
+        """
+        The OpenMM objects of OpenVictor cannot be pickled, so the runs in subprocesses return their results.
+        """
+        from fragmenstein import MultiVictorPlacement, OpenVictor
+
+        class OpenMultiVictorPlacement(MultiVictorPlacement):
+            Victor = OpenVictor
+
+        to_place = TestSet.get_mol('placed_example1')
+        pdb_block = TestSet.get_text('apo_example1.pdb')
+        hits = [TestSet.get_mol('x0032_0A')]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            OpenVictor.work_path = os.path.join(tmpdir, "multivictor_out")
+            mv = OpenMultiVictorPlacement(hits=hits, pdb_block=pdb_block, random_seed=42)
+            mv.place(Chem.MolToSmiles(to_place), number_runs=3, n_cores=2, dedup_rmsd=0)
+            self.assertEqual(len(mv.retrieve_scores()), 3)
+            for victor in (pair[1] for pair in mv.placed_victors):
+                self.assertGreater(victor.minimized_mol.GetNumAtoms(), 0)
+                self.assertIsNotNone(victor.mrmsd.mrmsd)
+
+    def test_conformation_dedup(self):
+        from fragmenstein import MultiVictorPlacement
+        mol = Chem.AddHs(Chem.MolFromSmiles('CCCCO'))
+        AllChem.EmbedMolecule(mol, randomSeed=42)
+        shifted = Chem.Mol(mol)
+        conf = shifted.GetConformer()
+        for i in range(shifted.GetNumAtoms()):
+            conf.SetAtomPosition(i, conf.GetAtomPosition(i) + Point3D(0.1, 0, 0))
+        moved = Chem.Mol(mol)
+        conf = moved.GetConformer()
+        for i in range(moved.GetNumAtoms()):
+            conf.SetAtomPosition(i, conf.GetAtomPosition(i) + Point3D(3, 0, 0))
+        self.assertEqual(MultiVictorPlacement._cluster_conformations([mol, shifted, moved, mol], 0.5), [0, 0, 2, 0])
+        self.assertEqual(MultiVictorPlacement._cluster_conformations([mol, shifted, moved], 0), [0, 1, 2])
+
 
 if __name__ == '__main__':
     unittest.main()